@@ -17,7 +17,7 @@ import argparse
 import kserve
 import json
 
-from kserve import logging
+from kserve import accounting, logging
 from .model import AIFModel
 
 DEFAULT_MODEL_NAME = "aifserver"
@@ -78,5 +78,6 @@ if __name__ == "__main__":
         privileged_groups=args.privileged_groups,
         unprivileged_groups=args.unprivileged_groups,
     )
-    model.load()
+    with accounting.measure_load(model.name):
+        model.load()
     kserve.ModelServer().start([model])
@@ -17,7 +17,7 @@ import argparse
 from artserver import ARTModel
 
 import kserve
-from kserve import logging
+from kserve import accounting, logging
 
 DEFAULT_ADVERSARY_TYPE = "SquareAttack"
 
@@ -51,5 +51,6 @@ if __name__ == "__main__":
         nb_classes=args.nb_classes,
         max_iter=args.max_iter,
     )
-    model.load()
+    with accounting.measure_load(model.name):
+        model.load()
     kserve.ModelServer().start([model])
@@ -79,8 +79,7 @@ class AlexNetModel(Model):
                     raw_img_data = base64.b64decode(infer_input.data[0])
             elif infer_input.datatype == "FP32":
                 # assume the data is already preprocessed in transformer
-                input_np = infer_input.as_numpy()
-                return torch.Tensor(input_np)
+                return infer_input.as_torch()
         else:
             raise InvalidInput("invalid payload")
 
@@ -59,8 +59,7 @@ class AlexNetModel(Model):
             input_tensor = preprocess(input_image)
             return input_tensor.unsqueeze(0)
         elif req.datatype == "FP32":
-            np_array = payload.inputs[0].as_numpy()
-            return torch.Tensor(np_array)
+            return payload.inputs[0].as_torch()
 
     def predict(
         self, input_tensor: torch.Tensor, headers: Dict[str, str] = None
@@ -18,7 +18,7 @@ from typing import cast
 
 import torch
 import kserve
-from kserve import logging
+from kserve import accounting, logging
 from kserve.logging import logger
 from kserve.model import PredictorConfig
 from kserve.storage import Storage
@@ -243,7 +243,8 @@ def load_model():
                 return_token_type_ids=kwargs.get("return_token_type_ids", None),
                 predictor_config=predictor_config,
             )
-    model.load()
+    with accounting.measure_load(model.name):
+        model.load()
     return model
 
 
@@ -13,7 +13,7 @@
 # limitations under the License.
 
 import pathlib
-from typing import Any, Dict, Optional, Union
+from typing import Any, Dict, List, Optional, Union
 
 import torch
 from accelerate import init_empty_weights
@@ -252,17 +252,24 @@ class HuggingfaceEncoderModel(Model):  # pylint:disable=c-extension-no-member
         input_ids = context["input_ids"]
         request = context["payload"]
         if isinstance(outputs, InferResponse):
-            shape = torch.Size(outputs.outputs[0].shape)
-            data = torch.Tensor(outputs.outputs[0].data)
-            outputs = data.view(shape)
-            input_ids = torch.Tensor(input_ids)
+            # Wraps the binary output of the predictor without copying it
+            outputs = outputs.outputs[0].as_torch().to(torch.float32)
+            input_ids = torch.from_numpy(input_ids)
         inferences = []
+        if self.task in (
+            MLTask.sequence_classification,
+            MLTask.token_classification,
+        ) and self._is_classification_requested(request):
+            # The top-k classes are selected from the class probabilities by the data plane.
+            # They are returned as text, so the softmax is computed in FP32 for BF16/FP16 models.
+            probabilities = torch.softmax(outputs.float(), dim=-1)
+            return get_predict_response(request, probabilities.cpu().numpy(), self.name)
         if self.task == MLTask.sequence_classification:
             num_rows, num_cols = outputs.shape
             for i in range(num_rows):
                 out = outputs[i].unsqueeze(0)
                 if self.return_probabilities:
-                    inferences.append(dict(enumerate(out.numpy().flatten())))
+                    inferences.append(dict(enumerate(out.float().numpy().flatten())))
                 else:
                     predicted_idx = out.argmax().item()
                     inferences.append(predicted_idx)
@@ -302,3 +309,21 @@ class HuggingfaceEncoderModel(Model):  # pylint:disable=c-extension-no-member
             raise ValueError(
                 f"Unsupported task {self.task}. Please check the supported `task` option."
             )
+
+    def get_output_labels(self) -> Dict[str, List[str]]:
+        if self.task not in (
+            MLTask.sequence_classification,
+            MLTask.token_classification,
+        ):
+            return {}
+        id2label = self.model_config.id2label
+        return {"output-0": [id2label[i] for i in range(len(id2label))]}
+
+    @staticmethod
+    def _is_classification_requested(request: Union[Dict, InferRequest]) -> bool:
+        if not isinstance(request, InferRequest):
+            return False
+        requested_output = request.get_requested_output("output-0")
+        return (
+            requested_output is not None and requested_output.classification is not None
+        )
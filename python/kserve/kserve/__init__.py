@@ -17,7 +17,13 @@ from __future__ import absolute_import
 from .model import Model
 from .model_server import ModelServer
 from .inference_client import InferenceGRPCClient, InferenceRESTClient, RESTConfig
-from .protocol.infer_type import InferRequest, InferInput, InferResponse, InferOutput
+from .protocol.infer_type import (
+    InferRequest,
+    InferInput,
+    InferResponse,
+    InferOutput,
+    RequestedOutput,
+)
 from .model_repository import ModelRepository
 from .constants import constants
 from .utils import utils
@@ -0,0 +1,181 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Accounts the memory and CPU time used by every model served by this process.
+
+The models share the process, so the figures are estimates:
+
+* The memory of a model is the growth of the resident memory of the process while
+  the model loaded, which includes the memory of models loading at the same time. The
+  loads are measured where the model server and the model repository load the models,
+  models loaded by the user before starting the server are measured when loaded within
+  ``measure_load``.
+* The CPU time of a model is the CPU time of the thread running its synchronous
+  handlers. Coroutine handlers are not measured, the CPU time of the thread across an
+  await includes the CPU time of the other requests the event loop ran meanwhile.
+* With RSS growth alerts enabled, the resident memory growth of the process during
+  the requests of a model, after a warmup, is summed up. A model keeping memory
+  across its requests grows it steadily, while the growth of other models'
+  concurrent requests averages out.
+"""
+
+import contextlib
+import inspect
+import os
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterator, Optional
+
+import psutil
+
+from .logging import logger
+from .metrics import (
+    MODEL_CPU_SECONDS,
+    MODEL_LOAD_RSS_BYTES,
+    MODEL_RSS_GROWTH_ALERTS,
+    MODEL_RSS_GROWTH_BYTES,
+)
+
+DEFAULT_RSS_GROWTH_WARMUP = 100
+_MIB = 1024 * 1024
+
+_process = psutil.Process()
+_rss_growth_alert_bytes = 0
+_rss_growth_warmup = DEFAULT_RSS_GROWTH_WARMUP
+
+
+class ModelUsage:
+    """The memory and CPU time used by a model."""
+
+    def __init__(self):
+        self.load_rss_bytes: Optional[int] = None
+        self.cpu_seconds: Dict[str, float] = defaultdict(float)
+        self.requests = 0
+        self.rss_growth_bytes = 0
+        self._alerted_rss_growth_bytes = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        usage = {
+            "load_rss_bytes": self.load_rss_bytes,
+            "cpu_seconds": {
+                step: round(seconds, 6) for step, seconds in self.cpu_seconds.items()
+            },
+            "requests": self.requests,
+        }
+        if _rss_growth_alert_bytes:
+            usage["rss_growth_bytes"] = self.rss_growth_bytes
+        return usage
+
+
+_usage: Dict[str, ModelUsage] = {}
+
+
+def rss_bytes() -> int:
+    global _process
+    # Forked worker processes read their own memory
+    if _process.pid != os.getpid():
+        _process = psutil.Process()
+    return _process.memory_info().rss
+
+
+def model_usage(name: str) -> Optional[ModelUsage]:
+    return _usage.get(name)
+
+
+def _model_usage(name: str) -> ModelUsage:
+    usage = _usage.get(name)
+    if usage is None:
+        usage = _usage[name] = ModelUsage()
+    return usage
+
+
+def forget(name: str):
+    """Drops the usage of an unloaded model."""
+    if _usage.pop(name, None) is None:
+        return
+    for gauge in (MODEL_LOAD_RSS_BYTES, MODEL_RSS_GROWTH_BYTES):
+        try:
+            gauge.remove(name)
+        except KeyError:
+            pass
+
+
+def configure_rss_growth_alerts(
+    threshold_bytes: int, warmup_requests: int = DEFAULT_RSS_GROWTH_WARMUP
+):
+    """Alerts when the resident memory grows by more than the threshold during the
+    requests of a model, not counting its first ``warmup_requests`` requests.
+
+    Measuring the growth reads the resident memory twice per request, a threshold of
+    ``0`` disables the alerts.
+    """
+    global _rss_growth_alert_bytes, _rss_growth_warmup
+    _rss_growth_alert_bytes = threshold_bytes
+    _rss_growth_warmup = warmup_requests
+
+
+@contextlib.contextmanager
+def measure_load(name: str) -> Iterator[None]:
+    """Accounts the growth of the resident memory within the context to the model load."""
+    start = rss_bytes()
+    try:
+        yield
+    finally:
+        growth = rss_bytes() - start
+        _model_usage(name).load_rss_bytes = growth
+        MODEL_LOAD_RSS_BYTES.labels(name).set(growth)
+        logger.info(
+            f"Loading model {name} grew resident memory by {growth / _MIB:.1f} MiB"
+        )
+
+
+@contextlib.contextmanager
+def cpu_time(name: str, step: str, handler: Callable) -> Iterator[None]:
+    """Accounts the CPU time of the current thread within the context to the model,
+    unless the handler run within it is a coroutine function."""
+    if inspect.iscoroutinefunction(handler):
+        yield
+        return
+    start = time.thread_time()
+    try:
+        yield
+    finally:
+        seconds = time.thread_time() - start
+        _model_usage(name).cpu_seconds[step] += seconds
+        MODEL_CPU_SECONDS.labels(name, step).inc(seconds)
+
+
+def request_started() -> Optional[int]:
+    """Returns the resident memory to pass to ``request_finished``, if measured."""
+    return rss_bytes() if _rss_growth_alert_bytes else None
+
+
+def request_finished(name: str, start_rss_bytes: Optional[int]):
+    usage = _model_usage(name)
+    usage.requests += 1
+    if start_rss_bytes is None or usage.requests <= _rss_growth_warmup:
+        return
+    usage.rss_growth_bytes += rss_bytes() - start_rss_bytes
+    MODEL_RSS_GROWTH_BYTES.labels(name).set(usage.rss_growth_bytes)
+    if (
+        usage.rss_growth_bytes - usage._alerted_rss_growth_bytes
+        >= _rss_growth_alert_bytes
+    ):
+        usage._alerted_rss_growth_bytes = usage.rss_growth_bytes
+        MODEL_RSS_GROWTH_ALERTS.labels(name).inc()
+        logger.warning(
+            f"Resident memory grew by {usage.rss_growth_bytes / _MIB:.1f} MiB during "
+            f"{usage.requests - _rss_growth_warmup} requests of model {name} after "
+            "warmup, the model may be leaking memory"
+        )
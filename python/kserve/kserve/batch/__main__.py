@@ -0,0 +1,111 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import argparse
+import json
+
+from .. import logging
+from ..utils import utils
+from .io import READERS, WRITERS
+from .runner import ModelSpec, run
+
+parser = argparse.ArgumentParser(
+    description="Run offline batch inference with a KServe model.",
+    formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+)
+parser.add_argument(
+    "--model_class",
+    required=True,
+    help="The model class as 'package.module:Class', e.g. 'sklearnserver:SKLearnModel'.",
+)
+parser.add_argument(
+    "--model_name", default="model", help="The name passed to the model constructor."
+)
+parser.add_argument(
+    "--model_args",
+    default="{}",
+    type=json.loads,
+    help="Additional model constructor keyword arguments as a JSON object, "
+    'e.g. \'{"model_dir": "/mnt/models"}\'.',
+)
+parser.add_argument(
+    "--input", required=True, help="An input file or a directory of input files."
+)
+parser.add_argument("--output", required=True, help="The output file.")
+parser.add_argument(
+    "--input_format",
+    default=None,
+    choices=list(READERS),
+    help="The input format, inferred from the file extensions if not set.",
+)
+parser.add_argument(
+    "--output_format",
+    default=None,
+    choices=list(WRITERS),
+    help="The output format, inferred from the output extension if not set.",
+)
+parser.add_argument(
+    "--batch_size",
+    default=256,
+    type=int,
+    help="The number of instances sent to the model at a time.",
+)
+parser.add_argument(
+    "--workers",
+    default=1,
+    type=int,
+    help="The number of batches predicted concurrently.",
+)
+parser.add_argument(
+    "--parallelism",
+    default="thread",
+    choices=["thread", "process"],
+    help="Share one model between worker threads or load it in every worker process. "
+    "With threads, a model with async handlers or a predictor_host runs all its "
+    "coroutines on a single event loop.",
+)
+parser.add_argument(
+    "--report_interval",
+    default=10,
+    type=float,
+    help="Seconds between throughput log lines.",
+)
+parser.add_argument(
+    "--configure_logging",
+    default=True,
+    type=lambda x: utils.strtobool(x),
+    help="Enable to configure KServe logging.",
+)
+parser.add_argument(
+    "--log_config_file",
+    default=None,
+    type=str,
+    help="File path containing the log config. Needs to be a yaml or json file.",
+)
+
+if __name__ == "__main__":
+    args = parser.parse_args()
+    if args.configure_logging:
+        logging.configure_logging(args.log_config_file)
+    run(
+        ModelSpec(args.model_class, args.model_name, args.model_args),
+        input_path=args.input,
+        output_path=args.output,
+        batch_size=args.batch_size,
+        workers=args.workers,
+        parallelism=args.parallelism,
+        input_format=args.input_format,
+        output_format=args.output_format,
+        report_interval=args.report_interval,
+    )
@@ -0,0 +1,173 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Readers and writers streaming instances and predictions of offline batch jobs."""
+
+import os
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional, Union
+
+import numpy as np
+import orjson
+import pandas as pd
+
+from ..utils import json_codec
+
+Batch = Union[List[Any], pd.DataFrame, np.ndarray]
+
+_EXTENSIONS = {
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".npy": "npy",
+}
+
+
+def _read_jsonl(path: str, batch_size: int) -> Iterator[Batch]:
+    batch = []
+    with open(path, "rb") as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                batch.append(orjson.loads(line))
+            except orjson.JSONDecodeError as e:
+                raise ValueError(f"Invalid JSON on line {line_number} of {path}: {e}")
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+
+def _read_csv(path: str, batch_size: int) -> Iterator[Batch]:
+    with pd.read_csv(path, chunksize=batch_size) as reader:
+        for chunk in reader:
+            yield chunk.reset_index(drop=True)
+
+
+def _read_parquet(path: str, batch_size: int) -> Iterator[Batch]:
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError(
+            "Parquet inputs require the 'pyarrow' package to be installed"
+        )
+    for record_batch in pq.ParquetFile(path).iter_batches(batch_size=batch_size):
+        yield record_batch.to_pandas()
+
+
+def _read_npy(path: str, batch_size: int) -> Iterator[Batch]:
+    # Memory mapped so that only the current batch is read from disk
+    array = np.load(path, mmap_mode="r")
+    for start in range(0, len(array), batch_size):
+        yield np.array(array[start : start + batch_size])
+
+
+READERS: Dict[str, Callable[[str, int], Iterator[Batch]]] = {
+    "jsonl": _read_jsonl,
+    "csv": _read_csv,
+    "parquet": _read_parquet,
+    "npy": _read_npy,
+}
+
+
+def file_format(path: str) -> Optional[str]:
+    """Returns the batch file format of the path from its extension, or None if unknown."""
+    return _EXTENSIONS.get(os.path.splitext(path)[1].lower())
+
+
+def input_files(path: str, input_format: Optional[str] = None) -> List[str]:
+    """Lists the input files of a batch job.
+
+    Args:
+        path: An input file, or a directory whose files are read in name order.
+        input_format: The format of the input files, inferred from their extension if not set.
+                      Files in a directory with a different format are skipped.
+
+    Returns:
+        The input file paths.
+    """
+    if not os.path.isdir(path):
+        return [path]
+    files = []
+    for name in sorted(os.listdir(path)):
+        file_path = os.path.join(path, name)
+        fmt = file_format(name)
+        if os.path.isfile(file_path) and fmt is not None:
+            if input_format is None or fmt == input_format:
+                files.append(file_path)
+    return files
+
+
+def read_batches(
+    path: str, batch_size: int, input_format: Optional[str] = None
+) -> Iterator[Batch]:
+    """Reads the instances of a batch job in batches.
+
+    JSON lines files hold one instance per line and are read as lists, CSV and Parquet
+    files are read as DataFrames and NPY files as numpy arrays of rows. Batches never
+    span multiple files.
+
+    Args:
+        path: An input file or directory, see :func:`input_files`.
+        batch_size: The maximum number of instances in a batch.
+        input_format: One of ``jsonl``, ``csv``, ``parquet`` or ``npy``. Inferred from
+                      the file extension if not set.
+
+    Yields:
+        Batches of instances.
+
+    Raises:
+        ValueError: If the format of a file is not supported.
+    """
+    for file_path in input_files(path, input_format):
+        fmt = input_format or file_format(file_path)
+        if fmt not in READERS:
+            raise ValueError(
+                f"Unsupported input format for {file_path}, "
+                f"expected one of {list(READERS)}"
+            )
+        yield from READERS[fmt](file_path, batch_size)
+
+
+class JSONLinesWriter:
+    """Writes one prediction per line as JSON."""
+
+    def __init__(self, f: BinaryIO):
+        self._f = f
+
+    def write(self, predictions: Batch):
+        self._f.write(b"".join(json_codec.dumps(p) + b"\n" for p in predictions))
+
+
+class CSVWriter:
+    """Writes predictions as CSV rows, scalar predictions go to a ``predictions`` column."""
+
+    def __init__(self, f: BinaryIO):
+        self._f = f
+        self._header = True
+
+    def write(self, predictions: Batch):
+        if isinstance(predictions, pd.DataFrame):
+            df = predictions
+        elif len(predictions) > 0 and isinstance(predictions[0], dict):
+            df = pd.DataFrame.from_records(predictions)
+        else:
+            df = pd.DataFrame({"predictions": list(predictions)})
+        self._f.write(df.to_csv(header=self._header, index=False).encode("utf-8"))
+        self._header = False
+
+
+WRITERS = {"jsonl": JSONLinesWriter, "csv": CSVWriter}
@@ -0,0 +1,274 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import collections
+import concurrent.futures
+import importlib
+import inspect
+import os
+import threading
+import time
+from typing import Any, Dict, NamedTuple, Optional
+
+from .. import accounting
+from ..logging import logger
+from ..metrics import observe_batch_size
+from ..model import Model
+from .io import WRITERS, Batch, file_format, read_batches
+
+# Model used by the workers of the current process, see _init_worker
+_model: Optional[Model] = None
+_local = threading.local()
+# Event loop of the model shared by the worker threads in thread mode
+_model_loop: Optional["_LoopThread"] = None
+_ASYNC_HANDLERS = ("preprocess", "predict", "postprocess")
+
+
+class ModelSpec(NamedTuple):
+    """Describes how to construct a model in the batch workers.
+
+    Args:
+        model_class: The model class as ``package.module:Class`` or ``package.module.Class``.
+        model_name: The model name, passed as the first constructor argument.
+        model_args: Additional keyword arguments for the model constructor.
+    """
+
+    model_class: str
+    model_name: str
+    model_args: Optional[Dict[str, Any]] = None
+
+
+class BatchStats(NamedTuple):
+    instances: int
+    batches: int
+    seconds: float
+
+    @property
+    def throughput(self) -> float:
+        return self.instances / self.seconds if self.seconds > 0 else 0.0
+
+
+def load_model(spec: ModelSpec) -> Model:
+    """Constructs the model described by the spec and calls its ``load()``."""
+    module_name, sep, class_name = spec.model_class.partition(":")
+    if not sep:
+        module_name, _, class_name = spec.model_class.rpartition(".")
+    model_cls = getattr(importlib.import_module(module_name), class_name)
+    model = model_cls(spec.model_name, **(spec.model_args or {}))
+    with accounting.measure_load(spec.model_name):
+        result = model.load()
+        if inspect.isawaitable(result):
+            _run(result)
+    if not model.ready:
+        raise RuntimeError(f"Model {spec.model_name} is not ready after loading")
+    return model
+
+
+def _init_worker(spec: ModelSpec):
+    global _model
+    _model = load_model(spec)
+
+
+class _LoopThread:
+    """Runs an event loop in a daemon thread for the coroutines of a model shared by
+    several worker threads, as the async clients of a model only work on the loop
+    they were created on."""
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self.loop.run_forever, name="kserve-batch-loop", daemon=True
+        )
+        self._thread.start()
+
+    def run(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    def close(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
+
+
+def _uses_event_loop(model: Model) -> bool:
+    # The default handlers are coroutines, but only await when a predictor_host is set
+    if getattr(model, "predictor_host", None):
+        return True
+    return any(
+        inspect.iscoroutinefunction(getattr(model, name))
+        and getattr(type(model), name) is not getattr(Model, name)
+        for name in _ASYNC_HANDLERS
+    )
+
+
+def _run(coro, shared: bool = True):
+    if shared and _model_loop is not None:
+        return _model_loop.run(coro)
+    # Every worker thread reuses its own event loop for the sync model methods
+    loop = getattr(_local, "loop", None)
+    if loop is None:
+        loop = _local.loop = asyncio.new_event_loop()
+    return loop.run_until_complete(coro)
+
+
+def _predict(batch: Batch, shared: bool = False):
+    observe_batch_size(_model.name, len(batch))
+    response = _run(_model({"instances": batch}), shared=shared)
+    if not isinstance(response, dict) or "predictions" not in response:
+        raise RuntimeError(
+            f"Expected a v1 response with predictions but got {type(response)}"
+        )
+    predictions = response["predictions"]
+    if len(predictions) != len(batch):
+        raise RuntimeError(
+            f"Model returned {len(predictions)} predictions for {len(batch)} instances"
+        )
+    return predictions
+
+
+def run(
+    spec: ModelSpec,
+    input_path: str,
+    output_path: str,
+    batch_size: int = 256,
+    workers: int = 1,
+    parallelism: str = "thread",
+    input_format: Optional[str] = None,
+    output_format: Optional[str] = None,
+    report_interval: float = 10,
+) -> BatchStats:
+    """Runs offline batch inference with a model.
+
+    The model is loaded with its normal ``load()`` and every batch goes through
+    ``preprocess``, ``predict`` and ``postprocess`` as a v1 ``{"instances": [...]}``
+    request. Predictions are written to the output in input order as soon as they are
+    available, at most ``2 * workers`` batches are in flight so that memory use does not
+    depend on the size of the input.
+
+    Args:
+        spec: The model to run.
+        input_path: An input file or a directory of input files.
+        output_path: The output file.
+        batch_size: The number of instances sent to the model at a time.
+        workers: The number of batches predicted concurrently.
+        parallelism: ``thread`` to share one model between worker threads, or ``process``
+                     to load the model in every worker process. In thread mode a model
+                     with async handlers or a ``predictor_host`` runs all its coroutines
+                     on one event loop, as its async clients are bound to that loop.
+        input_format: The input format, inferred from the file extensions if not set.
+        output_format: ``jsonl`` or ``csv``, inferred from the output extension if not set.
+        report_interval: Seconds between throughput log lines.
+
+    Returns:
+        The number of instances and batches processed and the elapsed time.
+    """
+    output_format = output_format or file_format(output_path) or "jsonl"
+    if output_format not in WRITERS:
+        raise ValueError(
+            f"Unsupported output format {output_format}, expected one of {list(WRITERS)}"
+        )
+    if parallelism == "process":
+        executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(spec,)
+        )
+        shared = False
+    elif parallelism == "thread":
+        _init_thread_worker(spec)
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+        shared = _uses_event_loop(_model)
+    else:
+        raise ValueError(f"Unsupported parallelism {parallelism}")
+    try:
+        return _run_batches(
+            executor,
+            shared,
+            input_path,
+            output_path,
+            output_format,
+            batch_size,
+            workers,
+            input_format,
+            report_interval,
+        )
+    finally:
+        _close_model_loop()
+
+
+def _init_thread_worker(spec: ModelSpec):
+    global _model_loop
+    _model_loop = _LoopThread()
+    try:
+        _init_worker(spec)
+    except BaseException:
+        _close_model_loop()
+        raise
+
+
+def _close_model_loop():
+    global _model_loop
+    if _model_loop is not None:
+        _model_loop.close()
+        _model_loop = None
+
+
+def _run_batches(
+    executor: concurrent.futures.Executor,
+    shared: bool,
+    input_path: str,
+    output_path: str,
+    output_format: str,
+    batch_size: int,
+    workers: int,
+    input_format: Optional[str],
+    report_interval: float,
+) -> BatchStats:
+
+    instances = 0
+    batches = 0
+    start = last_report = time.monotonic()
+    pending = collections.deque()
+    output_dir = os.path.dirname(output_path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    with executor, open(output_path, "wb") as f:
+        writer = WRITERS[output_format](f)
+
+        def write_next():
+            nonlocal instances, batches, last_report
+            size, future = pending.popleft()
+            writer.write(future.result())
+            instances += size
+            batches += 1
+            now = time.monotonic()
+            if now - last_report >= report_interval:
+                last_report = now
+                logger.info(
+                    f"Processed {instances} instances in {batches} batches, "
+                    f"{instances / (now - start):.1f} instances/s"
+                )
+
+        for batch in read_batches(input_path, batch_size, input_format):
+            pending.append((len(batch), executor.submit(_predict, batch, shared)))
+            if len(pending) >= 2 * workers:
+                write_next()
+        while pending:
+            write_next()
+
+    stats = BatchStats(instances, batches, time.monotonic() - start)
+    logger.info(
+        f"Finished {stats.instances} instances in {stats.batches} batches "
+        f"in {stats.seconds:.2f}s, {stats.throughput:.1f} instances/s"
+    )
+    return stats
@@ -0,0 +1,30 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Local load testing of the model server, run with ``python -m kserve.benchmark``."""
+
+from .harness import REFERENCE_MODELS, ReferenceModel, compare, run_benchmark, serve
+from .loadgen import Client, LoadResult, Target, run_load
+
+__all__ = [
+    "Client",
+    "LoadResult",
+    "REFERENCE_MODELS",
+    "ReferenceModel",
+    "Target",
+    "compare",
+    "run_benchmark",
+    "run_load",
+    "serve",
+]
@@ -0,0 +1,105 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import argparse
+import json
+
+from .. import logging
+from ..logging import logger
+from .harness import REFERENCE_MODELS, compare, run_benchmark
+from .loadgen import PROTOCOLS
+
+parser = argparse.ArgumentParser(
+    description="Benchmark the model server with reference models on this machine. "
+    "The sklearn, xgboost, lightgbm and huggingface models require their model server "
+    "package to be installed.",
+    formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+)
+parser.add_argument(
+    "--models",
+    nargs="+",
+    default=["dummy"],
+    choices=list(REFERENCE_MODELS),
+    help="The reference models to benchmark.",
+)
+parser.add_argument(
+    "--protocols",
+    nargs="+",
+    default=PROTOCOLS,
+    choices=PROTOCOLS,
+    help="The protocols to send requests with, skipped for models not supporting them.",
+)
+parser.add_argument(
+    "--qps",
+    nargs="*",
+    default=[100.0],
+    type=float,
+    help="The request rates of the fixed QPS runs.",
+)
+parser.add_argument(
+    "--concurrency",
+    nargs="*",
+    default=[1, 8],
+    type=int,
+    help="The number of clients of the closed loop runs.",
+)
+parser.add_argument(
+    "--duration", default=10, type=float, help="The measured seconds per run."
+)
+parser.add_argument(
+    "--warmup",
+    default=2,
+    type=float,
+    help="The seconds of unmeasured load before every run.",
+)
+parser.add_argument(
+    "--server_args",
+    default="",
+    help="Additional model server arguments, e.g. '--workers 2 --enable_lean_routes true'.",
+)
+parser.add_argument(
+    "--server_log",
+    default=None,
+    help="The file the model server output is appended to, discarded if not set.",
+)
+parser.add_argument(
+    "--output", required=True, help="The JSON file the results are written to."
+)
+parser.add_argument(
+    "--baseline",
+    default=None,
+    help="The JSON results of a previous run to compare the throughput and p99 latency with.",
+)
+
+if __name__ == "__main__":
+    args = parser.parse_args()
+    logging.configure_logging()
+    report = run_benchmark(
+        models=args.models,
+        protocols=args.protocols,
+        qps=args.qps,
+        concurrency=args.concurrency,
+        duration=args.duration,
+        warmup=args.warmup,
+        server_args=args.server_args.split(),
+        server_log=args.server_log,
+    )
+    if args.baseline:
+        with open(args.baseline) as f:
+            report["comparison"] = compare(report, json.load(f))
+        for change in report["comparison"]:
+            logger.info(f"Compared to the baseline: {change}")
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    logger.info(f"Results written to {args.output}")
@@ -0,0 +1,96 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Models which return their input, to measure the overhead of the model server alone.
+
+Serve them with ``python -m kserve.benchmark.dummy``, which accepts the model server
+arguments.
+"""
+
+import argparse
+import time
+import uuid
+from typing import AsyncIterator, Dict, Union
+
+from ..model import Model
+from ..model_server import ModelServer
+from ..model_server import parser as model_server_parser
+from ..protocol.infer_type import InferRequest, InferResponse
+from ..protocol.rest.openai import (
+    ChatCompletionRequest,
+    CompletionRequest,
+    OpenAIModel,
+)
+from ..protocol.rest.openai.types import (
+    ChatCompletion,
+    ChatCompletionChunk,
+    Completion,
+    CompletionChoice,
+    CompletionUsage,
+)
+from ..utils.utils import get_predict_input, get_predict_response
+
+
+class DummyModel(Model):
+    """Returns the instances of v1 requests and the inputs of v2 requests."""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.ready = True
+
+    async def predict(
+        self, payload: Union[Dict, InferRequest], headers: Dict[str, str] = None
+    ) -> Union[Dict, InferResponse]:
+        if isinstance(payload, InferRequest):
+            return get_predict_response(payload, get_predict_input(payload), self.name)
+        return {"predictions": payload["instances"]}
+
+
+class DummyCompletionModel(OpenAIModel):
+    """Completes the prompt with itself, one token per whitespace separated word."""
+
+    async def create_completion(self, request: CompletionRequest) -> Completion:
+        prompt = request.params.prompt
+        if not isinstance(prompt, str):
+            raise NotImplementedError("Only single string prompts are supported")
+        tokens = len(prompt.split())
+        return Completion(
+            id=request.request_id or str(uuid.uuid4()),
+            object="text_completion",
+            created=int(time.time()),
+            model=self.name,
+            choices=[
+                CompletionChoice(
+                    index=0, text=prompt, logprobs=None, finish_reason="length"
+                )
+            ],
+            usage=CompletionUsage(
+                prompt_tokens=tokens, completion_tokens=tokens, total_tokens=2 * tokens
+            ),
+        )
+
+    async def create_chat_completion(
+        self, request: ChatCompletionRequest
+    ) -> Union[ChatCompletion, AsyncIterator[ChatCompletionChunk]]:
+        raise NotImplementedError("Chat completions are not supported")
+
+
+parser = argparse.ArgumentParser(parents=[model_server_parser])
+
+if __name__ == "__main__":
+    args, _ = parser.parse_known_args()
+    # The completion model is registered under its own name so that both are served
+    ModelServer().start(
+        [DummyModel(args.model_name), DummyCompletionModel(f"{args.model_name}-llm")]
+    )
@@ -0,0 +1,367 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import contextlib
+import os
+import pathlib
+import platform
+import socket
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from importlib import metadata
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Sequence
+
+import httpx
+import numpy as np
+
+from ..logging import logger
+from ..protocol.infer_type import InferInput, InferRequest
+from .loadgen import Client, Target, run_load
+
+# The example models of the model servers, when run from a source checkout
+_PYTHON_DIR = pathlib.Path(__file__).resolve().parents[3]
+_IRIS_INSTANCES = [[6.8, 2.8, 4.8, 1.4], [6.0, 3.4, 4.5, 1.6]]
+
+
+def _iris_request() -> InferRequest:
+    infer_input = InferInput("input-0", [2, 4], "FP32")
+    infer_input.set_data_from_numpy(
+        np.array(_IRIS_INSTANCES, dtype=np.float32), binary_data=False
+    )
+    return InferRequest(model_name="model", infer_inputs=[infer_input])
+
+
+def _text_request(text: str) -> InferRequest:
+    infer_input = InferInput("input-0", [1], "BYTES", [text])
+    return InferRequest(model_name="model", infer_inputs=[infer_input])
+
+
+class ReferenceModel(NamedTuple):
+    """A model server and the requests it is benchmarked with.
+
+    Args:
+        command: The command starting the model server, without the port and model name
+                 arguments.
+        protocols: The protocols the model supports.
+        instances: The instances of v1 requests.
+        infer_request: The v2 REST and gRPC request.
+        prompt: The prompt of OpenAI completion requests.
+        completion_model_suffix: Appended to the model name for completion requests.
+    """
+
+    command: List[str]
+    protocols: List[str]
+    instances: Optional[List] = None
+    infer_request: Optional[InferRequest] = None
+    prompt: Optional[str] = None
+    completion_model_suffix: str = ""
+
+
+_FILL_MASK_TEXT = "The capital of France is [MASK]."
+
+REFERENCE_MODELS = {
+    "dummy": ReferenceModel(
+        command=[sys.executable, "-m", "kserve.benchmark.dummy"],
+        protocols=["v1", "v2", "grpc", "openai"],
+        instances=_IRIS_INSTANCES,
+        infer_request=_iris_request(),
+        prompt="Benchmark the model server",
+        completion_model_suffix="-llm",
+    ),
+    "sklearn": ReferenceModel(
+        command=[
+            sys.executable,
+            "-m",
+            "sklearnserver",
+            "--model_dir",
+            str(
+                _PYTHON_DIR / "sklearnserver/sklearnserver/example_models/joblib/model"
+            ),
+        ],
+        protocols=["v1", "v2", "grpc"],
+        instances=_IRIS_INSTANCES,
+        infer_request=_iris_request(),
+    ),
+    "xgboost": ReferenceModel(
+        command=[
+            sys.executable,
+            "-m",
+            "xgbserver",
+            "--model_dir",
+            str(_PYTHON_DIR / "xgbserver/xgbserver/example_model/json_model"),
+            "--nthread",
+            "1",
+        ],
+        protocols=["v1", "v2", "grpc"],
+        instances=_IRIS_INSTANCES,
+        infer_request=_iris_request(),
+    ),
+    "lightgbm": ReferenceModel(
+        command=[
+            sys.executable,
+            "-m",
+            "lgbserver",
+            "--model_dir",
+            str(_PYTHON_DIR / "lgbserver/lgbserver/example_model/model"),
+            "--nthread",
+            "1",
+        ],
+        protocols=["v1", "v2", "grpc"],
+        instances=_IRIS_INSTANCES,
+        infer_request=_iris_request(),
+    ),
+    "huggingface": ReferenceModel(
+        command=[
+            sys.executable,
+            "-m",
+            "huggingfaceserver",
+            "--model_id",
+            "hf-internal-testing/tiny-random-bert",
+            "--task",
+            "fill_mask",
+        ],
+        protocols=["v1", "v2", "grpc"],
+        instances=[_FILL_MASK_TEXT],
+        infer_request=_text_request(_FILL_MASK_TEXT),
+    ),
+}
+
+
+class Scenario(NamedTuple):
+    """One load run, at a fixed ``qps`` or with closed loop ``concurrency``."""
+
+    protocol: str
+    qps: Optional[float] = None
+    concurrency: Optional[int] = None
+
+    @property
+    def mode(self) -> str:
+        return "qps" if self.qps is not None else "concurrency"
+
+    @property
+    def load(self) -> float:
+        return self.qps if self.qps is not None else self.concurrency
+
+
+def scenarios(
+    protocols: Sequence[str],
+    qps: Sequence[float] = (),
+    concurrency: Sequence[int] = (),
+) -> List[Scenario]:
+    return [Scenario(p, qps=rate) for p in protocols for rate in qps] + [
+        Scenario(p, concurrency=clients) for p in protocols for clients in concurrency
+    ]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextlib.contextmanager
+def serve(
+    reference: ReferenceModel,
+    model_name: str = "model",
+    server_args: Sequence[str] = (),
+    startup_timeout: float = 300,
+    server_log: Optional[str] = None,
+) -> Iterator[Target]:
+    """Starts a model server in a subprocess and stops it on exit.
+
+    The server runs in its own process so that the load generator does not compete
+    with it for the GIL. Its output is discarded unless ``server_log`` is set, writing
+    it to a terminal would slow it down.
+
+    Yields:
+        The target the requests are sent to once the model is ready.
+    """
+    http_port, grpc_port = _free_port(), _free_port()
+    command = reference.command + [
+        "--model_name",
+        model_name,
+        "--http_port",
+        str(http_port),
+        "--grpc_port",
+        str(grpc_port),
+        *server_args,
+    ]
+    logger.info(f"Starting {' '.join(command)}")
+    output = open(server_log, "a") if server_log else subprocess.DEVNULL
+    process = subprocess.Popen(command, stdout=output, stderr=subprocess.STDOUT)
+    try:
+        http_url = f"http://127.0.0.1:{http_port}"
+        deadline = time.monotonic() + startup_timeout
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError(
+                    f"Model server exited with code {process.returncode}, set a "
+                    "server log file to see why"
+                )
+            try:
+                if httpx.get(f"{http_url}/v1/models/{model_name}").status_code == 200:
+                    break
+            except httpx.TransportError:
+                pass
+            if time.monotonic() > deadline:
+                raise TimeoutError(
+                    f"Model {model_name} not ready in {startup_timeout}s"
+                )
+            time.sleep(0.5)
+        yield Target(
+            model_name=model_name,
+            http_url=http_url,
+            grpc_address=f"127.0.0.1:{grpc_port}",
+            instances=reference.instances,
+            infer_request=reference.infer_request,
+            prompt=reference.prompt,
+        )
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            process.kill()
+        if server_log:
+            output.close()
+
+
+async def run_scenario(
+    target: Target, scenario: Scenario, duration: float, warmup: float
+) -> Dict[str, Any]:
+    client = Client(scenario.protocol, target)
+    try:
+        result = await run_load(
+            client.send,
+            duration,
+            qps=scenario.qps,
+            concurrency=scenario.concurrency,
+            warmup=warmup,
+        )
+    finally:
+        await client.close()
+    return {
+        "protocol": scenario.protocol,
+        "mode": scenario.mode,
+        "load": scenario.load,
+        **result.to_dict(),
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=_PYTHON_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment() -> Dict[str, Any]:
+    """Describes where the benchmark ran, to tell apart results of other machines."""
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "git_commit": _git_commit(),
+        "kserve_version": metadata.version("kserve"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def run_benchmark(
+    models: Sequence[str],
+    protocols: Sequence[str],
+    qps: Sequence[float] = (),
+    concurrency: Sequence[int] = (),
+    duration: float = 10,
+    warmup: float = 2,
+    server_args: Sequence[str] = (),
+    server_log: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Benchmarks every reference model with every protocol and load it supports.
+
+    Args:
+        models: The names of the reference models, see ``REFERENCE_MODELS``.
+        protocols: The protocols to send requests with, unsupported ones are skipped.
+        qps: The request rates of the fixed QPS runs.
+        concurrency: The number of clients of the closed loop runs.
+        duration: The measured seconds per run.
+        warmup: The seconds of unmeasured load before every run.
+        server_args: Additional model server arguments, e.g. ``--workers 2``.
+        server_log: The file the output of the model servers is appended to.
+
+    Returns:
+        The environment and the throughput and latency percentiles of every run.
+    """
+    results = []
+    for name in models:
+        reference = REFERENCE_MODELS[name]
+        supported = [p for p in protocols if p in reference.protocols]
+        with serve(
+            reference, model_name=name, server_args=server_args, server_log=server_log
+        ) as target:
+            for scenario in scenarios(supported, qps, concurrency):
+                scenario_target = target
+                if scenario.protocol == "openai":
+                    scenario_target = target._replace(
+                        model_name=name + reference.completion_model_suffix
+                    )
+                result = asyncio.run(
+                    run_scenario(scenario_target, scenario, duration, warmup)
+                )
+                logger.info(f"{name} {result}")
+                results.append({"model": name, **result})
+    return {
+        "environment": environment(),
+        "server_args": list(server_args),
+        "results": results,
+    }
+
+
+def _key(result: Dict[str, Any]):
+    return result["model"], result["protocol"], result["mode"], result["load"]
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Returns the relative throughput and p99 latency change of the matching runs."""
+    baseline_results = {_key(result): result for result in baseline["results"]}
+    changes = []
+    for result in report["results"]:
+        base = baseline_results.get(_key(result))
+        if base is None or not base["throughput"] or not base["latency_ms"]:
+            continue
+        changes.append(
+            {
+                "model": result["model"],
+                "protocol": result["protocol"],
+                "mode": result["mode"],
+                "load": result["load"],
+                "throughput_change": round(
+                    result["throughput"] / base["throughput"] - 1, 4
+                ),
+                "p99_change": round(
+                    result["latency_ms"].get("p99", 0) / base["latency_ms"]["p99"] - 1,
+                    4,
+                ),
+            }
+        )
+    return changes
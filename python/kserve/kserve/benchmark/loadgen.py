@@ -0,0 +1,229 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import functools
+import time
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional
+
+import grpc
+import httpx
+import numpy as np
+import orjson
+
+from ..protocol.grpc.grpc_predict_v2_pb2_grpc import GRPCInferenceServiceStub
+from ..protocol.infer_type import InferRequest
+
+PROTOCOLS = ["v1", "v2", "grpc", "openai"]
+
+Send = Callable[[], Awaitable[Any]]
+
+
+class LoadResult(NamedTuple):
+    """The outcome of a load run.
+
+    Latencies are in seconds and only include the successful requests. With a fixed
+    QPS they are measured from the time the request was scheduled, so that requests
+    delayed by a saturated client or server are not under-reported.
+    """
+
+    requests: int
+    errors: int
+    seconds: float
+    latencies: List[float]
+
+    @property
+    def throughput(self) -> float:
+        return (self.requests - self.errors) / self.seconds if self.seconds > 0 else 0.0
+
+    def latency_ms(self) -> Dict[str, float]:
+        if not self.latencies:
+            return {}
+        latencies = np.asarray(self.latencies) * 1000
+        p50, p90, p99 = np.percentile(latencies, [50, 90, 99])
+        return {
+            "mean": round(float(latencies.mean()), 3),
+            "p50": round(float(p50), 3),
+            "p90": round(float(p90), 3),
+            "p99": round(float(p99), 3),
+            "max": round(float(latencies.max()), 3),
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "seconds": round(self.seconds, 3),
+            "throughput": round(self.throughput, 3),
+            "latency_ms": self.latency_ms(),
+        }
+
+
+async def _closed_loop(send: Send, concurrency: int, duration: float) -> LoadResult:
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                await send()
+            except Exception:
+                errors += 1
+            else:
+                latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    seconds = time.perf_counter() - start
+    return LoadResult(len(latencies) + errors, errors, seconds, latencies)
+
+
+async def _open_loop(
+    send: Send, qps: float, duration: float, max_in_flight: int
+) -> LoadResult:
+    latencies = []
+    errors = 0
+    in_flight = asyncio.Semaphore(max_in_flight)
+
+    async def request(scheduled: float):
+        nonlocal errors
+        async with in_flight:
+            try:
+                await send()
+            except Exception:
+                errors += 1
+            else:
+                latencies.append(time.perf_counter() - scheduled)
+
+    tasks = []
+    start = time.perf_counter()
+    for i in range(int(qps * duration)):
+        scheduled = start + i / qps
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(request(scheduled)))
+    await asyncio.gather(*tasks)
+    seconds = time.perf_counter() - start
+    return LoadResult(len(tasks), errors, seconds, latencies)
+
+
+async def run_load(
+    send: Send,
+    duration: float,
+    qps: Optional[float] = None,
+    concurrency: Optional[int] = None,
+    warmup: float = 0,
+    max_in_flight: int = 1024,
+) -> LoadResult:
+    """Sends requests for a duration, at a fixed rate or from concurrent clients.
+
+    Args:
+        send: Sends one request, raises on failure.
+        duration: How long to send requests for, in seconds.
+        qps: The number of requests per second of an open loop run. The requests are
+             sent on schedule whether or not the previous ones completed.
+        concurrency: The number of clients of a closed loop run, every client sends its
+                     next request as soon as the previous one completed.
+        warmup: Seconds of load, with the same settings, which are not measured.
+        max_in_flight: The maximum number of outstanding requests of an open loop run.
+
+    Returns:
+        The result of the measured run.
+    """
+    if (qps is None) == (concurrency is None):
+        raise ValueError("Exactly one of qps and concurrency must be set")
+    if qps is not None:
+        run = functools.partial(_open_loop, send, qps, max_in_flight=max_in_flight)
+    else:
+        run = functools.partial(_closed_loop, send, concurrency)
+    if warmup > 0:
+        await run(warmup)
+    return await run(duration)
+
+
+class Target(NamedTuple):
+    """Where the requests are sent and what they contain.
+
+    Args:
+        model_name: The model the requests are sent to.
+        http_url: The base URL of the REST server.
+        grpc_address: The ``host:port`` of the gRPC server.
+        instances: The instances of v1 requests.
+        infer_request: The v2 REST and gRPC request.
+        prompt: The prompt of OpenAI completion requests.
+    """
+
+    model_name: str
+    http_url: str
+    grpc_address: str
+    instances: Optional[List] = None
+    infer_request: Optional[InferRequest] = None
+    prompt: Optional[str] = None
+
+
+class Client:
+    """Sends the requests of one protocol, see :meth:`send`.
+
+    Request bodies are serialized once up front so that the client spends as little
+    time as possible per request.
+    """
+
+    def __init__(self, protocol: str, target: Target, max_connections: int = 1024):
+        if protocol not in PROTOCOLS:
+            raise ValueError(f"Unsupported protocol {protocol}, expected {PROTOCOLS}")
+        self.protocol = protocol
+        self._http = None
+        self._channel = None
+        model_name = target.model_name
+        if protocol == "grpc":
+            self._channel = grpc.aio.insecure_channel(target.grpc_address)
+            self._stub = GRPCInferenceServiceStub(self._channel)
+            self._grpc_request = target.infer_request.to_grpc()
+            self._grpc_request.model_name = model_name
+            return
+        self._http = httpx.AsyncClient(
+            base_url=target.http_url,
+            limits=httpx.Limits(max_connections=max_connections),
+            timeout=None,
+        )
+        if protocol == "v1":
+            self._path = f"/v1/models/{model_name}:predict"
+            body = {"instances": target.instances}
+        elif protocol == "v2":
+            self._path = f"/v2/models/{model_name}/infer"
+            body = target.infer_request.to_rest()
+        else:
+            self._path = "/openai/v1/completions"
+            body = {"model": model_name, "prompt": target.prompt, "max_tokens": 16}
+        self._body = orjson.dumps(body, option=orjson.OPT_SERIALIZE_NUMPY)
+        self._headers = {"content-type": "application/json"}
+
+    async def send(self):
+        if self._channel is not None:
+            await self._stub.ModelInfer(self._grpc_request)
+            return
+        response = await self._http.post(
+            self._path, content=self._body, headers=self._headers
+        )
+        response.raise_for_status()
+
+    async def close(self):
+        if self._channel is not None:
+            await self._channel.close()
+        if self._http is not None:
+            await self._http.aclose()
@@ -0,0 +1,291 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Replays the requests recorded by a model server started with
+``--record_requests_file``, run with ``python -m kserve.benchmark.replay``.
+
+The requests are sent in their recorded order with their recorded inter-arrival
+times, divided by the replay speed, so that the same traffic is reproduced against
+different server versions or settings.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import grpc
+import httpx
+import orjson
+
+from .. import logging
+from ..logging import logger
+from ..protocol.grpc.grpc_predict_v2_pb2_grpc import GRPCInferenceServiceStub
+from ..protocol.infer_type import InferRequest
+from ..recorder import REDACTED
+from .loadgen import LoadResult
+
+
+def read_recording(paths: Iterable[str]) -> List[Dict[str, Any]]:
+    """Reads the requests of the recorded files, rotated ones included, by arrival time.
+
+    Requests recorded without their body can not be replayed and are skipped.
+    """
+    records = []
+    skipped = 0
+    for path in paths:
+        with open(path, "rb") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = orjson.loads(line)
+                if record.get("body") is None:
+                    skipped += 1
+                    continue
+                records.append(record)
+    if skipped:
+        logger.warning(f"Skipped {skipped} requests recorded without their body")
+    return sorted(records, key=lambda record: record["time"])
+
+
+class ReplayClient:
+    """Sends recorded requests with the protocol they were received with.
+
+    Redacted headers are not sent, ``headers`` are added to every request instead,
+    e.g. to authenticate with the server.
+    """
+
+    def __init__(
+        self,
+        http_url: str,
+        grpc_address: Optional[str] = None,
+        headers: Optional[Dict[str, str]] = None,
+        model_name: Optional[str] = None,
+        max_connections: int = 1024,
+    ):
+        self._http = httpx.AsyncClient(
+            base_url=http_url,
+            limits=httpx.Limits(max_connections=max_connections),
+            timeout=None,
+        )
+        self._channel = None
+        if grpc_address:
+            self._channel = grpc.aio.insecure_channel(grpc_address)
+            self._stub = GRPCInferenceServiceStub(self._channel)
+        self._headers = headers or {}
+        self._model_name = model_name
+
+    def _request_headers(self, record: Dict[str, Any]) -> Dict[str, str]:
+        headers = {
+            name: value
+            for name, value in record["headers"].items()
+            if value != REDACTED
+        }
+        headers.update(self._headers)
+        return headers
+
+    async def send(self, record: Dict[str, Any]):
+        model_name = self._model_name or record["model"]
+        headers = self._request_headers(record)
+        if record["protocol"] == "grpc":
+            if self._channel is None:
+                raise ValueError("A gRPC address is required to replay gRPC requests")
+            request = InferRequest.from_rest(model_name, record["body"]).to_grpc()
+            await self._stub.ModelInfer(request, metadata=tuple(headers.items()))
+            return
+        if record["protocol"] == "v1":
+            path = f"/v1/models/{model_name}:{record['verb']}"
+        else:
+            path = f"/v2/models/{model_name}/infer"
+        headers["content-type"] = "application/json"
+        response = await self._http.post(
+            path, content=orjson.dumps(record["body"]), headers=headers
+        )
+        response.raise_for_status()
+
+    async def close(self):
+        if self._channel is not None:
+            await self._channel.close()
+        await self._http.aclose()
+
+
+def _group(record: Dict[str, Any]) -> Tuple[str, str, str]:
+    return record["model"], record["protocol"], record["verb"]
+
+
+async def replay(
+    records: List[Dict[str, Any]],
+    client: ReplayClient,
+    speed: float = 1.0,
+    max_in_flight: int = 1024,
+) -> Dict[str, Any]:
+    """Sends the recorded requests on the schedule they were received with.
+
+    Args:
+        records: The recorded requests ordered by arrival time, see ``read_recording``.
+        client: Sends the requests.
+        speed: The factor the inter-arrival times are divided by, e.g. ``2`` sends the
+               requests twice as fast as they were received. ``0`` sends them all at
+               once, limited by ``max_in_flight``.
+        max_in_flight: The maximum number of outstanding requests.
+
+    Returns:
+        The throughput and latency percentiles of the replayed requests, overall and
+        per model, protocol and verb, along with the latencies measured by the server
+        when the requests were recorded.
+    """
+    if speed < 0:
+        raise ValueError(f"speed must not be negative, got {speed}")
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    in_flight = asyncio.Semaphore(max_in_flight)
+
+    async def request(record: Dict[str, Any], scheduled: float):
+        async with in_flight:
+            try:
+                await client.send(record)
+            except Exception as e:
+                logger.debug(f"Replayed request failed: {e!r}")
+                errors[_group(record)] += 1
+            else:
+                # Measured from the schedule, like the open loop of the load generator
+                latencies[_group(record)].append(time.perf_counter() - scheduled)
+
+    tasks = []
+    start = time.perf_counter()
+    first = records[0]["time"] if records else 0
+    for record in records:
+        scheduled = start + ((record["time"] - first) / speed if speed else 0)
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(request(record, scheduled)))
+    await asyncio.gather(*tasks)
+    seconds = time.perf_counter() - start
+
+    groups = defaultdict(list)
+    for record in records:
+        groups[_group(record)].append(record)
+    results = []
+    for group, group_records in groups.items():
+        model, protocol, verb = group
+        recorded = LoadResult(
+            len(group_records),
+            sum(record["error"] is not None for record in group_records),
+            seconds,
+            [
+                record["latency_ms"] / 1000
+                for record in group_records
+                if record["error"] is None
+            ],
+        )
+        results.append(
+            {
+                "model": model,
+                "protocol": protocol,
+                "verb": verb,
+                **LoadResult(
+                    len(group_records), errors[group], seconds, latencies[group]
+                ).to_dict(),
+                "recorded": {
+                    "errors": recorded.errors,
+                    "server_latency_ms": recorded.latency_ms(),
+                },
+            }
+        )
+    overall = LoadResult(
+        len(records),
+        sum(errors.values()),
+        seconds,
+        [latency for group in latencies.values() for latency in group],
+    )
+    return {"speed": speed, **overall.to_dict(), "results": results}
+
+
+parser = argparse.ArgumentParser(
+    description="Replay the requests recorded by a model server and report their "
+    "latency. Recorded latencies are measured within the server, replayed ones by "
+    "the client.",
+    formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+)
+parser.add_argument(
+    "files",
+    nargs="+",
+    help="The recorded requests files, rotated ones included.",
+)
+parser.add_argument(
+    "--url", default="http://127.0.0.1:8080", help="The base URL of the REST server."
+)
+parser.add_argument(
+    "--grpc_address",
+    default="127.0.0.1:8081",
+    help="The host:port of the gRPC server the gRPC requests are sent to.",
+)
+parser.add_argument(
+    "--speed",
+    default=1.0,
+    type=float,
+    help="The factor the recorded inter-arrival times are divided by, 0 sends all the "
+    "requests at once.",
+)
+parser.add_argument(
+    "--max_in_flight",
+    default=1024,
+    type=int,
+    help="The maximum number of outstanding requests.",
+)
+parser.add_argument(
+    "--model_name",
+    default=None,
+    help="Send all the requests to this model instead of the recorded ones.",
+)
+parser.add_argument(
+    "--header",
+    action="append",
+    default=[],
+    help="A NAME=VALUE header added to every request, replacing the redacted ones. "
+    "Can be repeated.",
+)
+parser.add_argument(
+    "--output", default=None, help="The JSON file the results are written to."
+)
+
+
+async def _main(args: argparse.Namespace) -> Dict[str, Any]:
+    records = read_recording(args.files)
+    logger.info(f"Replaying {len(records)} requests at speed {args.speed}")
+    client = ReplayClient(
+        args.url,
+        grpc_address=args.grpc_address,
+        headers=dict(header.split("=", 1) for header in args.header),
+        model_name=args.model_name,
+    )
+    try:
+        return await replay(records, client, args.speed, args.max_in_flight)
+    finally:
+        await client.close()
+
+
+if __name__ == "__main__":
+    args = parser.parse_args()
+    logging.configure_logging()
+    report = asyncio.run(_main(args))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        logger.info(f"Results written to {args.output}")
+    else:
+        print(json.dumps(report, indent=2))
@@ -0,0 +1,355 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Finds the model server settings with the highest throughput within a latency SLO,
+run with ``python -m kserve.benchmark.tune``.
+
+Every combination of the server settings is served in its own model server process,
+and loaded with the sample payload, batched to every batch size, from an increasing
+number of concurrent clients until the latency exceeds the SLO.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import shlex
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from .. import logging
+from ..logging import logger
+from ..protocol.infer_type import InferInput, InferRequest
+from .harness import ReferenceModel, Scenario, environment, run_scenario, serve
+from .loadgen import Target
+
+PERCENTILES = ["p50", "p90", "p99"]
+
+
+class ServerConfig(NamedTuple):
+    """The model server settings of a tuning run, unset ones are left to the server.
+
+    ``--workers`` is not tuned, the model server serves every request in one process.
+    """
+
+    max_threads: int = 4
+    max_asyncio_workers: Optional[int] = None
+    nthread: Optional[int] = None
+
+    def server_args(self) -> List[str]:
+        args = ["--max_threads", str(self.max_threads)]
+        if self.max_asyncio_workers is not None:
+            args += ["--max_asyncio_workers", str(self.max_asyncio_workers)]
+        if self.nthread is not None:
+            args += ["--nthread", str(self.nthread)]
+        return args
+
+
+def server_configs(
+    max_threads: Sequence[int] = (4,),
+    max_asyncio_workers: Sequence[Optional[int]] = (None,),
+    nthread: Sequence[Optional[int]] = (None,),
+) -> List[ServerConfig]:
+    return [
+        ServerConfig(*settings)
+        for settings in itertools.product(
+            max_threads, max_asyncio_workers or [None], nthread or [None]
+        )
+    ]
+
+
+def _rows(data: np.ndarray, batch_size: int) -> np.ndarray:
+    return data[np.arange(batch_size) % data.shape[0]]
+
+
+def batch_target(target: Target, payload: Dict[str, Any], batch_size: int) -> Target:
+    """Returns the target sending the rows of the payload repeated to the batch size.
+
+    The payload is a v1 request with ``instances`` or a v2 request with ``inputs``,
+    whose first dimension is the batch dimension.
+    """
+    if "instances" in payload:
+        instances = payload["instances"]
+        return target._replace(
+            instances=[instances[i % len(instances)] for i in range(batch_size)]
+        )
+    request = InferRequest.from_rest(target.model_name, payload)
+    infer_inputs = []
+    for infer_input in request.inputs:
+        data = _rows(infer_input.as_numpy(), batch_size)
+        batched = InferInput(infer_input.name, list(data.shape), infer_input.datatype)
+        batched.set_data_from_numpy(data, binary_data=False)
+        infer_inputs.append(batched)
+    return target._replace(
+        infer_request=InferRequest(
+            model_name=target.model_name,
+            infer_inputs=infer_inputs,
+            parameters=request.parameters,
+        )
+    )
+
+
+async def _sweep_concurrency(
+    target: Target,
+    protocol: str,
+    concurrency: Sequence[int],
+    slo_ms: float,
+    percentile: str,
+    duration: float,
+    warmup: float,
+) -> List[Dict[str, Any]]:
+    points = []
+    for clients in sorted(concurrency):
+        result = await run_scenario(
+            target, Scenario(protocol, concurrency=clients), duration, warmup
+        )
+        latency = result["latency_ms"].get(percentile)
+        result["within_slo"] = (
+            latency is not None and latency <= slo_ms and result["errors"] == 0
+        )
+        points.append(result)
+        # More clients only add queueing once the SLO is exceeded
+        if not result["within_slo"]:
+            break
+    return points
+
+
+def best_point(curve: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Returns the point of the curve with the highest instance throughput within the
+    SLO, the one with the lowest latency among equal throughputs."""
+    within_slo = [point for point in curve if point["within_slo"]]
+    if not within_slo:
+        return None
+    return max(
+        within_slo,
+        key=lambda point: (
+            point["instances_per_second"],
+            -point["latency_ms"][point["percentile"]],
+        ),
+    )
+
+
+def tune(
+    command: Sequence[str],
+    payload: Dict[str, Any],
+    slo_ms: float,
+    protocol: str = "v1",
+    configs: Sequence[ServerConfig] = (ServerConfig(),),
+    batch_sizes: Sequence[int] = (1,),
+    concurrency: Sequence[int] = (1, 2, 4, 8, 16, 32),
+    percentile: str = "p99",
+    model_name: str = "model",
+    duration: float = 10,
+    warmup: float = 2,
+    server_log: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Measures the throughput and latency of every server config and batch size.
+
+    Args:
+        command: The command starting the model server with the model to tune, without
+                 the port, model name and tuned arguments.
+        payload: The v1 or v2 REST request whose rows are sent, see ``batch_target``.
+        slo_ms: The maximum latency at the ``percentile``, in milliseconds.
+        protocol: The protocol of the requests, ``v1``, ``v2`` or ``grpc``.
+        configs: The server settings to try.
+        batch_sizes: The numbers of rows per request to try.
+        concurrency: The numbers of concurrent clients to try, in increasing order until
+                     the SLO is exceeded.
+        percentile: The latency percentile the SLO applies to.
+        model_name: The name the model is served with.
+        duration: The measured seconds per run.
+        warmup: The seconds of unmeasured load before every run.
+        server_log: The file the output of the model servers is appended to.
+
+    Returns:
+        The best configuration within the SLO, or None if none met it, and the
+        measured curve of every configuration.
+    """
+    if percentile not in PERCENTILES:
+        raise ValueError(f"Unsupported percentile {percentile}, expected {PERCENTILES}")
+    reference = ReferenceModel(command=list(command), protocols=[protocol])
+    curve = []
+    for config in configs:
+        with serve(
+            reference,
+            model_name=model_name,
+            server_args=config.server_args(),
+            server_log=server_log,
+        ) as target:
+            for batch_size in batch_sizes:
+                points = asyncio.run(
+                    _sweep_concurrency(
+                        batch_target(target, payload, batch_size),
+                        protocol,
+                        concurrency,
+                        slo_ms,
+                        percentile,
+                        duration,
+                        warmup,
+                    )
+                )
+                for result in points:
+                    result.pop("mode")
+                    clients = result.pop("load")
+                    point = {
+                        **config._asdict(),
+                        "batch_size": batch_size,
+                        "concurrency": clients,
+                        "instances_per_second": round(
+                            result["throughput"] * batch_size, 3
+                        ),
+                        "percentile": percentile,
+                        **result,
+                    }
+                    logger.info(f"Tuning {point}")
+                    curve.append(point)
+    return {
+        "environment": environment(),
+        "command": list(command),
+        "slo_ms": slo_ms,
+        "percentile": percentile,
+        "best": best_point(curve),
+        "curve": curve,
+    }
+
+
+parser = argparse.ArgumentParser(
+    description="Find the model server settings with the highest throughput within a "
+    "latency SLO. Every combination of the server settings is tried with every batch "
+    "size, from an increasing number of concurrent clients.",
+    formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+)
+parser.add_argument(
+    "--server",
+    required=True,
+    help="The command starting the model server, e.g. 'python -m sklearnserver'.",
+)
+parser.add_argument(
+    "--model_dir",
+    default=None,
+    help="The model directory passed to the model server with --model_dir.",
+)
+parser.add_argument(
+    "--model_name", default="model", help="The name the model is served with."
+)
+parser.add_argument(
+    "--payload",
+    required=True,
+    help="A JSON file with a v1 request with 'instances' or a v2 request with 'inputs'.",
+)
+parser.add_argument(
+    "--protocol",
+    default=None,
+    choices=["v1", "v2", "grpc"],
+    help="The protocol of the requests, v1 or v2 depending on the payload if not set.",
+)
+parser.add_argument(
+    "--slo_ms",
+    required=True,
+    type=float,
+    help="The maximum request latency in milliseconds at the percentile.",
+)
+parser.add_argument(
+    "--percentile",
+    default="p99",
+    choices=PERCENTILES,
+    help="The latency percentile the SLO applies to.",
+)
+parser.add_argument(
+    "--max_threads",
+    nargs="+",
+    default=[4],
+    type=int,
+    help="The gRPC server threads to try.",
+)
+parser.add_argument(
+    "--max_asyncio_workers",
+    nargs="*",
+    default=[],
+    type=int,
+    help="The asyncio executor threads to try, planned by the server if not set.",
+)
+parser.add_argument(
+    "--nthread",
+    nargs="*",
+    default=[],
+    type=int,
+    help="The framework threads to try, for model servers with an --nthread argument.",
+)
+parser.add_argument(
+    "--batch_sizes",
+    nargs="+",
+    default=[1],
+    type=int,
+    help="The numbers of payload rows per request to try.",
+)
+parser.add_argument(
+    "--concurrency",
+    nargs="+",
+    default=[1, 2, 4, 8, 16, 32],
+    type=int,
+    help="The numbers of concurrent clients to try, until the SLO is exceeded.",
+)
+parser.add_argument(
+    "--duration", default=10, type=float, help="The measured seconds per run."
+)
+parser.add_argument(
+    "--warmup",
+    default=2,
+    type=float,
+    help="The seconds of unmeasured load before every run.",
+)
+parser.add_argument(
+    "--server_log",
+    default=None,
+    help="The file the model server output is appended to, discarded if not set.",
+)
+parser.add_argument(
+    "--output", required=True, help="The JSON file the results are written to."
+)
+
+if __name__ == "__main__":
+    args = parser.parse_args()
+    logging.configure_logging()
+    with open(args.payload) as f:
+        payload = json.load(f)
+    command = shlex.split(args.server)
+    if args.model_dir:
+        command += ["--model_dir", args.model_dir]
+    report = tune(
+        command,
+        payload,
+        args.slo_ms,
+        protocol=args.protocol or ("v1" if "instances" in payload else "v2"),
+        configs=server_configs(
+            args.max_threads, args.max_asyncio_workers, args.nthread
+        ),
+        batch_sizes=args.batch_sizes,
+        concurrency=args.concurrency,
+        percentile=args.percentile,
+        model_name=args.model_name,
+        duration=args.duration,
+        warmup=args.warmup,
+        server_log=args.server_log,
+    )
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    if report["best"] is None:
+        logger.warning(
+            f"No configuration met the {args.percentile} SLO of {args.slo_ms}ms"
+        )
+    else:
+        logger.info(f"Best configuration: {report['best']}")
+    logger.info(f"Results written to {args.output}")
@@ -91,6 +91,38 @@ MAX_GRPC_MESSAGE_LENGTH = 8388608
 
 V2_ROUTE_PREFIX = "/v2"
 V1_ROUTE_PREFIX = "/v1"
+DEBUG_ROUTE_PREFIX = "/debug"
 
 DEFAULT_HTTP_PORT = 8080
 DEFAULT_GRPC_PORT = 8081
+
+# Payloads smaller than this many bytes are sent uncompressed
+DEFAULT_COMPRESSION_MIN_SIZE = 65536
+
+# Client request bodies larger than this many bytes are compressed off the event loop
+CLIENT_COMPRESSION_EXECUTOR_MIN_SIZE = 1048576
+
+# Compressed request bodies are rejected when they decompress to more than this many bytes
+DEFAULT_MAX_DECOMPRESSED_SIZE = 268435456
+
+# Number of instances predicted at a time by the v1 streaming batch predict endpoint
+DEFAULT_BATCH_PREDICT_SIZE = 256
+
+# Apache Arrow IPC stream media type
+ARROW_CONTENT_TYPE = "application/vnd.apache.arrow.stream"
+
+# MessagePack media type for v1 protocol payloads
+MSGPACK_CONTENT_TYPE = "application/msgpack"
+
+# Input parameters describing the components of a sparse (CSR) tensor
+SPARSE_FORMAT_PARAM = "sparse_format"
+SPARSE_GROUP_PARAM = "sparse_group"
+SPARSE_COMPONENT_PARAM = "sparse_component"
+SPARSE_COLUMNS_PARAM = "sparse_columns"
+SPARSE_FORMAT_CSR = "csr"
+SPARSE_CSR_COMPONENTS = ("indptr", "indices", "values")
+
+# Requested output parameter asking for the top-k classification of an output
+CLASSIFICATION_PARAM = "classification"
+# Requested output parameter asking to down-cast a floating point output, e.g. to FP16 or BF16
+DATATYPE_PARAM = "datatype"
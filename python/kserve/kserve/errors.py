@@ -88,6 +88,19 @@ class ModelNotReady(RuntimeError):
         return self.error_msg
 
 
+class ServerNotReady(RuntimeError):
+    """
+    Exception class indicating the server is not ready or not live.
+    HTTP Servers should return HTTP_503 (Service Unavailable).
+    """
+
+    def __init__(self, reason: str):
+        self.reason = reason
+
+    def __str__(self):
+        return self.reason
+
+
 class UnsupportedProtocol(Exception):
     """
     Exception class indicating requested protocol is not supported.
@@ -139,6 +152,13 @@ async def model_not_ready_handler(_, exc):
     )
 
 
+async def server_not_ready_handler(_, exc):
+    # Not logged, the health monitor logs the transitions rather than every probe
+    return JSONResponse(
+        status_code=HTTPStatus.SERVICE_UNAVAILABLE, content={"error": str(exc)}
+    )
+
+
 async def not_implemented_error_handler(_, exc):
     logger.error("Exception:", exc_info=exc)
     return JSONResponse(
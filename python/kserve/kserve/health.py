@@ -0,0 +1,141 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Overload aware readiness and liveness of the model server process.
+
+The checks only read counters and timestamps, so that the probes are answered
+quickly and never wait on a model. Both REST and gRPC are served by the event loop,
+a probe sent while the loop is blocked is only answered once it runs again. A loop
+blocked for longer than the probe timeout fails the probes by timing out, a loop
+recovering from a long stall fails the liveness probe for ``liveness_window``
+seconds more so that Kubernetes sees enough consecutive failures to restart the
+container of a loop which keeps getting blocked.
+"""
+
+import time
+from typing import List, Optional
+
+from .logging import logger
+from .loop_monitor import LoopMonitor
+from .metrics import requests_in_flight, requests_queued
+
+DEFAULT_RECOVERY_RATIO = 0.8
+DEFAULT_LIVENESS_WINDOW = 60.0
+
+
+class HealthMonitor:
+    """Reports the server not ready while it is overloaded and not live after the
+    event loop was blocked for too long.
+
+    The server becomes not ready when any of the set limits is exceeded, and ready again
+    once all the values are below ``recovery_ratio`` times their limit, so that the
+    readiness does not flap around a limit.
+
+    Args:
+        max_in_flight: The in-flight inference requests above which the server is not
+                       ready, not checked if not set.
+        max_queued: The queued inference requests above which the server is not ready,
+                    not checked if not set.
+        max_loop_lag: The smoothed event loop lag in seconds above which the server is
+                      not ready, not checked if not set.
+        liveness_stall_timeout: The event loop stall in seconds after which the server
+                                is not live, not checked if not set.
+        loop_monitor: The monitor measuring the event loop lag and stalls, the loop is
+                      not checked without it.
+        recovery_ratio: The fraction of the limits the values must fall below for the
+                        server to become ready again.
+        liveness_window: The seconds the server stays not live after a stall.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: Optional[int] = None,
+        max_queued: Optional[int] = None,
+        max_loop_lag: Optional[float] = None,
+        liveness_stall_timeout: Optional[float] = None,
+        loop_monitor: Optional[LoopMonitor] = None,
+        recovery_ratio: float = DEFAULT_RECOVERY_RATIO,
+        liveness_window: float = DEFAULT_LIVENESS_WINDOW,
+    ):
+        if not 0 < recovery_ratio <= 1:
+            raise ValueError("recovery_ratio must be in (0, 1]")
+        if (
+            liveness_stall_timeout is not None
+            and loop_monitor is not None
+            and liveness_stall_timeout < loop_monitor.stall_threshold
+        ):
+            raise ValueError(
+                "liveness_stall_timeout must not be lower than the loop stall threshold"
+            )
+        self.max_in_flight = max_in_flight
+        self.max_queued = max_queued
+        self.max_loop_lag = max_loop_lag
+        self.liveness_stall_timeout = liveness_stall_timeout
+        self.recovery_ratio = recovery_ratio
+        self.liveness_window = liveness_window
+        self._loop_monitor = loop_monitor
+        self._overloaded = False
+        self._stalled = False
+
+    def _exceeded_limits(self, ratio: float) -> List[str]:
+        exceeded = []
+        if self.max_in_flight is not None:
+            in_flight = requests_in_flight()
+            if in_flight > self.max_in_flight * ratio:
+                exceeded.append(f"{in_flight} requests in flight")
+        if self.max_queued is not None:
+            queued = requests_queued()
+            if queued > self.max_queued * ratio:
+                exceeded.append(f"{queued} requests queued")
+        if self.max_loop_lag is not None and self._loop_monitor is not None:
+            lag = self._loop_monitor.lag()
+            if lag > self.max_loop_lag * ratio:
+                exceeded.append(f"{lag:.3f}s event loop lag")
+        return exceeded
+
+    def ready(self) -> bool:
+        if self._overloaded:
+            if not self._exceeded_limits(self.recovery_ratio):
+                self._overloaded = False
+                logger.info("Model server recovered from overload, reporting ready")
+        else:
+            exceeded = self._exceeded_limits(1)
+            if exceeded:
+                self._overloaded = True
+                logger.warning(
+                    f"Model server overloaded with {', '.join(exceeded)}, "
+                    "reporting not ready"
+                )
+        return not self._overloaded
+
+    def live(self) -> bool:
+        if self.liveness_stall_timeout is None or self._loop_monitor is None:
+            return True
+        stalled = self._loop_monitor.current_stall()
+        ended, duration = self._loop_monitor.last_stall()
+        if duration > self.liveness_stall_timeout:
+            stalled = max(
+                stalled,
+                duration if time.monotonic() - ended < self.liveness_window else 0,
+            )
+        if stalled > self.liveness_stall_timeout:
+            if not self._stalled:
+                self._stalled = True
+                logger.error(
+                    f"Event loop stalled for {stalled:.3f}s, reporting not live"
+                )
+        elif self._stalled:
+            self._stalled = False
+            logger.info("Event loop running again, reporting live")
+        return not self._stalled
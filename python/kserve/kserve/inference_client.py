@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 import json
 import ssl
 from typing import Union, List, Tuple, Any, Optional, Sequence, Mapping, Dict
@@ -20,7 +21,13 @@ import grpc
 import httpx
 from orjson import orjson
 
-from .constants.constants import PredictorProtocol
+from .constants.constants import (
+    CLIENT_COMPRESSION_EXECUTOR_MIN_SIZE,
+    DEFAULT_COMPRESSION_MIN_SIZE,
+    MSGPACK_CONTENT_TYPE,
+    PredictorProtocol,
+)
+from . import tracing
 from .errors import UnsupportedProtocol, InvalidInput
 from .logging import trace_logger as logger
 from .protocol.grpc.grpc_predict_v2_pb2 import (
@@ -33,6 +40,8 @@ from .protocol.grpc.grpc_predict_v2_pb2 import (
 )
 from .protocol.grpc.grpc_predict_v2_pb2_grpc import GRPCInferenceServiceStub
 from .protocol.infer_type import InferRequest, InferResponse
+from .protocol.rest.compression import get_codec, supported_encodings
+from .utils import msgpack_codec
 from .utils.utils import is_v2, is_v1
 
 
@@ -94,6 +103,8 @@ class InferenceGRPCClient:
                          the channel.
     :param timeout (optional) The maximum end-to-end time, in seconds, the request is allowed to take. By default,
                    client timeout is 60 seconds. To disable timeout explicitly set it to 'None'.
+    :param compression (optional) A grpc.Compression value used to compress the requests sent over the channel.
+                       Defaults to no compression.
     """
 
     def __init__(
@@ -107,6 +118,7 @@ class InferenceGRPCClient:
         creds: grpc.ChannelCredentials = None,
         channel_args: List[Tuple[str, Any]] = None,
         timeout: Optional[float] = 60,
+        compression: Optional[grpc.Compression] = None,
     ):
 
         # requires appending the port to the predictor host for gRPC to work
@@ -155,7 +167,9 @@ class InferenceGRPCClient:
             ]
 
         if creds:
-            self._channel = grpc.aio.secure_channel(url, creds, options=channel_opt)
+            self._channel = grpc.aio.secure_channel(
+                url, creds, options=channel_opt, compression=compression
+            )
         elif use_ssl:
             rc_bytes = pk_bytes = cc_bytes = None
             if root_certificates is not None:
@@ -172,9 +186,13 @@ class InferenceGRPCClient:
                 private_key=pk_bytes,
                 certificate_chain=cc_bytes,
             )
-            self._channel = grpc.aio.secure_channel(url, creds, options=channel_opt)
+            self._channel = grpc.aio.secure_channel(
+                url, creds, options=channel_opt, compression=compression
+            )
         else:
-            self._channel = grpc.aio.insecure_channel(url, options=channel_opt)
+            self._channel = grpc.aio.insecure_channel(
+                url, options=channel_opt, compression=compression
+            )
         self._client_stub = GRPCInferenceServiceStub(self._channel)
         self._verbose = verbose
         self._timeout = timeout
@@ -220,13 +238,18 @@ class InferenceGRPCClient:
             )
 
         try:
-            response = await self._client_stub.ModelInfer(
-                request=infer_request,
-                metadata=metadata,
-                timeout=(
-                    self._timeout if isinstance(timeout, _UseClientDefault) else timeout
-                ),
-            )
+            with tracing.client_span(
+                "ModelInfer", {"kserve.model_name": infer_request.model_name}
+            ):
+                response = await self._client_stub.ModelInfer(
+                    request=infer_request,
+                    metadata=tracing.inject_metadata(metadata),
+                    timeout=(
+                        self._timeout
+                        if isinstance(timeout, _UseClientDefault)
+                        else timeout
+                    ),
+                )
             response = InferResponse.from_grpc(response)
             if self._verbose:
                 logger.info("infer response: %s", response)
@@ -349,6 +372,13 @@ class RESTConfig:
                   (which will disable verification).
     :param auth (optional) An authentication class to use when sending inference requests. Refer httpx
     :param verbose (optional) A boolean to enable verbose logging. Defaults to False.
+    :param request_compression (optional) Content encoding used to compress request bodies, one of 'gzip', 'zstd'
+                               or 'lz4'. Defaults to None which disables request compression.
+    :param compression_min_size (optional) The minimum request body size in bytes to be compressed.
+                                Defaults to 65536.
+    :param content_type (optional) Media type used to serialize v1 predict and explain requests and responses, either
+                        'application/json' or 'application/msgpack'. MessagePack sends numpy arrays as raw buffers
+                        and requires the 'msgpack' package. Defaults to 'application/json'.
     """
 
     def __init__(
@@ -362,7 +392,20 @@ class RESTConfig:
         verify: Union[str, bool, ssl.SSLContext] = True,
         auth=None,
         verbose: bool = False,
+        request_compression: Optional[str] = None,
+        compression_min_size: int = DEFAULT_COMPRESSION_MIN_SIZE,
+        content_type: str = "application/json",
     ):
+        if content_type not in ("application/json", MSGPACK_CONTENT_TYPE):
+            raise ValueError(
+                f"Unsupported content type '{content_type}', supported content types are "
+                f"['application/json', '{MSGPACK_CONTENT_TYPE}']"
+            )
+        if request_compression is not None and get_codec(request_compression) is None:
+            raise ValueError(
+                f"Unsupported request compression '{request_compression}', "
+                f"supported encodings are {supported_encodings()}"
+            )
         self.transport = transport
         self.protocol = (
             protocol.value if isinstance(protocol, PredictorProtocol) else protocol
@@ -376,6 +419,9 @@ class RESTConfig:
         self.auth = auth
         self.transport = transport
         self.verbose = verbose
+        self.request_compression = request_compression
+        self.compression_min_size = compression_min_size
+        self.content_type = content_type
         if self.transport is None:
             httpx.AsyncHTTPTransport(
                 retries=self.retries,
@@ -419,6 +465,55 @@ class InferenceRESTClient:
             relative_url = "/" + relative_url
         return base_url.join(base_url.path + relative_url)
 
+    async def _compress(
+        self, data: bytes, headers: Optional[Mapping[str, str]]
+    ) -> Tuple[bytes, Optional[Mapping[str, str]]]:
+        """
+        Compress the request body if request compression is configured and the body is large enough.
+        Large bodies are compressed in the default executor to not block the event loop.
+        :param data: The serialized request body.
+        :param headers: HTTP headers to include when sending request.
+        :return: a tuple of the request body and the HTTP headers to send.
+        """
+        encoding = self._config.request_compression
+        if encoding is None or len(data) < self._config.compression_min_size:
+            return data, headers
+        headers = dict(headers) if headers is not None else {}
+        headers["content-encoding"] = encoding
+        compress = get_codec(encoding).compress
+        if len(data) < CLIENT_COMPRESSION_EXECUTOR_MIN_SIZE:
+            return compress(data), headers
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, compress, data), headers
+
+    def _serialize_v1(
+        self, data: Dict, headers: Optional[Mapping[str, str]]
+    ) -> Tuple[bytes, Optional[Mapping[str, str]]]:
+        """
+        Serialize a v1 request body with the configured content type.
+        :param data: The request body as python dict.
+        :param headers: HTTP headers to include when sending request.
+        :return: a tuple of the serialized request body and the HTTP headers to send.
+        """
+        if self._config.content_type != MSGPACK_CONTENT_TYPE:
+            return orjson.dumps(data), headers
+        headers = dict(headers) if headers is not None else {}
+        headers["content-type"] = MSGPACK_CONTENT_TYPE
+        headers["accept"] = MSGPACK_CONTENT_TYPE
+        return msgpack_codec.dumps(data), headers
+
+    @staticmethod
+    def _deserialize(response: httpx.Response) -> Any:
+        """
+        Deserialize the response body according to its content type.
+        :param response: The HTTP response.
+        :return: the response body as python object.
+        """
+        content_type = response.headers.get("content-type", "").split(";")[0].strip()
+        if content_type == MSGPACK_CONTENT_TYPE:
+            return msgpack_codec.loads(response.content)
+        return orjson.loads(response.content)
+
     def _consturct_http_status_error(
         self, response: httpx.Response
     ) -> httpx.HTTPStatusError:
@@ -484,18 +579,25 @@ class InferenceRESTClient:
             logger.info("request data: %s", data)
         if isinstance(data, InferRequest):
             data = orjson.dumps(data.to_rest())
+        elif is_v1(self._config.protocol) and not is_graph_endpoint:
+            data, headers = self._serialize_v1(data, headers)
         else:
             data = orjson.dumps(data)
-        response = await self._client.post(
-            url, content=data, headers=headers, timeout=timeout
-        )
+        data, headers = await self._compress(data, headers)
+        with tracing.client_span("infer", {"kserve.model_name": model_name}):
+            response = await self._client.post(
+                url,
+                content=data,
+                headers=tracing.inject_headers(headers),
+                timeout=timeout,
+            )
         if self._config.verbose:
             logger.info(
                 "response code: %s, content: %s", response.status_code, response.text
             )
         if not response.is_success:
             raise self._consturct_http_status_error(response)
-        output = orjson.loads(response.content)
+        output = self._deserialize(response)
         # If inference graph result, return it as dict
         if is_graph_endpoint:
             return output
@@ -535,17 +637,22 @@ class InferenceRESTClient:
         if self._config.verbose:
             logger.info("url: %s", url)
             logger.info("request data: %s", data)
-        data = orjson.dumps(data)
-        response = await self._client.post(
-            url, content=data, headers=headers, timeout=timeout
-        )
+        data, headers = self._serialize_v1(data, headers)
+        data, headers = await self._compress(data, headers)
+        with tracing.client_span("explain", {"kserve.model_name": model_name}):
+            response = await self._client.post(
+                url,
+                content=data,
+                headers=tracing.inject_headers(headers),
+                timeout=timeout,
+            )
         if self._config.verbose:
             logger.info(
                 "response code: %s, content: %s", response.status_code, response.text
             )
         if not response.is_success:
             raise self._consturct_http_status_error(response)
-        return orjson.loads(response.content)
+        return self._deserialize(response)
 
     async def is_server_ready(
         self,
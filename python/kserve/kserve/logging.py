@@ -12,9 +12,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import atexit
+import contextlib
 import json
 import logging.config
-from typing import Optional, Union, Dict
+import logging.handlers
+import queue
+import random
+from contextvars import ContextVar
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
 
 import yaml
 
@@ -101,9 +107,18 @@ KSERVE_LOG_CONFIG = {
     },
 }
 
+# LogRecord attribute holding the structured fields of a record, see log_fields
+KSERVE_LOG_FIELDS_ATTR = "kserve_fields"
+
 logger = logging.getLogger(KSERVE_LOGGER_NAME)
 trace_logger = logging.getLogger(KSERVE_TRACE_LOGGER_NAME)
 
+_trace_sample_rate = 1.0
+_request_log_fields: ContextVar[Optional[Dict[str, Any]]] = ContextVar(
+    "kserve_request_log_fields", default=None
+)
+_queue_listeners: Dict[str, logging.handlers.QueueListener] = {}
+
 
 def configure_logging(log_config: Optional[Union[Dict, str]] = None):
     """
@@ -139,3 +154,140 @@ def configure_logging(log_config: Optional[Union[Dict, str]] = None):
         # See the note about fileConfig() here:
         # https://docs.python.org/3/library/logging.config.html#configuration-file-format
         logging.config.fileConfig(log_config, disable_existing_loggers=False)
+
+
+class JSONFormatter(logging.Formatter):
+    """Formats log records as single line JSON objects.
+
+    The structured fields of records logged through :func:`log_fields` are added as
+    top level keys next to ``timestamp``, ``level``, ``logger`` and ``message``.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": f"{self.formatTime(record, self.datefmt)}.{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        fields = getattr(record, KSERVE_LOG_FIELDS_ATTR, None)
+        if fields:
+            entry.update(fields)
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def _handlers(name: str) -> List[logging.Handler]:
+    # Handlers behind a queue listener are the ones doing the formatting
+    if name in _queue_listeners:
+        return list(_queue_listeners[name].handlers)
+    return logging.getLogger(name).handlers
+
+
+def use_json_format(
+    logger_names: Iterable[str] = (KSERVE_LOGGER_NAME, KSERVE_TRACE_LOGGER_NAME),
+):
+    """Switches the handlers of the given loggers to :class:`JSONFormatter`."""
+    for name in logger_names:
+        for handler in _handlers(name):
+            handler.setFormatter(JSONFormatter(datefmt=KSERVE_LOGGER_DATE_FORMAT))
+
+
+def enable_async_logging(
+    logger_names: Iterable[str] = (KSERVE_LOGGER_NAME, KSERVE_TRACE_LOGGER_NAME),
+):
+    """Moves the handlers of the given loggers to a background thread.
+
+    The handlers of every logger are replaced by a ``QueueHandler`` so that logging
+    on the event loop only enqueues the record, formatting and writing happens in a
+    ``QueueListener`` thread. Pending records are flushed at interpreter exit or by
+    :func:`disable_async_logging`. Loggers which are already asynchronous are skipped.
+
+    Args:
+        logger_names: The names of the loggers to make asynchronous.
+    """
+    for name in logger_names:
+        if name in _queue_listeners:
+            continue
+        log = logging.getLogger(name)
+        handlers = list(log.handlers)
+        if not handlers:
+            continue
+        log_queue = queue.SimpleQueue()
+        listener = logging.handlers.QueueListener(
+            log_queue, *handlers, respect_handler_level=True
+        )
+        for handler in handlers:
+            log.removeHandler(handler)
+        log.addHandler(logging.handlers.QueueHandler(log_queue))
+        _queue_listeners[name] = listener
+        listener.start()
+
+
+def disable_async_logging():
+    """Flushes the pending records and restores the handlers of asynchronous loggers."""
+    while _queue_listeners:
+        name, listener = _queue_listeners.popitem()
+        listener.stop()
+        log = logging.getLogger(name)
+        for handler in list(log.handlers):
+            if isinstance(handler, logging.handlers.QueueHandler):
+                log.removeHandler(handler)
+        for handler in listener.handlers:
+            log.addHandler(handler)
+
+
+atexit.register(disable_async_logging)
+
+
+def set_trace_sample_rate(rate: float):
+    """Sets the fraction of requests whose latency is logged, between 0 and 1."""
+    global _trace_sample_rate
+    if not 0 <= rate <= 1:
+        raise ValueError(f"The trace sample rate must be between 0 and 1, got {rate}")
+    _trace_sample_rate = rate
+
+
+def trace_sampled() -> bool:
+    """Returns whether the current request should be logged by the trace logger."""
+    return _trace_sample_rate >= 1 or random.random() < _trace_sample_rate
+
+
+def log_fields(log: logging.Logger, fields: Dict[str, Any], prefix: str = ""):
+    """Logs structured fields at INFO level as one line.
+
+    The text message renders the fields as ``key: value`` pairs, the fields are also
+    attached to the record for :class:`JSONFormatter`.
+    """
+    if log.isEnabledFor(logging.INFO):
+        message = prefix + ", ".join(f"{key}: {value}" for key, value in fields.items())
+        log.info(message, extra={KSERVE_LOG_FIELDS_ATTR: fields})
+
+
+@contextlib.contextmanager
+def request_log_context() -> Iterator[Dict[str, Any]]:
+    """Collects the fields logged during a request through :func:`log_request_fields`.
+
+    Yields:
+        The fields of the request, to be logged as a single line when it completes.
+    """
+    fields = {}
+    token = _request_log_fields.set(fields)
+    try:
+        yield fields
+    finally:
+        _request_log_fields.reset(token)
+
+
+def log_request_fields(fields: Dict[str, Any]):
+    """Logs fields of the current request to the trace logger.
+
+    Within a :func:`request_log_context` the fields are added to the request line,
+    otherwise they are logged on their own, subject to the trace sample rate.
+    """
+    request_fields = _request_log_fields.get()
+    if request_fields is not None:
+        request_fields.update(fields)
+    elif trace_sampled():
+        log_fields(trace_logger, fields)
@@ -0,0 +1,154 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import contextlib
+import sys
+import threading
+import time
+import traceback
+from types import FrameType
+from typing import Optional, Tuple
+
+from .logging import logger
+from .metrics import EVENT_LOOP_LAG, EVENT_LOOP_STALLS, get_labels
+from .model import BaseKServeModel
+
+DEFAULT_LOOP_MONITOR_INTERVAL = 0.1
+DEFAULT_LOOP_STALL_THRESHOLD = 0.5
+# The weight of the latest measurement in the smoothed lag
+LAG_SMOOTHING = 0.2
+
+
+def _model_name(frame: Optional[FrameType]) -> Optional[str]:
+    # The innermost model method on the stack, e.g. a blocking preprocess
+    while frame is not None:
+        if "self" in frame.f_code.co_varnames:
+            obj = frame.f_locals.get("self")
+            if isinstance(obj, BaseKServeModel):
+                return obj.name
+        frame = frame.f_back
+    return None
+
+
+class LoopMonitor:
+    """Measures the event loop lag and reports the code blocking the loop.
+
+    A task running on the loop sleeps for ``interval`` seconds at a time and records how
+    late it wakes up in the ``event_loop_lag_seconds`` histogram. A watchdog thread
+    checks that the task keeps running, when the loop has not run it for longer than
+    ``stall_threshold`` seconds the stack of the event loop thread is logged together
+    with the model running on it, once per stall.
+
+    Args:
+        interval: The time between two lag measurements, in seconds.
+        stall_threshold: The lag, in seconds, from which the loop is considered stalled.
+    """
+
+    def __init__(
+        self,
+        interval: float = DEFAULT_LOOP_MONITOR_INTERVAL,
+        stall_threshold: float = DEFAULT_LOOP_STALL_THRESHOLD,
+    ):
+        if interval <= 0 or stall_threshold <= 0:
+            raise ValueError("interval and stall_threshold must be positive")
+        self.interval = interval
+        self.stall_threshold = stall_threshold
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._last_beat = 0.0
+        self._lag = 0.0
+        self._last_stall = (0.0, 0.0)
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def start(self):
+        """Starts monitoring the running event loop."""
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stopped.clear()
+        self._task = self._loop.create_task(self._measure_lag())
+        self._watchdog = threading.Thread(
+            target=self._watch, name="kserve-loop-watchdog", daemon=True
+        )
+        self._watchdog.start()
+
+    async def stop(self):
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+        if self._watchdog is not None:
+            self._watchdog.join()
+
+    async def _measure_lag(self):
+        while True:
+            start = time.monotonic()
+            self._last_beat = start
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = max(now - start - self.interval, 0)
+            EVENT_LOOP_LAG.observe(lag)
+            self._lag = LAG_SMOOTHING * lag + (1 - LAG_SMOOTHING) * self._lag
+            if lag > self.stall_threshold:
+                self._last_stall = (now, lag)
+
+    def lag(self) -> float:
+        """The event loop lag in seconds, smoothed over the last measurements.
+
+        Includes the time the loop has been blocked for when it is currently blocked.
+        """
+        return max(self._lag, self.current_stall())
+
+    def current_stall(self) -> float:
+        """The time in seconds the loop has been blocked for, 0 if it is running."""
+        if self._task is None:
+            return 0.0
+        return max(time.monotonic() - self._last_beat - self.interval, 0)
+
+    def last_stall(self) -> Tuple[float, float]:
+        """The ``time.monotonic()`` end and the duration in seconds of the last stall
+        longer than the stall threshold, zeros if there was none."""
+        return self._last_stall
+
+    def _watch(self):
+        reported_beat = None
+        while not self._stopped.wait(min(self.interval, self.stall_threshold / 4)):
+            beat = self._last_beat
+            stalled = time.monotonic() - beat - self.interval
+            if stalled > self.stall_threshold and beat != reported_beat:
+                reported_beat = beat
+                self._report_stall(beat, stalled)
+
+    def _report_stall(self, beat: float, stalled: float):
+        frame = sys._current_frames().get(self._loop_thread_id)
+        stack = "".join(traceback.format_stack(frame)) if frame is not None else ""
+        model_name = _model_name(frame)
+        task = asyncio.current_task(self._loop)
+        del frame
+        if self._last_beat != beat:
+            # The loop resumed while the stack was captured, it is not the culprit
+            return
+        EVENT_LOOP_STALLS.labels(**get_labels(model_name or "")).inc()
+        logger.warning(
+            "Event loop blocked for more than %.3fs by model %s in task %s, the "
+            "blocking call should be awaited or run in an executor:\n%s",
+            stalled,
+            model_name,
+            task.get_name() if task is not None else None,
+            stack,
+        )
@@ -12,9 +12,33 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from prometheus_client import Histogram
+import atexit
+import concurrent.futures
+import contextlib
+import glob
+import os
+import time
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional
+
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    multiprocess,
+    values,
+)
+from prometheus_client.core import GaugeMetricFamily
 from pydantic import BaseModel
 
+# Directory shared by the worker processes of a server in Prometheus multiprocess mode,
+# it has to be set before prometheus_client is imported so that every worker writes its
+# metrics there. The model server runs a single process, multiprocess mode is only for
+# the workers forked by an external launcher such as gunicorn or uvicorn --workers.
+PROMETHEUS_MULTIPROC_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
 PROM_LABELS = ["model_name"]
 PRE_HIST_TIME = Histogram(
     "request_preprocess_seconds", "pre-process request latency", PROM_LABELS
@@ -28,6 +52,396 @@ PREDICT_HIST_TIME = Histogram(
 EXPLAIN_HIST_TIME = Histogram(
     "request_explain_seconds", "explain request latency", PROM_LABELS
 )
+COMPRESSION_LABELS = PROM_LABELS + ["encoding", "direction"]
+COMPRESSION_HIST_TIME = Histogram(
+    "request_compression_seconds",
+    "payload compression/decompression latency",
+    COMPRESSION_LABELS,
+)
+COMPRESSION_UNCOMPRESSED_BYTES = Counter(
+    "compression_uncompressed_bytes",
+    "payload bytes before compression or after decompression",
+    COMPRESSION_LABELS,
+)
+COMPRESSION_COMPRESSED_BYTES = Counter(
+    "compression_compressed_bytes",
+    "payload bytes after compression or before decompression",
+    COMPRESSION_LABELS,
+)
+
+PROTOCOL_LABELS = PROM_LABELS + ["protocol"]
+# Powers of 4 from 64B to 256MiB
+SIZE_BUCKETS = tuple(4**i for i in range(3, 15))
+BATCH_SIZE_BUCKETS = tuple(2**i for i in range(11))
+REQUEST_COUNTER = Counter(
+    "requests",
+    "inference requests by protocol and status",
+    PROTOCOL_LABELS + ["status"],
+)
+REQUEST_BYTES = Histogram(
+    "request_size_bytes",
+    "inference request body size",
+    PROTOCOL_LABELS,
+    buckets=SIZE_BUCKETS,
+)
+RESPONSE_BYTES = Histogram(
+    "response_size_bytes",
+    "inference response body size",
+    PROTOCOL_LABELS,
+    buckets=SIZE_BUCKETS,
+)
+IN_FLIGHT_GAUGE = Gauge(
+    "requests_in_flight",
+    "inference requests being handled",
+    PROM_LABELS,
+    multiprocess_mode="livesum",
+)
+QUEUED_GAUGE = Gauge(
+    "requests_queued",
+    "inference requests received but not yet processed by the model",
+    PROM_LABELS,
+    multiprocess_mode="livesum",
+)
+QUEUE_HIST_TIME = Histogram(
+    "request_queue_seconds",
+    "time between receiving a request and the model starting to process it",
+    PROM_LABELS,
+)
+SERVICE_HIST_TIME = Histogram(
+    "request_service_seconds",
+    "time spent by the model processing a request",
+    PROM_LABELS,
+)
+BATCH_SIZE_HIST = Histogram(
+    "request_batch_size",
+    "instances per predict call of batched requests",
+    PROM_LABELS,
+    buckets=BATCH_SIZE_BUCKETS,
+)
+LLM_PROMPT_TOKENS = Counter(
+    "llm_prompt_tokens", "prompt tokens processed by LLM completions", PROM_LABELS
+)
+LLM_GENERATION_TOKENS = Counter(
+    "llm_generation_tokens", "tokens generated by LLM completions", PROM_LABELS
+)
+EXECUTOR_LABELS = ["executor"]
+EXECUTOR_MAX_WORKERS = Gauge(
+    "executor_max_workers",
+    "maximum number of executor threads",
+    EXECUTOR_LABELS,
+    multiprocess_mode="livesum",
+)
+EXECUTOR_THREADS = Gauge(
+    "executor_threads", "executor threads started", EXECUTOR_LABELS
+)
+EXECUTOR_BUSY_THREADS = Gauge(
+    "executor_busy_threads", "executor threads running a task", EXECUTOR_LABELS
+)
+EXECUTOR_QUEUED_TASKS = Gauge(
+    "executor_queued_tasks", "tasks waiting for an executor thread", EXECUTOR_LABELS
+)
+MODEL_LOAD_RSS_BYTES = Gauge(
+    "model_load_rss_bytes",
+    "resident memory growth of the process while loading the model",
+    PROM_LABELS,
+    multiprocess_mode="max",
+)
+MODEL_CPU_SECONDS = Counter(
+    "model_cpu_seconds",
+    "thread CPU time spent in the model handlers",
+    PROM_LABELS + ["step"],
+)
+MODEL_RSS_GROWTH_BYTES = Gauge(
+    "model_rss_growth_bytes",
+    "resident memory growth of the process during the requests of the model after warmup",
+    PROM_LABELS,
+    multiprocess_mode="max",
+)
+MODEL_RSS_GROWTH_ALERTS = Counter(
+    "model_rss_growth_alerts",
+    "resident memory growth of the requests of the model over the alert threshold",
+    PROM_LABELS,
+)
+CPU_LIMIT = Gauge(
+    "cpu_limit",
+    "CPUs available to the model server from the host, affinity and cgroup limit",
+    multiprocess_mode="max",
+)
+THREAD_BUDGET = Gauge(
+    "thread_budget",
+    "threads planned per process for a thread pool",
+    ["pool"],
+    multiprocess_mode="max",
+)
+LOOP_LAG_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+EVENT_LOOP_LAG = Histogram(
+    "event_loop_lag_seconds",
+    "delay between an event loop callback being due and running",
+    buckets=LOOP_LAG_BUCKETS,
+)
+EVENT_LOOP_STALLS = Counter(
+    "event_loop_stalls",
+    "event loop stalls longer than the threshold by the model blocking the loop",
+    PROM_LABELS,
+)
+
+
+# Process local counts read by the readiness probe, cheaper than summing the gauges
+_requests_in_flight = 0
+_requests_queued = 0
+
+
+def requests_in_flight() -> int:
+    """The inference requests being handled by this process."""
+    return _requests_in_flight
+
+
+def requests_queued() -> int:
+    """The inference requests received by this process but not yet processed."""
+    return _requests_queued
+
+
+class RequestMetrics:
+    """Tracks the in-flight, queued and queueing time metrics of an inference request.
+
+    The server creates it with :func:`track_request` when a request is received and
+    the model marks the start of the processing with :func:`request_started`.
+    """
+
+    def __init__(self, protocol: str, model_name: Optional[str] = None):
+        self.protocol = protocol
+        self.model_name = None
+        self.status = "OK"
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self._received = time.perf_counter()
+        self._started = False
+        if model_name:
+            self.set_model_name(model_name)
+
+    def set_model_name(self, model_name: str):
+        global _requests_in_flight, _requests_queued
+        if self.model_name is None:
+            self.model_name = model_name
+            labels = get_labels(model_name)
+            IN_FLIGHT_GAUGE.labels(**labels).inc()
+            QUEUED_GAUGE.labels(**labels).inc()
+            _requests_in_flight += 1
+            _requests_queued += 1
+
+    def start(self):
+        global _requests_queued
+        if self._started or self.model_name is None:
+            return
+        self._started = True
+        labels = get_labels(self.model_name)
+        QUEUED_GAUGE.labels(**labels).dec()
+        _requests_queued -= 1
+        QUEUE_HIST_TIME.labels(**labels).observe(time.perf_counter() - self._received)
+
+    def finish(self):
+        global _requests_in_flight, _requests_queued
+        model_name = self.model_name or ""
+        if self.model_name is not None:
+            labels = get_labels(self.model_name)
+            IN_FLIGHT_GAUGE.labels(**labels).dec()
+            _requests_in_flight -= 1
+            if not self._started:
+                QUEUED_GAUGE.labels(**labels).dec()
+                _requests_queued -= 1
+        REQUEST_COUNTER.labels(model_name, self.protocol, self.status).inc()
+        if self.request_bytes:
+            REQUEST_BYTES.labels(model_name, self.protocol).observe(self.request_bytes)
+        if self.response_bytes:
+            RESPONSE_BYTES.labels(model_name, self.protocol).observe(
+                self.response_bytes
+            )
+
+
+_request_metrics: ContextVar[Optional[RequestMetrics]] = ContextVar(
+    "kserve_request_metrics", default=None
+)
+
+
+@contextlib.contextmanager
+def track_request(
+    protocol: str, model_name: Optional[str] = None
+) -> Iterator[RequestMetrics]:
+    """Tracks an inference request from the time it is received until it completes.
+
+    Args:
+        protocol: ``v1``, ``v2``, ``grpc`` or ``openai``.
+        model_name: The model name, can be set later with ``set_model_name`` when it is
+                    only known once the request body is parsed.
+
+    Yields:
+        The request metrics, the caller sets the status and the body sizes.
+    """
+    metrics = RequestMetrics(protocol, model_name)
+    token = _request_metrics.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _request_metrics.reset(token)
+        metrics.finish()
+
+
+def request_started(model_name: str):
+    """Marks the start of the processing of the current request by the model."""
+    metrics = _request_metrics.get()
+    if metrics is not None:
+        metrics.set_model_name(model_name)
+        metrics.start()
+
+
+def observe_batch_size(model_name: str, size: int):
+    BATCH_SIZE_HIST.labels(**get_labels(model_name)).observe(size)
+
+
+def observe_llm_stats(model_name: str, stats: "LLMStats"):
+    labels = get_labels(model_name)
+    if stats.num_prompt_tokens:
+        LLM_PROMPT_TOKENS.labels(**labels).inc(stats.num_prompt_tokens)
+    if stats.num_generation_tokens:
+        LLM_GENERATION_TOKENS.labels(**labels).inc(stats.num_generation_tokens)
+
+
+# The executors of this process, reported by the scraped process in multiprocess mode
+_executors: Dict[str, concurrent.futures.ThreadPoolExecutor] = {}
+
+
+def _executor_threads(executor: concurrent.futures.ThreadPoolExecutor) -> int:
+    return len(executor._threads)
+
+
+def _executor_busy_threads(executor: concurrent.futures.ThreadPoolExecutor) -> int:
+    return max(len(executor._threads) - executor._idle_semaphore._value, 0)
+
+
+def _executor_queued_tasks(executor: concurrent.futures.ThreadPoolExecutor) -> int:
+    return executor._work_queue.qsize()
+
+
+_EXECUTOR_GAUGES = (
+    (EXECUTOR_THREADS, _executor_threads),
+    (EXECUTOR_BUSY_THREADS, _executor_busy_threads),
+    (EXECUTOR_QUEUED_TASKS, _executor_queued_tasks),
+)
+
+
+class _ExecutorCollector:
+    """Collects the executor gauges of the scraped process in multiprocess mode,
+    where the function gauges are not written to the metric files."""
+
+    def collect(self):
+        for gauge, value in _EXECUTOR_GAUGES:
+            family = GaugeMetricFamily(
+                gauge._name, gauge._documentation, labels=EXECUTOR_LABELS
+            )
+            for name, executor in list(_executors.items()):
+                family.add_metric([name], value(executor))
+            yield family
+
+
+def register_executor_metrics(
+    executor: concurrent.futures.ThreadPoolExecutor, name: str = "default"
+):
+    """Exposes the saturation of a thread pool executor, computed when scraped.
+
+    The thread and task gauges are computed by the scraped process, in multiprocess
+    mode only the maximum number of workers is aggregated across the workers.
+    """
+    EXECUTOR_MAX_WORKERS.labels(name).set(executor._max_workers)
+    if multiprocess_dir() is not None:
+        _executors[name] = executor
+        return
+    for gauge, value in _EXECUTOR_GAUGES:
+        gauge.labels(name).set_function(lambda value=value: value(executor))
+
+
+def multiprocess_dir() -> Optional[str]:
+    """Returns the Prometheus multiprocess directory, or None in single process mode."""
+    return os.environ.get(PROMETHEUS_MULTIPROC_DIR_ENV) or None
+
+
+def multiprocess_enabled() -> bool:
+    """Returns whether the metric values are written to the multiprocess directory,
+    which prometheus_client decides once when it is first imported."""
+    return getattr(values.ValueClass, "_multiprocess", False)
+
+
+def _file_pid(path: str) -> Optional[int]:
+    # Metric files are named <type>[_<mode>]_<pid>.db
+    try:
+        return int(os.path.basename(path)[: -len(".db")].rsplit("_", 1)[1])
+    except (IndexError, ValueError):
+        return None
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def cleanup_multiprocess_dir(path: Optional[str] = None):
+    """Removes the metric files of processes which are no longer running.
+
+    Meant to be called when the server starts, so that the files left by a previous
+    run of the server in the same directory are not aggregated with the new ones.
+
+    Args:
+        path: The multiprocess directory, defaults to ``PROMETHEUS_MULTIPROC_DIR``.
+    """
+    path = path or multiprocess_dir()
+    if path is None:
+        return
+    os.makedirs(path, exist_ok=True)
+    for file in glob.glob(os.path.join(path, "*.db")):
+        pid = _file_pid(file)
+        if pid is not None and pid != os.getpid() and not _pid_alive(pid):
+            os.remove(file)
+
+
+def _mark_dead_workers(path: str):
+    # Workers killed without running their exit handlers leave their live gauges behind
+    pids = {_file_pid(file) for file in glob.glob(os.path.join(path, "gauge_live*.db"))}
+    for pid in pids:
+        if pid is not None and not _pid_alive(pid):
+            multiprocess.mark_process_dead(pid, path)
+
+
+def metrics_registry() -> CollectorRegistry:
+    """Returns the registry to expose on the ``/metrics`` endpoint.
+
+    In multiprocess mode the metrics of all the worker processes are aggregated from
+    the files in ``PROMETHEUS_MULTIPROC_DIR``, so that every scrape reports the totals
+    of the server whichever worker handles it. The worker processes have to be started
+    by an external launcher such as gunicorn or uvicorn --workers, the model server
+    itself serves from a single process.
+    """
+    path = multiprocess_dir()
+    if path is None:
+        return REGISTRY
+    _mark_dead_workers(path)
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry, path=path)
+    registry.register(_ExecutorCollector())
+    return registry
+
+
+def _mark_process_dead():
+    path = multiprocess_dir()
+    if path is not None:
+        multiprocess.mark_process_dead(os.getpid(), path)
+
+
+# Registered in every process, forked workers report their own pid when they exit
+atexit.register(_mark_process_dead)
 
 
 class LLMStats(BaseModel):
@@ -39,3 +453,11 @@ class LLMStats(BaseModel):
 
 def get_labels(model_name):
     return {PROM_LABELS[0]: model_name}
+
+
+def get_compression_labels(model_name, encoding, direction):
+    return {
+        COMPRESSION_LABELS[0]: model_name,
+        COMPRESSION_LABELS[1]: encoding,
+        COMPRESSION_LABELS[2]: direction,
+    }
@@ -18,6 +18,8 @@ from abc import ABC
 from enum import Enum
 from typing import Any, AsyncIterator, Dict, List, Optional, Union
 
+import numpy as np
+import pandas as pd
 from cloudevents.http import CloudEvent
 
 from .constants.constants import (
@@ -25,15 +27,18 @@ from .constants.constants import (
     PREDICTOR_BASE_URL_FORMAT,
     EXPLAINER_BASE_URL_FORMAT,
 )
+from . import accounting, tracing
 from .errors import InvalidInput
 from .inference_client import RESTConfig, InferenceRESTClient, InferenceGRPCClient
-from .logging import trace_logger
+from .logging import log_request_fields
 from .metrics import (
     EXPLAIN_HIST_TIME,
     POST_HIST_TIME,
     PRE_HIST_TIME,
     PREDICT_HIST_TIME,
+    SERVICE_HIST_TIME,
     get_labels,
+    request_started,
 )
 from .protocol.grpc.grpc_predict_v2_pb2 import ModelInferRequest
 from .protocol.infer_type import InferRequest, InferResponse
@@ -161,8 +166,15 @@ class Model(BaseKServeModel):
         predict_ms = 0
         postprocess_ms = 0
         prom_labels = get_labels(self.name)
+        request_started(self.name)
+        start_rss_bytes = accounting.request_started()
+        service_start = time.perf_counter()
 
-        with PRE_HIST_TIME.labels(**prom_labels).time():
+        span_attributes = {"kserve.model_name": self.name}
+
+        with PRE_HIST_TIME.labels(**prom_labels).time(), tracing.span(
+            "preprocess", span_attributes
+        ), accounting.cpu_time(self.name, "preprocess", self.preprocess):
             start = time.time()
             payload = (
                 await self.preprocess(body, headers)
@@ -172,7 +184,9 @@ class Model(BaseKServeModel):
             preprocess_ms = get_latency_ms(start, time.time())
         payload = self.validate(payload)
         if verb == InferenceVerb.EXPLAIN:
-            with EXPLAIN_HIST_TIME.labels(**prom_labels).time():
+            with EXPLAIN_HIST_TIME.labels(**prom_labels).time(), tracing.span(
+                "explain", span_attributes
+            ), accounting.cpu_time(self.name, "explain", self.explain):
                 start = time.time()
                 response = (
                     (await self.explain(payload, headers))
@@ -181,7 +195,9 @@ class Model(BaseKServeModel):
                 )
                 explain_ms = get_latency_ms(start, time.time())
         elif verb == InferenceVerb.PREDICT:
-            with PREDICT_HIST_TIME.labels(**prom_labels).time():
+            with PREDICT_HIST_TIME.labels(**prom_labels).time(), tracing.span(
+                "predict", span_attributes
+            ), accounting.cpu_time(self.name, "predict", self.predict):
                 start = time.time()
                 response = (
                     (await self.predict(payload, headers))
@@ -192,7 +208,9 @@ class Model(BaseKServeModel):
         else:
             raise NotImplementedError
 
-        with POST_HIST_TIME.labels(**prom_labels).time():
+        with POST_HIST_TIME.labels(**prom_labels).time(), tracing.span(
+            "postprocess", span_attributes
+        ), accounting.cpu_time(self.name, "postprocess", self.postprocess):
             start = time.time()
             response = (
                 await self.postprocess(response, headers)
@@ -200,12 +218,20 @@ class Model(BaseKServeModel):
                 else self.postprocess(response, headers)
             )
             postprocess_ms = get_latency_ms(start, time.time())
+        SERVICE_HIST_TIME.labels(**prom_labels).observe(
+            time.perf_counter() - service_start
+        )
+        accounting.request_finished(self.name, start_rss_bytes)
 
         if self.enable_latency_logging is True:
-            trace_logger.info(
-                f"requestId: {request_id}, preprocess_ms: {preprocess_ms}, "
-                f"explain_ms: {explain_ms}, predict_ms: {predict_ms}, "
-                f"postprocess_ms: {postprocess_ms}"
+            log_request_fields(
+                {
+                    "requestId": request_id,
+                    "preprocess_ms": preprocess_ms,
+                    "explain_ms": explain_ms,
+                    "predict_ms": predict_ms,
+                    "postprocess_ms": postprocess_ms,
+                }
             )
 
         return response
@@ -238,7 +264,9 @@ class Model(BaseKServeModel):
             if (
                 isinstance(payload, Dict)
                 and "instances" in payload
-                and not isinstance(payload["instances"], list)
+                and not isinstance(
+                    payload["instances"], (list, pd.DataFrame, np.ndarray)
+                )
             ):
                 raise InvalidInput('Expected "instances" to be a list')
         return payload
@@ -269,6 +297,14 @@ class Model(BaseKServeModel):
         # return [{ "name": "", "datatype": "INT32", "shape": [1,5], }]
         return []
 
+    def get_output_labels(self) -> Dict[str, List[str]]:
+        # Override this function to return the class labels of the model outputs keyed by output name.
+        # The labels are added to the top-k classes returned for the `classification` output parameter.
+
+        # Eg.
+        # return {"output-0": ["cat", "dog"]}
+        return {}
+
     async def preprocess(
         self, payload: Union[Dict, InferRequest], headers: Dict[str, str] = None
     ) -> Union[Dict, InferRequest]:
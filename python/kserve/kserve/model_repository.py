@@ -17,6 +17,7 @@ from typing import Dict, Optional, Union
 
 from ray.serve.handle import DeploymentHandle
 
+from . import accounting
 from .model import BaseKServeModel
 
 MODEL_MOUNT_DIRS = "/mnt/models"
@@ -39,7 +40,8 @@ class ModelRepository:
         for name in os.listdir(self.models_dir):
             d = os.path.join(self.models_dir, name)
             if os.path.isdir(d):
-                self.load_model(name)
+                with accounting.measure_load(name):
+                    self.load_model(name)
 
     def set_models_dir(self, models_dir):  # used for unit tests
         self.models_dir = models_dir
@@ -80,5 +82,6 @@ class ModelRepository:
             if callable(getattr(model, "stop", None)):
                 model.stop()
             del self.models[name]
+            accounting.forget(name)
         else:
             raise KeyError(f"model with name {name} does not exist")
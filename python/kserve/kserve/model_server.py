@@ -26,19 +26,33 @@ from ray import serve as rayserve
 from ray.serve.api import Deployment
 from ray.serve.handle import DeploymentHandle
 
-from . import logging
+from . import accounting, logging, tracing
+from .accounting import DEFAULT_RSS_GROWTH_WARMUP
 from .constants.constants import (
     DEFAULT_HTTP_PORT,
     DEFAULT_GRPC_PORT,
+    DEFAULT_COMPRESSION_MIN_SIZE,
+    DEFAULT_MAX_DECOMPRESSED_SIZE,
     MAX_GRPC_MESSAGE_LENGTH,
 )
+from .health import HealthMonitor
 from .logging import logger
+from .loop_monitor import DEFAULT_LOOP_STALL_THRESHOLD, LoopMonitor
+from .metrics import (
+    PROMETHEUS_MULTIPROC_DIR_ENV,
+    cleanup_multiprocess_dir,
+    multiprocess_dir,
+    multiprocess_enabled,
+    register_executor_metrics,
+)
 from .model import BaseKServeModel
 from .model_repository import ModelRepository
 from .protocol.dataplane import DataPlane
 from .protocol.grpc.server import GRPCServer
 from .protocol.model_repository_extension import ModelRepositoryExtension
 from .protocol.rest.server import UvicornServer
+from .recorder import DEFAULT_REDACTED_HEADERS, RequestRecorder
+from .thread_budget import apply_thread_budget, plan_thread_budget
 from .utils import utils
 from .api import creds_utils
 from kserve.errors import NoModelReady
@@ -95,6 +109,26 @@ parser.add_argument(
     type=lambda x: utils.strtobool(x),
     help="Enable a log line per request with preprocess/predict/postprocess latency metrics.",
 )
+parser.add_argument(
+    "--latency_log_sample_rate",
+    default=1.0,
+    type=float,
+    help="The fraction of requests, between 0 and 1, for which a latency log line is written.",
+)
+parser.add_argument(
+    "--log_format",
+    default="text",
+    type=str,
+    choices=["text", "json"],
+    help="The format of the KServe log lines. 'json' writes one JSON object per line with "
+    "the latency metrics as separate fields.",
+)
+parser.add_argument(
+    "--enable_async_logging",
+    default=False,
+    type=lambda x: utils.strtobool(x),
+    help="Format and write the KServe log lines in a background thread instead of the event loop.",
+)
 parser.add_argument(
     "--configure_logging",
     default=True,
@@ -189,6 +223,165 @@ parser.add_argument(
     type=int,
     help="The max message length for gRPC receive message.",
 )
+parser.add_argument(
+    "--enable_rest_compression",
+    default=False,
+    type=lambda x: utils.strtobool(x),
+    help="Enable gzip/zstd/lz4 request and response body compression negotiated through the "
+    "Content-Encoding and Accept-Encoding headers.",
+)
+parser.add_argument(
+    "--grpc_compression",
+    default="none",
+    type=str,
+    choices=["none", "gzip", "deflate"],
+    help="The compression algorithm used for gRPC responses.",
+)
+parser.add_argument(
+    "--compression_min_size",
+    default=DEFAULT_COMPRESSION_MIN_SIZE,
+    type=int,
+    help="The minimum response size in bytes for REST and gRPC responses to be compressed.",
+)
+parser.add_argument(
+    "--max_decompressed_size",
+    default=DEFAULT_MAX_DECOMPRESSED_SIZE,
+    type=int,
+    help="The maximum size in bytes a compressed REST request body may decompress to, larger ones are "
+    "rejected with a 413 status.",
+)
+parser.add_argument(
+    "--enable_lean_routes",
+    default=False,
+    type=lambda x: utils.strtobool(x),
+    help="Serve the v1 predict and v2 infer endpoints with raw ASGI handlers which bypass "
+    "FastAPI request handling and the timing middleware.",
+)
+parser.add_argument(
+    "--enable_loop_monitor",
+    default=True,
+    type=lambda x: utils.strtobool(x),
+    help="Measure the event loop lag and log the stack of the code blocking the event loop.",
+)
+parser.add_argument(
+    "--loop_stall_threshold",
+    default=DEFAULT_LOOP_STALL_THRESHOLD,
+    type=float,
+    help="The event loop lag in seconds from which the blocking code is logged.",
+)
+parser.add_argument(
+    "--ready_max_in_flight",
+    default=None,
+    type=int,
+    help="Report the server not ready while more inference requests are in flight in the process, until they "
+    "fall below 80% of the limit. Not checked if not set.",
+)
+parser.add_argument(
+    "--ready_max_queued",
+    default=None,
+    type=int,
+    help="Report the server not ready while more inference requests are queued in the process, until they "
+    "fall below 80% of the limit. Not checked if not set.",
+)
+parser.add_argument(
+    "--ready_max_loop_lag",
+    default=None,
+    type=float,
+    help="Report the server not ready while the smoothed event loop lag exceeds this many seconds, until it "
+    "falls below 80% of the limit. Requires the loop monitor, not checked if not set.",
+)
+parser.add_argument(
+    "--liveness_stall_timeout",
+    default=None,
+    type=float,
+    help="Report the server not live for a minute after the event loop was blocked for longer than this many "
+    "seconds. Requires the loop monitor, not checked if not set.",
+)
+parser.add_argument(
+    "--enable_debug_endpoints",
+    default=False,
+    type=lambda x: utils.strtobool(x),
+    help="Serve the /debug/profile, /debug/stacks and /debug/tracemalloc endpoints. They expose the "
+    "server internals and must not be reachable by untrusted clients.",
+)
+parser.add_argument(
+    "--tracing_exporter",
+    default="none",
+    type=str,
+    choices=tracing.TRACING_EXPORTERS,
+    help="Export OpenTelemetry traces of the requests to an OTLP endpoint or a local file. "
+    "Requires the opentelemetry-sdk package.",
+)
+parser.add_argument(
+    "--tracing_endpoint",
+    default=None,
+    type=str,
+    help="The OTLP gRPC endpoint the traces are exported to. Defaults to the OTEL_EXPORTER_OTLP_ENDPOINT "
+    "environment variable.",
+)
+parser.add_argument(
+    "--tracing_file",
+    default=None,
+    type=str,
+    help="The file the traces are written to, one JSON span per line, with the 'file' exporter.",
+)
+parser.add_argument(
+    "--tracing_sample_rate",
+    default=1.0,
+    type=float,
+    help="The fraction of traces started by this server which are sampled, between 0 and 1. "
+    "The sampling decision of the caller is followed for propagated traces.",
+)
+parser.add_argument(
+    "--rss_growth_alert_mb",
+    default=0,
+    type=float,
+    help="Log a warning and count an alert in the model_rss_growth_alerts metric when the resident memory grows by "
+    "this many MiB during the requests of a model, flagging models leaking memory. Disabled with 0.",
+)
+parser.add_argument(
+    "--rss_growth_warmup_requests",
+    default=DEFAULT_RSS_GROWTH_WARMUP,
+    type=int,
+    help="The first requests of every model not counted in the resident memory growth, while caches fill up.",
+)
+parser.add_argument(
+    "--record_requests_file",
+    default=None,
+    type=str,
+    help="Record a sample of the inference requests to this file, one JSON request per line, for replay with "
+    "'python -m kserve.benchmark.replay'. The requests are not recorded if not set.",
+)
+parser.add_argument(
+    "--record_sample_rate",
+    default=0.01,
+    type=float,
+    help="The fraction of the inference requests which are recorded, between 0 and 1.",
+)
+parser.add_argument(
+    "--record_max_bytes",
+    default=100 * 1024 * 1024,
+    type=int,
+    help="The size in bytes from which the recorded requests file is rotated.",
+)
+parser.add_argument(
+    "--record_backup_count",
+    default=5,
+    type=int,
+    help="The number of rotated recorded requests files which are kept.",
+)
+parser.add_argument(
+    "--record_redact_headers",
+    default=",".join(DEFAULT_REDACTED_HEADERS),
+    type=str,
+    help="Comma separated names of the request headers whose value is redacted in the recorded requests.",
+)
+parser.add_argument(
+    "--record_bodies",
+    default=True,
+    type=lambda x: utils.strtobool(x),
+    help="Record the request bodies, only the metadata and headers of the requests are recorded otherwise.",
+)
 args, _ = parser.parse_known_args()
 
 app = FastAPI(
@@ -216,7 +409,34 @@ class ModelServer:
         secure_grpc_server: bool = args.secure_grpc_server,
         ssl_server_key: Union[str, bytes] = args.ssl_server_key,
         ssl_server_cert: Union[str, bytes] = args.ssl_server_cert,
-        ssl_ca_cert: Union[str, bytes] = args.ssl_ca_cert
+        ssl_ca_cert: Union[str, bytes] = args.ssl_ca_cert,
+        enable_rest_compression: bool = args.enable_rest_compression,
+        grpc_compression: str = args.grpc_compression,
+        compression_min_size: int = args.compression_min_size,
+        max_decompressed_size: int = args.max_decompressed_size,
+        enable_lean_routes: bool = args.enable_lean_routes,
+        latency_log_sample_rate: float = args.latency_log_sample_rate,
+        log_format: str = args.log_format,
+        enable_async_logging: bool = args.enable_async_logging,
+        tracing_exporter: str = args.tracing_exporter,
+        tracing_endpoint: Optional[str] = args.tracing_endpoint,
+        tracing_file: Optional[str] = args.tracing_file,
+        tracing_sample_rate: float = args.tracing_sample_rate,
+        enable_debug_endpoints: bool = args.enable_debug_endpoints,
+        enable_loop_monitor: bool = args.enable_loop_monitor,
+        loop_stall_threshold: float = args.loop_stall_threshold,
+        ready_max_in_flight: Optional[int] = args.ready_max_in_flight,
+        ready_max_queued: Optional[int] = args.ready_max_queued,
+        ready_max_loop_lag: Optional[float] = args.ready_max_loop_lag,
+        liveness_stall_timeout: Optional[float] = args.liveness_stall_timeout,
+        record_requests_file: Optional[str] = args.record_requests_file,
+        record_sample_rate: float = args.record_sample_rate,
+        record_max_bytes: int = args.record_max_bytes,
+        record_backup_count: int = args.record_backup_count,
+        record_redact_headers: str = args.record_redact_headers,
+        record_bodies: bool = args.record_bodies,
+        rss_growth_alert_mb: float = args.rss_growth_alert_mb,
+        rss_growth_warmup_requests: int = args.rss_growth_warmup_requests,
     ):
         """KServe ModelServer Constructor
 
@@ -240,6 +460,53 @@ class ModelServer:
             ssl_server_key: File path or contents to server key for secure grpc server credentials. Default: ``None``.
             ssl_server_cert: File path or contents to server cert for secure grpc server credentials. Default: ``None``.
             ssl_ca_cert: File path or contents to CA cert for secure grpc server credentials. Default: ``None``.
+            enable_rest_compression: Whether to compress REST request/response bodies negotiated through the
+                                     ``Content-Encoding``/``Accept-Encoding`` headers. Default: ``False``.
+            grpc_compression: The compression algorithm of the gRPC responses, ``none``, ``gzip`` or
+                              ``deflate``. Default: ``none``.
+            compression_min_size: Minimum REST and gRPC response size in bytes to be compressed.
+                                  Default: ``65536``.
+            max_decompressed_size: Maximum size in bytes a compressed REST request body may decompress to.
+                                   Default: ``268435456``.
+            enable_lean_routes: Whether to serve the v1 predict and v2 infer endpoints with raw ASGI
+                                handlers bypassing FastAPI. Default: ``False``.
+            latency_log_sample_rate: The fraction of requests for which a latency log line is written.
+                                     Default: ``1.0``.
+            log_format: The format of the KServe log lines, ``text`` or ``json``. Default: ``text``.
+            enable_async_logging: Whether to write the KServe log lines from a background thread.
+                                  Default: ``False``.
+            tracing_exporter: Where OpenTelemetry traces are exported, ``none``, ``otlp`` or ``file``.
+                              Default: ``none``.
+            tracing_endpoint: The OTLP endpoint the traces are exported to. Default: ``None``.
+            tracing_file: The file the traces are written to with the ``file`` exporter. Default: ``None``.
+            tracing_sample_rate: The fraction of traces started by this server which are sampled.
+                                 Default: ``1.0``.
+            enable_debug_endpoints: Whether to serve the CPU profiling, stack dump and tracemalloc
+                                    endpoints under ``/debug``. Default: ``False``.
+            enable_loop_monitor: Whether to measure the event loop lag and log the code blocking the
+                                 event loop. Default: ``True``.
+            loop_stall_threshold: The event loop lag in seconds from which the blocking code is logged.
+                                  Default: ``0.5``.
+            ready_max_in_flight: The in-flight inference requests above which the server is not ready.
+                                 Default: ``None``.
+            ready_max_queued: The queued inference requests above which the server is not ready. Default: ``None``.
+            ready_max_loop_lag: The smoothed event loop lag in seconds above which the server is not ready.
+                                Default: ``None``.
+            liveness_stall_timeout: The event loop stall in seconds after which the server is not live.
+                                    Default: ``None``.
+            record_requests_file: The file a sample of the inference requests is recorded to, the requests are
+                                  not recorded if not set. Default: ``None``.
+            record_sample_rate: The fraction of the inference requests which are recorded. Default: ``0.01``.
+            record_max_bytes: The size in bytes from which the recorded requests file is rotated.
+                              Default: ``104857600``.
+            record_backup_count: The number of rotated recorded requests files which are kept. Default: ``5``.
+            record_redact_headers: Comma separated names of the headers redacted in the recorded requests.
+                                   Default: ``authorization,proxy-authorization,cookie,x-api-key``.
+            record_bodies: Whether to record the request bodies. Default: ``True``.
+            rss_growth_alert_mb: The resident memory growth in MiB during the requests of a model from which
+                                 an alert is raised, disabled with ``0``. Default: ``0``.
+            rss_growth_warmup_requests: The first requests of every model not counted in the resident memory
+                                        growth. Default: ``100``.
         """
         self.registered_models = (
             ModelRepository() if registered_models is None else registered_models
@@ -252,7 +519,56 @@ class ModelServer:
         self.enable_grpc = enable_grpc
         self.enable_docs_url = enable_docs_url
         self.enable_latency_logging = enable_latency_logging
-        self.dataplane = DataPlane(model_registry=self.registered_models)
+        accounting.configure_rss_growth_alerts(
+            int(rss_growth_alert_mb * 1024 * 1024), rss_growth_warmup_requests
+        )
+        self._recorder = None
+        if record_requests_file:
+            self._recorder = RequestRecorder(
+                record_requests_file,
+                sample_rate=record_sample_rate,
+                max_bytes=record_max_bytes,
+                backup_count=record_backup_count,
+                redact_headers=[
+                    name.strip()
+                    for name in record_redact_headers.split(",")
+                    if name.strip()
+                ],
+                record_bodies=record_bodies,
+            )
+        self._loop_monitor = (
+            LoopMonitor(stall_threshold=loop_stall_threshold)
+            if enable_loop_monitor
+            else None
+        )
+        if (
+            ready_max_loop_lag is not None or liveness_stall_timeout is not None
+        ) and not self._loop_monitor:
+            logger.warning(
+                "The event loop is not checked by the probes without the loop monitor"
+            )
+        health_monitor = None
+        if any(
+            limit is not None
+            for limit in (
+                ready_max_in_flight,
+                ready_max_queued,
+                ready_max_loop_lag,
+                liveness_stall_timeout,
+            )
+        ):
+            health_monitor = HealthMonitor(
+                max_in_flight=ready_max_in_flight,
+                max_queued=ready_max_queued,
+                max_loop_lag=ready_max_loop_lag,
+                liveness_stall_timeout=liveness_stall_timeout,
+                loop_monitor=self._loop_monitor,
+            )
+        self.dataplane = DataPlane(
+            model_registry=self.registered_models,
+            recorder=self._recorder,
+            health_monitor=health_monitor,
+        )
         self.model_repository_extension = ModelRepositoryExtension(
             model_registry=self.registered_models
         )
@@ -278,6 +594,8 @@ class ModelServer:
                     kwargs=vars(args),
                     secure_server=self.secure_grpc_server,
                     grpc_secure_server_credentials=server_credentials,
+                    compression=grpc_compression,
+                    compression_min_size=compression_min_size,
                 )
             else:
                 self._grpc_server = GRPCServer(
@@ -285,13 +603,34 @@ class ModelServer:
                     self.dataplane,
                     self.model_repository_extension,
                     kwargs=vars(args),
+                    compression=grpc_compression,
+                    compression_min_size=compression_min_size,
                 )
         if args.configure_logging:
             # If the logger does not have any handlers, then the logger is not configured.
             # For backward compatibility, we configure the logger here.
             if len(logger.handlers) == 0:
                 logging.configure_logging(args.log_config_file)
+        if log_format == "json":
+            logging.use_json_format()
+        if enable_async_logging:
+            logging.enable_async_logging()
+        logging.set_trace_sample_rate(latency_log_sample_rate)
+        # Configured before the servers are started, the REST tracing middleware is only
+        # installed when tracing is enabled.
+        tracing.configure_tracing(
+            exporter=tracing_exporter,
+            endpoint=tracing_endpoint,
+            file_path=tracing_file,
+            sample_rate=tracing_sample_rate,
+        )
         self.access_log_format = access_log_format
+        self.enable_rest_compression = enable_rest_compression
+        self.grpc_compression = grpc_compression
+        self.compression_min_size = compression_min_size
+        self.max_decompressed_size = max_decompressed_size
+        self.enable_lean_routes = enable_lean_routes
+        self.enable_debug_endpoints = enable_debug_endpoints
         self._custom_exception_handler = None
 
     async def _serve_rest(self):
@@ -320,6 +659,12 @@ class ModelServer:
             log_config=None,
             access_log_format=self.access_log_format,
             workers=self.workers,
+            enable_compression=self.enable_rest_compression,
+            compression_min_size=self.compression_min_size,
+            max_decompressed_size=self.max_decompressed_size,
+            enable_lean_routes=self.enable_lean_routes,
+            enable_latency_logging=self.enable_latency_logging,
+            enable_debug_endpoints=self.enable_debug_endpoints,
         )
         await self._rest_server.run()
 
@@ -359,15 +704,36 @@ class ModelServer:
         else:
             raise RuntimeError("Unknown model collection types")
 
-        if self.max_asyncio_workers is None:
-            # formula as suggest in https://bugs.python.org/issue35279
-            self.max_asyncio_workers = min(32, utils.cpu_count() + 4)
+        if multiprocess_dir() is not None:
+            logger.info(f"Aggregating Prometheus metrics from {multiprocess_dir()}")
+            cleanup_multiprocess_dir()
+        if (
+            self.workers > 1 or multiprocess_dir() is not None
+        ) and not multiprocess_enabled():
+            logger.warning(
+                f"{PROMETHEUS_MULTIPROC_DIR_ENV} was not set before prometheus_client "
+                "was imported, the metrics of the worker processes started by an "
+                "external launcher are not aggregated"
+            )
+        # The REST server runs in this process whatever the number of workers, so the
+        # CPUs are not divided among worker processes
+        self.thread_budget = plan_thread_budget(
+            workers=1,
+            max_asyncio_workers=self.max_asyncio_workers,
+            max_threads=self.max_threads,
+        )
+        apply_thread_budget(self.thread_budget)
+        self.max_asyncio_workers = self.thread_budget.asyncio_workers
         logger.info(f"Setting max asyncio worker threads as {self.max_asyncio_workers}")
-        asyncio.get_event_loop().set_default_executor(
-            concurrent.futures.ThreadPoolExecutor(max_workers=self.max_asyncio_workers)
+        executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.max_asyncio_workers
         )
+        register_executor_metrics(executor)
+        asyncio.get_event_loop().set_default_executor(executor)
 
         async def servers_task():
+            if self._loop_monitor:
+                self._loop_monitor.start()
             servers = [self._serve_rest()]
             if self.enable_grpc:
                 servers.append(self._grpc_server.start(self.max_threads))
@@ -388,6 +754,10 @@ class ModelServer:
         if self._grpc_server:
             logger.info("Stopping the grpc server")
             await self._grpc_server.stop(sig)
+        if self._loop_monitor:
+            await self._loop_monitor.stop()
+        if self._recorder:
+            self._recorder.close()
         for model_name in list(self.registered_models.get_models().keys()):
             self.registered_models.unload(model_name)
 
@@ -0,0 +1,152 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""In-process diagnostics of a running model server.
+
+A sampling CPU profiler, a dump of the thread and asyncio task stacks and a diff of the
+``tracemalloc`` allocations over a time window. None of them needs a restart or an
+external tool, they back the REST debug endpoints.
+"""
+
+import asyncio
+import collections
+import io
+import sys
+import threading
+import time
+import traceback
+import tracemalloc
+from types import FrameType
+from typing import Dict, Optional
+
+DEFAULT_SAMPLE_INTERVAL = 0.01
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    # ';' separates the frames of a collapsed stack
+    return f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})".replace(
+        ";", ":"
+    )
+
+
+def sample_stacks(
+    duration: float, interval: float = DEFAULT_SAMPLE_INTERVAL
+) -> Dict[str, int]:
+    """Samples the stacks of all the threads, except the calling one, for a duration.
+
+    This blocks the calling thread, run it from a dedicated thread to profile the event
+    loop.
+
+    Args:
+        duration: How long to sample for, in seconds.
+        interval: The time between two samples, in seconds.
+
+    Returns:
+        The number of samples per collapsed stack. A collapsed stack is the thread name
+        followed by the frames from the outermost to the innermost one, separated by
+        ``;``.
+    """
+    own_ident = threading.get_ident()
+    counts = collections.Counter()
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == own_ident:
+                continue
+            frames = []
+            while frame is not None:
+                frames.append(_frame_label(frame))
+                frame = frame.f_back
+            frames.append(names.get(ident, str(ident)).replace(";", ":"))
+            counts[";".join(reversed(frames))] += 1
+        time.sleep(interval)
+    return dict(counts)
+
+
+def format_collapsed(counts: Dict[str, int]) -> str:
+    """Formats the stack samples in the collapsed format of flamegraph.pl and speedscope."""
+    return "".join(
+        f"{stack} {count}\n"
+        for stack, count in sorted(counts.items(), key=lambda item: -item[1])
+    )
+
+
+def dump_stacks(loop: Optional[asyncio.AbstractEventLoop] = None) -> str:
+    """Returns the current stack of every thread and of every asyncio task of the loop.
+
+    Args:
+        loop: The event loop whose tasks are dumped, the running loop by default. Tasks
+              are skipped when no loop is running.
+    """
+    out = io.StringIO()
+    names = {thread.ident: thread.name for thread in threading.enumerate()}
+    for ident, frame in sys._current_frames().items():
+        out.write(f"Thread {names.get(ident, ident)} ({ident}):\n")
+        out.write("".join(traceback.format_stack(frame)))
+        out.write("\n")
+    if loop is None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return out.getvalue()
+    for task in asyncio.all_tasks(loop):
+        task.print_stack(file=out)
+        out.write("\n")
+    return out.getvalue()
+
+
+def _snapshot() -> tracemalloc.Snapshot:
+    return tracemalloc.take_snapshot().filter_traces(
+        [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<unknown>"),
+        ]
+    )
+
+
+async def tracemalloc_diff(
+    duration: float, limit: int = 25, key_type: str = "lineno", frames: int = 1
+) -> str:
+    """Returns the top allocation differences over a time window.
+
+    ``tracemalloc`` is started for the window when it is not already tracing, which
+    slows down the allocations of the whole process while it runs.
+
+    Args:
+        duration: The length of the window, in seconds.
+        limit: The number of top differences returned.
+        key_type: How the allocations are grouped, ``lineno``, ``filename`` or
+                  ``traceback``.
+        frames: The number of frames stored per allocation when tracemalloc is started.
+    """
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start(frames)
+    try:
+        before = _snapshot()
+        await asyncio.sleep(duration)
+        after = _snapshot()
+    finally:
+        if started:
+            tracemalloc.stop()
+    stats = after.compare_to(before, key_type)[:limit]
+    lines = []
+    for stat in stats:
+        lines.append(str(stat))
+        if key_type == "traceback":
+            lines.extend(f"    {line}" for line in stat.traceback.format())
+    return "\n".join(lines) + "\n"
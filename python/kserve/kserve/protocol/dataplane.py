@@ -23,11 +23,15 @@ from cloudevents.http import CloudEvent, from_http
 from cloudevents.sdk.converters.util import has_binary_headers
 from ray.serve.handle import DeploymentHandle
 
+from .. import accounting, tracing
 from ..constants import constants
-from ..errors import InvalidInput, ModelNotFound
+from ..errors import InvalidInput, ModelNotFound, ServerNotReady
+from ..health import HealthMonitor
 from ..logging import logger
 from ..model import InferenceVerb, Model
 from ..model_repository import ModelRepository
+from ..recorder import RequestRecorder
+from ..utils import arrow_codec, msgpack_codec
 from ..utils.utils import create_response_cloudevent, is_structured_cloudevent
 from .infer_type import InferRequest, InferResponse
 from .rest.openai import OpenAIModel
@@ -50,8 +54,15 @@ ModelHandleType = Union[Model, DeploymentHandle]
 class DataPlane:
     """KServe DataPlane"""
 
-    def __init__(self, model_registry: ModelRepository):
+    def __init__(
+        self,
+        model_registry: ModelRepository,
+        recorder: Optional[RequestRecorder] = None,
+        health_monitor: Optional[HealthMonitor] = None,
+    ):
         self._model_registry = model_registry
+        self._recorder = recorder
+        self._health_monitor = health_monitor
         self._server_name = constants.KSERVE_MODEL_SERVER_NAME
 
         # Dynamically fetching version of the installed 'kserve' distribution. The assumption is
@@ -62,6 +73,10 @@ class DataPlane:
     def model_registry(self):
         return self._model_registry
 
+    @property
+    def recorder(self) -> Optional[RequestRecorder]:
+        return self._recorder
+
     def get_model_from_registry(self, name: str) -> ModelHandleType:
         model = self._model_registry.get_model(name)
         if model is None:
@@ -82,7 +97,8 @@ class DataPlane:
         if model is None:
             raise ModelNotFound(name)
         if not self._model_registry.is_model_ready(name):
-            model.load()
+            with accounting.measure_load(name):
+                model.load()
         return model
 
     @staticmethod
@@ -119,8 +135,7 @@ class DataPlane:
         ) as e:
             raise InvalidInput(f"Cloud Event Exceptions: {e}")
 
-    @staticmethod
-    async def live() -> Dict[str, str]:
+    async def live(self) -> Dict[str, str]:
         """Server live.
 
         Returns ``{"status": "alive"}`` on successful invocation.
@@ -128,7 +143,12 @@ class DataPlane:
 
         Returns:
             Dict: {"status": "alive"}
+
+        Raises:
+            ServerNotReady: exception if the health monitor detected a stalled event loop
         """
+        if self._health_monitor is not None and not self._health_monitor.live():
+            raise ServerNotReady("Model server is not live, the event loop stalled.")
         return {"status": "alive"}
 
     def metadata(self) -> Dict:
@@ -196,16 +216,16 @@ class DataPlane:
             "outputs": output_types,
         }
 
-    @staticmethod
-    async def ready() -> bool:
+    async def ready(self) -> bool:
         """Server ready.
 
-        Returns ``True``. Primarily meant to be used as Kubernetes readiness check.
+        Returns ``True`` unless the health monitor reports the server overloaded.
+        Primarily meant to be used as Kubernetes readiness check.
 
         Returns:
-            bool: True
+            bool: True if the server is ready, False otherwise.
         """
-        return True
+        return self._health_monitor is None or self._health_monitor.ready()
 
     def model_ready(self, model_name: str) -> bool:
         """Check if a model is ready.
@@ -224,6 +244,7 @@ class DataPlane:
 
         return self._model_registry.is_model_ready(model_name)
 
+    @tracing.traced("decode")
     def decode(self, body, headers) -> Tuple[Union[Dict, InferRequest], Dict]:
         t1 = time.time()
         attributes = {}
@@ -233,6 +254,16 @@ class DataPlane:
             if has_binary_headers(headers):
                 # returns CloudEvent
                 body = self.get_binary_cloudevent(body, headers)
+            elif (
+                headers.get("content-type", "").split(";")[0].strip()
+                == constants.ARROW_CONTENT_TYPE
+            ):
+                body = {"instances": arrow_codec.decode_dataframe(body)}
+            elif (
+                headers.get("content-type", "").split(";")[0].strip()
+                == constants.MSGPACK_CONTENT_TYPE
+            ):
+                body = msgpack_codec.loads(body)
             elif (
                 "content-type" in headers
                 and headers["content-type"] not in JSON_HEADERS
@@ -280,6 +311,7 @@ class DataPlane:
                 del attributes["data"]
         return decoded_body, attributes
 
+    @tracing.traced("encode")
     def encode(
         self, model_name, response, headers, req_attributes: Dict
     ) -> Tuple[Dict, Dict[str, str]]:
@@ -287,6 +319,19 @@ class DataPlane:
         # if we received a cloudevent, then also return a cloudevent
         is_cloudevent = False
         is_binary_cloudevent = False
+        if headers and self.accepts_arrow(headers):
+            arrow_response = self.encode_arrow(response)
+            if arrow_response is not None:
+                response_headers["content-type"] = constants.ARROW_CONTENT_TYPE
+                return arrow_response, response_headers
+        if (
+            headers
+            and self.accepts_msgpack(headers)
+            and isinstance(response, dict)
+            and msgpack_codec.is_available()
+        ):
+            response_headers["content-type"] = constants.MSGPACK_CONTENT_TYPE
+            return msgpack_codec.dumps(response), response_headers
         if isinstance(response, InferResponse):
             response = response.to_rest()
         if headers:
@@ -306,6 +351,43 @@ class DataPlane:
                 response_headers["content-type"] = "application/cloudevents+json"
         return response, response_headers
 
+    @staticmethod
+    def accepts_arrow(headers: Dict[str, str]) -> bool:
+        """Whether the client asked for an Apache Arrow IPC stream response."""
+        return constants.ARROW_CONTENT_TYPE in headers.get(
+            "accept", ""
+        ) and not has_binary_headers(headers)
+
+    @staticmethod
+    def accepts_msgpack(headers: Dict[str, str]) -> bool:
+        """Whether the client asked for a MessagePack response."""
+        return constants.MSGPACK_CONTENT_TYPE in headers.get(
+            "accept", ""
+        ) and not has_binary_headers(headers)
+
+    @staticmethod
+    def encode_arrow(response: Union[Dict, InferResponse]) -> Optional[bytes]:
+        """Encodes the response as an Apache Arrow IPC stream.
+
+        Args:
+            response: A v1 response dict or a v2 InferResponse.
+
+        Returns:
+            The Arrow IPC stream or ``None`` if the response can not be represented
+            as an Arrow table, in which case the response falls back to JSON.
+        """
+        if not arrow_codec.is_available():
+            return None
+        try:
+            if isinstance(response, InferResponse):
+                return arrow_codec.encode_infer_response(response)
+            if isinstance(response, dict) and response.keys() == {"predictions"}:
+                return arrow_codec.encode_predictions(response["predictions"])
+        except (InvalidInput, ValueError, TypeError) as e:
+            # pyarrow conversion errors derive from ValueError and TypeError
+            logger.debug(f"Falling back to JSON response: {e}")
+        return None
+
     async def infer(
         self,
         model_name: str,
@@ -332,6 +414,17 @@ class DataPlane:
 
         .. _CloudEvent: https://cloudevents.io/
         """
+        if self._recorder is not None and self._recorder.sampled():
+            with self._recorder.record(model_name, request, headers):
+                return await self._infer(model_name, request, headers)
+        return await self._infer(model_name, request, headers)
+
+    async def _infer(
+        self,
+        model_name: str,
+        request: Union[Dict, InferRequest],
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Tuple[Union[Dict, InferResponse], Dict[str, str]]:
         # call model locally or remote model workers
         model = self.get_model(model_name)
         if isinstance(model, OpenAIModel):
@@ -341,6 +434,16 @@ class DataPlane:
             response = await model.remote(request, headers=headers)
         else:
             response = await model(request, headers=headers)
+        if (
+            isinstance(request, InferRequest)
+            and request.request_outputs
+            and isinstance(response, InferResponse)
+        ):
+            response = response.select_outputs(
+                request.request_outputs,
+                labels=model.get_output_labels() if isinstance(model, Model) else None,
+                binary_data=request.use_binary_outputs,
+            )
         return response, headers
 
     async def explain(
@@ -362,6 +465,17 @@ class DataPlane:
         Raises:
             InvalidInput: An error when the body bytes can't be decoded as JSON.
         """
+        if self._recorder is not None and self._recorder.sampled():
+            with self._recorder.record(model_name, request, headers, verb="explain"):
+                return await self._explain(model_name, request, headers)
+        return await self._explain(model_name, request, headers)
+
+    async def _explain(
+        self,
+        model_name: str,
+        request: Union[bytes, Dict, InferRequest],
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Tuple[Union[str, bytes, Dict, InferResponse], Dict[str, str]]:
         # call model locally or remote model workers
         model = self.get_model(model_name)
         if isinstance(model, OpenAIModel):
@@ -17,7 +17,7 @@ from typing import Awaitable, Callable
 from grpc import HandlerCallDetails, RpcMethodHandler
 from grpc.aio import ServerInterceptor
 
-from ...logging import logger
+from ...logging import logger, trace_sampled
 
 
 class LoggingInterceptor(ServerInterceptor):
@@ -27,5 +27,6 @@ class LoggingInterceptor(ServerInterceptor):
         continuation: Callable[[HandlerCallDetails], Awaitable[RpcMethodHandler]],
         handler_call_details: HandlerCallDetails,
     ) -> RpcMethodHandler:
-        logger.info(f"grpc method: {handler_call_details.method}")
+        if trace_sampled():
+            logger.info("grpc method: %s", handler_call_details.method)
         return await continuation(handler_call_details)
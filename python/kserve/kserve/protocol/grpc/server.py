@@ -17,8 +17,9 @@ import multiprocessing
 from concurrent import futures
 from typing import List, IO
 
-from grpc import aio, ssl_server_credentials as grpc_ssl_server_credentials
+from grpc import Compression, aio, ssl_server_credentials as grpc_ssl_server_credentials
 
+from kserve.constants.constants import DEFAULT_COMPRESSION_MIN_SIZE
 from kserve.logging import logger
 from kserve.protocol.dataplane import DataPlane
 from kserve.protocol.model_repository_extension import ModelRepositoryExtension
@@ -27,6 +28,12 @@ from . import grpc_predict_v2_pb2_grpc
 from .interceptors import LoggingInterceptor
 from .servicer import InferenceServicer
 
+COMPRESSION_ALGORITHMS = {
+    "none": Compression.NoCompression,
+    "gzip": Compression.Gzip,
+    "deflate": Compression.Deflate,
+}
+
 
 class GRPCServer:
     def __init__(
@@ -36,7 +43,9 @@ class GRPCServer:
         model_repository_extension: ModelRepositoryExtension,
         kwargs: dict,
         secure_server: bool = False,
-        grpc_secure_server_credentials: List[IO] = None
+        grpc_secure_server_credentials: List[IO] = None,
+        compression: str = "none",
+        compression_min_size: int = DEFAULT_COMPRESSION_MIN_SIZE,
     ):
         self._port = port
         self._data_plane = data_plane
@@ -45,14 +54,25 @@ class GRPCServer:
         self._kwargs = kwargs
         self._secure_server = secure_server
         self._grpc_secure_server_credentials = grpc_secure_server_credentials
+        self._compression = compression
+        self._compression_min_size = compression_min_size
 
     async def start(self, max_workers):
+        compression = COMPRESSION_ALGORITHMS[self._compression or "none"]
+        compression_min_size = (
+            self._compression_min_size
+            if compression != Compression.NoCompression
+            else None
+        )
         inference_servicer = InferenceServicer(
-            self._data_plane, self._model_repository_extension
+            self._data_plane,
+            self._model_repository_extension,
+            compression_min_size=compression_min_size,
         )
         self._server = aio.server(
             futures.ThreadPoolExecutor(max_workers=max_workers),
             interceptors=(LoggingInterceptor(),),
+            compression=compression,
             options=[
                 (
                     "grpc.max_send_message_length",
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from typing import Optional
 
 from . import grpc_predict_v2_pb2 as pb
 from . import grpc_predict_v2_pb2_grpc
@@ -22,7 +23,9 @@ from kserve.utils.utils import to_headers
 
 from grpc import ServicerContext
 
-from ...errors import InvalidInput
+from ...errors import InvalidInput, ServerNotReady
+from ...metrics import track_request
+from ... import tracing
 
 
 class InferenceServicer(grpc_predict_v2_pb2_grpc.GRPCInferenceServiceServicer):
@@ -31,10 +34,12 @@ class InferenceServicer(grpc_predict_v2_pb2_grpc.GRPCInferenceServiceServicer):
         self,
         data_plane: DataPlane,
         model_repository_extension: ModelRepositoryExtension,
+        compression_min_size: Optional[int] = None,
     ):
         super().__init__()
         self._data_plane = data_plane
         self._mode_repository_extension = model_repository_extension
+        self._compression_min_size = compression_min_size
 
     @classmethod
     def validate_grpc_request(cls, request: pb.ModelInferRequest):
@@ -62,7 +67,10 @@ class InferenceServicer(grpc_predict_v2_pb2_grpc.GRPCInferenceServiceServicer):
     async def ServerLive(
         self, request: pb.ServerLiveRequest, context
     ) -> pb.ServerLiveResponse:
-        response = await self._data_plane.live()
+        try:
+            response = await self._data_plane.live()
+        except ServerNotReady:
+            return pb.ServerLiveResponse(live=False)
         is_live = response["status"] == "alive"
         return pb.ServerLiveResponse(live=is_live)
 
@@ -112,19 +120,37 @@ class InferenceServicer(grpc_predict_v2_pb2_grpc.GRPCInferenceServiceServicer):
     async def ModelInfer(
         self, request: pb.ModelInferRequest, context: ServicerContext
     ) -> pb.ModelInferResponse:
+        model_name = request.model_name
+        if self._data_plane.model_registry.get_model(model_name) is None:
+            # Requests for unknown models are not labeled to bound the metrics cardinality
+            model_name = None
         headers = to_headers(context)
-        self.validate_grpc_request(request)
-        infer_request = InferRequest.from_grpc(request)
-        response_body, _ = await self._data_plane.infer(
-            request=infer_request, headers=headers, model_name=request.model_name
-        )
-        if isinstance(response_body, pb.ModelInferResponse):
-            return response_body
-        elif isinstance(response_body, InferResponse):
-            return response_body.to_grpc()
-        else:
-            return pb.ModelInferResponse(
-                id=response_body["id"],
-                model_name=response_body["model_name"],
-                outputs=response_body["outputs"],
+        with track_request("grpc", model_name) as metrics, tracing.server_span(
+            "ModelInfer", headers, {"kserve.model_name": request.model_name}
+        ):
+            metrics.status = "UNKNOWN"
+            metrics.request_bytes = request.ByteSize()
+            self.validate_grpc_request(request)
+            infer_request = InferRequest.from_grpc(request)
+            response_body, _ = await self._data_plane.infer(
+                request=infer_request, headers=headers, model_name=request.model_name
             )
+            if isinstance(response_body, pb.ModelInferResponse):
+                response = response_body
+            elif isinstance(response_body, InferResponse):
+                response = response_body.to_grpc()
+            else:
+                response = pb.ModelInferResponse(
+                    id=response_body["id"],
+                    model_name=response_body["model_name"],
+                    outputs=response_body["outputs"],
+                )
+            metrics.response_bytes = response.ByteSize()
+            metrics.status = "OK"
+            if (
+                self._compression_min_size is not None
+                and metrics.response_bytes < self._compression_min_size
+            ):
+                # Small responses are not worth the compression CPU cost
+                context.disable_next_message_compression()
+            return response
@@ -13,7 +13,8 @@
 # limitations under the License.
 
 import struct
-from typing import Optional, List, Dict, Union
+import warnings
+from typing import Any, Optional, List, Dict, Union
 
 import numpy as np
 import pandas as pd
@@ -21,7 +22,17 @@ import uuid
 
 from google.protobuf.internal.containers import MessageMap
 
-from ..constants.constants import GRPC_CONTENT_DATATYPE_MAPPINGS
+from ..constants.constants import (
+    CLASSIFICATION_PARAM,
+    DATATYPE_PARAM,
+    GRPC_CONTENT_DATATYPE_MAPPINGS,
+    SPARSE_COLUMNS_PARAM,
+    SPARSE_COMPONENT_PARAM,
+    SPARSE_CSR_COMPONENTS,
+    SPARSE_FORMAT_CSR,
+    SPARSE_FORMAT_PARAM,
+    SPARSE_GROUP_PARAM,
+)
 from ..errors import InvalidInput, InferenceError
 from ..protocol.grpc.grpc_predict_v2_pb2 import (
     ModelInferRequest,
@@ -29,7 +40,20 @@ from ..protocol.grpc.grpc_predict_v2_pb2 import (
     ModelInferResponse,
     InferParameter,
 )
-from ..utils.numpy_codec import to_np_dtype, from_np_dtype
+from ..utils.numpy_codec import bfloat16_dtype, to_np_dtype, from_np_dtype
+
+# The datatypes of the components of a sparse tensor supported by scipy
+_SPARSE_INDEX_DATATYPES = (
+    "INT8",
+    "INT16",
+    "INT32",
+    "INT64",
+    "UINT8",
+    "UINT16",
+    "UINT32",
+    "UINT64",
+)
+_SPARSE_VALUE_DATATYPES = _SPARSE_INDEX_DATATYPES + ("BOOL", "FP16", "FP32", "FP64")
 
 
 def serialize_byte_tensor(input_tensor: np.ndarray) -> np.ndarray:
@@ -221,9 +245,47 @@ class InferInput:
                 np_array = np.frombuffer(self._raw_data, dtype=dtype)
             return np_array.reshape(self._shape)
         else:
-            np_array = np.array(self._data, dtype=dtype)
+            np_array = np.asarray(self._data, dtype=dtype)
             return np_array.reshape(self._shape)
 
+    def as_torch(self, device: Any = None):
+        """Decode the inference input data as a torch tensor.
+
+        Binary data is wrapped with ``torch.frombuffer`` and numpy data with
+        ``torch.from_numpy``, so the tensor shares memory with the inference input instead of
+        being copied. The tensor must not be modified when it wraps binary data.
+
+        Args:
+            device: The device to move the tensor to, the tensor stays on the CPU if not set.
+
+        Returns:
+            A torch tensor of the inference input data.
+
+        Raises:
+            InvalidInput: If the datatype is BYTES or torch is not installed.
+        """
+        return _as_torch(self, device)
+
+    def set_data_from_torch(self, input_tensor, binary_data: bool = True):
+        """Set the tensor data from the specified torch tensor.
+
+        CPU tensors are viewed as numpy arrays without copying, other tensors are copied
+        to the CPU first.
+
+        Args:
+            input_tensor : The tensor data as torch tensor.
+            binary_data : Indicates whether to set data in binary format, see set_data_from_numpy.
+        """
+        self.set_data_from_numpy(_torch_to_numpy(input_tensor), binary_data=binary_data)
+
+    def __dlpack__(self, stream: Any = None):
+        """Export the inference input data through the DLPack protocol, e.g. for ``torch.from_dlpack``."""
+        return _dlpack_array(self).__dlpack__(stream=stream)
+
+    def __dlpack_device__(self):
+        # The tensor data always lives in host memory
+        return _DLPACK_CPU_DEVICE
+
     def set_data_from_numpy(self, input_tensor: np.ndarray, binary_data: bool = True):
         """Set the tensor data from the specified numpy array for input associated with this object.
 
@@ -288,7 +350,7 @@ class InferInput:
                         " you want to pass a byte array."
                     )
             else:
-                self._data = [val.item() for val in input_tensor.flatten()]
+                self._data = input_tensor.flatten().tolist()
         else:
             self._data = None
             if self._datatype == "BYTES":
@@ -341,6 +403,13 @@ class InferInput:
         return self.__repr__()
 
 
+# Datatypes without a typed contents field in the gRPC protocol, sent as raw contents only
+RAW_ONLY_DATATYPES = ("FP16", "BF16")
+
+# Floating point datatypes an output can be cast to with the datatype output parameter
+FLOAT_DATATYPES = ("FP16", "BF16", "FP32", "FP64")
+
+
 def get_content(datatype: str, data: InferTensorContents):
     if datatype == "BOOL":
         return list(data.bool_contents)
@@ -352,8 +421,8 @@ def get_content(datatype: str, data: InferTensorContents):
         return list(data.int_contents)
     elif datatype == "INT64":
         return list(data.int64_contents)
-    elif datatype == "FP16":
-        # FP16 data should be present in raw_input_content, so return an empty list.
+    elif datatype in RAW_ONLY_DATATYPES:
+        # FP16 and BF16 data should be present in raw_input_content, so return an empty list.
         return list()
     elif datatype == "FP32":
         return list(data.fp32_contents)
@@ -365,11 +434,96 @@ def get_content(datatype: str, data: InferTensorContents):
         raise InvalidInput("invalid content type")
 
 
+class RequestedOutput:
+    def __init__(
+        self,
+        name: str,
+        parameters: Optional[Union[Dict, MessageMap[str, InferParameter]]] = None,
+    ):
+        """An object of RequestedOutput class describes an output requested by the client.
+
+        Args:
+            name: The name of the requested output.
+            parameters: The additional parameters of the requested output, e.g.
+                        ``classification`` to return only the top-k classes of the output.
+        """
+        self._name = name
+        self._parameters = parameters
+
+    @property
+    def name(self) -> str:
+        """Get the name of the requested output.
+
+        Returns:
+            The name of the requested output.
+        """
+        return self._name
+
+    @property
+    def parameters(self) -> Union[Dict, MessageMap[str, InferParameter], None]:
+        """Get the parameters of the requested output.
+
+        Returns:
+            The additional parameters of the requested output.
+        """
+        return self._parameters
+
+    @property
+    def classification(self) -> Optional[int]:
+        """Get the number of top classes requested for the output.
+
+        Returns:
+            The number of classes to return, or None if classification was not requested.
+
+        Raises:
+            InvalidInput: If the classification parameter is not a positive integer.
+        """
+        if not self._parameters or CLASSIFICATION_PARAM not in self._parameters:
+            return None
+        value = to_http_parameters(self._parameters)[CLASSIFICATION_PARAM]
+        try:
+            k = int(value)
+        except (TypeError, ValueError):
+            k = 0
+        if isinstance(value, bool) or k <= 0:
+            raise InvalidInput(
+                f"Invalid {CLASSIFICATION_PARAM} parameter '{value}' for output "
+                f"'{self._name}', expected a positive integer"
+            )
+        return k
+
+    @property
+    def datatype(self) -> Optional[str]:
+        """Get the datatype the output is requested to be cast to.
+
+        Returns:
+            The requested datatype, or None if the output is returned in its own datatype.
+        """
+        if not self._parameters or DATATYPE_PARAM not in self._parameters:
+            return None
+        return str(to_http_parameters(self._parameters)[DATATYPE_PARAM]).upper()
+
+    def __eq__(self, other):
+        if not isinstance(other, RequestedOutput):
+            return False
+        return self.name == other.name and self.parameters == other.parameters
+
+    def to_dict(self) -> dict:
+        return {"name": self.name, "parameters": self.parameters}
+
+    def __repr__(self) -> str:
+        return f'"name": "{self.name}",' f'"parameters": {self.parameters}'
+
+    def __str__(self) -> str:
+        return self.__repr__()
+
+
 class InferRequest:
     id: Optional[str]
     model_name: str
     parameters: Optional[Dict]
     inputs: List[InferInput]
+    request_outputs: Optional[List[RequestedOutput]]
     from_grpc: bool
 
     def __init__(
@@ -380,6 +534,7 @@ class InferRequest:
         raw_inputs=None,
         from_grpc: Optional[bool] = False,
         parameters: Optional[Union[Dict, MessageMap[str, InferParameter]]] = None,
+        request_outputs: Optional[List[RequestedOutput]] = None,
     ):
         """InferRequest Data Model.
 
@@ -390,12 +545,15 @@ class InferRequest:
             raw_inputs: The binary data for the inference inputs.
             from_grpc: Indicate if the data model is constructed from gRPC request.
             parameters: The additional inference parameters.
+            request_outputs: The outputs requested by the client, all outputs are
+                             returned when not set.
         """
 
         self.id = request_id
         self.model_name = model_name
         self.inputs = infer_inputs
         self.parameters = parameters
+        self.request_outputs = request_outputs
         self.from_grpc = from_grpc
         self._use_raw_outputs = False
         if raw_inputs:
@@ -424,6 +582,10 @@ class InferRequest:
             )
             for input_tensor in request.inputs
         ]
+        request_outputs = [
+            RequestedOutput(name=output.name, parameters=output.parameters)
+            for output in request.outputs
+        ]
         return cls(
             request_id=request.id,
             model_name=request.model_name,
@@ -431,6 +593,41 @@ class InferRequest:
             raw_inputs=request.raw_input_contents,
             from_grpc=True,
             parameters=request.parameters,
+            request_outputs=request_outputs or None,
+        )
+
+    @classmethod
+    def from_rest(cls, model_name: str, request: Dict) -> "InferRequest":
+        """The class method to construct the InferRequest from a v2 REST request dict.
+
+        Raises:
+            InvalidInput: If the request is missing required fields.
+        """
+        try:
+            infer_inputs = [
+                InferInput(
+                    name=input["name"],
+                    shape=list(input["shape"]),
+                    datatype=input["datatype"],
+                    data=input["data"],
+                    parameters=input.get("parameters") or {},
+                )
+                for input in request["inputs"]
+            ]
+            request_outputs = [
+                RequestedOutput(
+                    name=output["name"], parameters=output.get("parameters")
+                )
+                for output in request.get("outputs") or []
+            ]
+        except (KeyError, TypeError, AttributeError) as e:
+            raise InvalidInput(f"Invalid inference request: {e!r}")
+        return cls(
+            request_id=request.get("id"),
+            model_name=model_name,
+            infer_inputs=infer_inputs,
+            parameters=request.get("parameters"),
+            request_outputs=request_outputs or None,
         )
 
     def to_rest(self) -> Dict:
@@ -465,6 +662,18 @@ class InferRequest:
         }
         if self.parameters:
             infer_request["parameters"] = to_http_parameters(self.parameters)
+        if self.request_outputs:
+            infer_request["outputs"] = [
+                (
+                    {
+                        "name": output.name,
+                        "parameters": to_http_parameters(output.parameters),
+                    }
+                    if output.parameters
+                    else {"name": output.name}
+                )
+                for output in self.request_outputs
+            ]
         return infer_request
 
     def to_grpc(self) -> ModelInferRequest:
@@ -476,6 +685,12 @@ class InferRequest:
         infer_inputs = []
         raw_input_contents = []
         for infer_input in self.inputs:
+            if (
+                infer_input.datatype in RAW_ONLY_DATATYPES
+                and infer_input._raw_data is None
+                and isinstance(infer_input.data, list)
+            ):
+                infer_input._data = infer_input.as_numpy()
             if isinstance(infer_input.data, np.ndarray):
                 infer_input.set_data_from_numpy(infer_input.data, binary_data=True)
             infer_input_dict = {
@@ -512,6 +727,17 @@ class InferRequest:
             inputs=infer_inputs,
             raw_input_contents=raw_input_contents,
             parameters=to_grpc_parameters(self.parameters) if self.parameters else None,
+            outputs=[
+                {
+                    "name": output.name,
+                    "parameters": (
+                        to_grpc_parameters(output.parameters)
+                        if output.parameters
+                        else None
+                    ),
+                }
+                for output in self.request_outputs or []
+            ],
         )
 
     def as_dataframe(self) -> pd.DataFrame:
@@ -519,17 +745,168 @@ class InferRequest:
 
         Returns:
             The inference input data as pandas dataframe
+
+        Raises:
+            InvalidInput: If the inputs do not have the same number of elements.
         """
-        dfs = []
+        columns = {}
         for input in self.inputs:
-            input_data = input.data
+            if (
+                input.datatype == "BYTES"
+                and input._raw_data is None
+                and not isinstance(input.data, np.ndarray)
+            ):
+                input_data = np.asarray(input.data, dtype=object).reshape(-1)
+            else:
+                # Every input becomes a column of scalars, e.g. a [N, 1] input sent as
+                # nested JSON lists, without an intermediate per-input DataFrame.
+                input_data = input.as_numpy().reshape(-1)
             if input.datatype == "BYTES":
                 input_data = [
                     str(val, "utf-8") if isinstance(val, bytes) else val
-                    for val in input.data
+                    for val in input_data
                 ]
-            dfs.append(pd.DataFrame(input_data, columns=[input.name]))
-        return pd.concat(dfs, axis=1)
+            columns[input.name] = input_data
+        lengths = {name: len(data) for name, data in columns.items()}
+        if len(set(lengths.values())) > 1:
+            raise InvalidInput(
+                f"The inputs of a dataframe must have the same number of elements, got {lengths}"
+            )
+        return pd.DataFrame(columns, copy=False)
+
+    def _sparse_groups(self) -> Dict[str, Dict[str, Any]]:
+        groups: Dict[str, Dict[str, Any]] = {}
+        for infer_input in self.inputs:
+            if not infer_input.parameters:
+                continue
+            parameters = to_http_parameters(infer_input.parameters)
+            sparse_format = parameters.get(SPARSE_FORMAT_PARAM)
+            if sparse_format is None:
+                continue
+            if sparse_format != SPARSE_FORMAT_CSR:
+                raise InvalidInput(f"Unsupported sparse format '{sparse_format}'")
+            component = parameters.get(SPARSE_COMPONENT_PARAM)
+            if component not in SPARSE_CSR_COMPONENTS:
+                raise InvalidInput(
+                    f"Invalid sparse component '{component}' for input '{infer_input.name}'"
+                )
+            group = groups.setdefault(
+                parameters.get(SPARSE_GROUP_PARAM, ""), {"columns": None}
+            )
+            group[component] = infer_input
+            if SPARSE_COLUMNS_PARAM in parameters:
+                try:
+                    group["columns"] = int(parameters[SPARSE_COLUMNS_PARAM])
+                except (TypeError, ValueError):
+                    raise InvalidInput(
+                        f"Invalid '{SPARSE_COLUMNS_PARAM}' parameter for input "
+                        f"'{infer_input.name}', expected an integer"
+                    )
+        return groups
+
+    def has_sparse_inputs(self) -> bool:
+        """Whether the request contains a sparse tensor described by input parameters."""
+        return any(
+            infer_input.parameters and SPARSE_FORMAT_PARAM in infer_input.parameters
+            for infer_input in self.inputs
+        )
+
+    def as_sparse(self, group: Optional[str] = None):
+        """Decode a sparse tensor of the inputs as ``scipy.sparse.csr_matrix``.
+
+        A CSR tensor is sent as three inputs, ``indptr``, ``indices`` and ``values``,
+        sharing the same ``sparse_group`` parameter. Every component has the
+        ``sparse_format`` parameter set to ``csr`` and its ``sparse_component``
+        parameter set to the component name. The number of columns is given by the
+        ``sparse_columns`` parameter, the number of rows is ``len(indptr) - 1``.
+        Use :func:`to_sparse_inputs` to build the inputs from a scipy matrix.
+
+        Args:
+            group: The sparse group to decode, can be omitted if the request contains
+                   a single sparse tensor.
+
+        Returns:
+            The decoded ``scipy.sparse.csr_matrix``.
+
+        Raises:
+            InvalidInput: If the components are missing or inconsistent or scipy is
+                          not installed.
+        """
+        sparse = _import_scipy_sparse()
+        groups = self._sparse_groups()
+        if group is None:
+            if len(groups) != 1:
+                raise InvalidInput(
+                    f"Expected a single sparse tensor but found {len(groups)}, "
+                    "specify the sparse group to decode"
+                )
+            group, components = next(iter(groups.items()))
+        elif group in groups:
+            components = groups[group]
+        else:
+            raise InvalidInput(f"Sparse group '{group}' not found in the request")
+        missing = [c for c in SPARSE_CSR_COMPONENTS if c not in components]
+        if missing:
+            raise InvalidInput(
+                f"Sparse group '{group}' is missing components {missing}"
+            )
+        if components["columns"] is None:
+            raise InvalidInput(
+                f"Sparse group '{group}' is missing the '{SPARSE_COLUMNS_PARAM}' parameter"
+            )
+        for component in SPARSE_CSR_COMPONENTS:
+            datatype = components[component].datatype
+            allowed = (
+                _SPARSE_VALUE_DATATYPES
+                if component == "values"
+                else _SPARSE_INDEX_DATATYPES
+            )
+            if datatype not in allowed:
+                raise InvalidInput(
+                    f"Invalid datatype {datatype} for the sparse component '{component}' "
+                    f"of sparse group '{group}', expected one of {list(allowed)}"
+                )
+        indptr = components["indptr"].as_numpy().reshape(-1)
+        indices = components["indices"].as_numpy().reshape(-1)
+        values = components["values"].as_numpy().reshape(-1)
+        try:
+            matrix = sparse.csr_matrix(
+                (values, indices, indptr),
+                shape=(len(indptr) - 1, components["columns"]),
+            )
+            # Out of range indices are otherwise only detected by the model, if at all.
+            matrix.check_format(full_check=True)
+            return matrix
+        except ValueError as e:
+            raise InvalidInput(f"Invalid sparse tensor '{group}': {e}")
+
+    def get_requested_output(self, name: str) -> Optional[RequestedOutput]:
+        """Find the requested output with the given name.
+
+        Args:
+            name: The name of the output.
+
+        Returns:
+            The RequestedOutput object if the client requested the output, otherwise None.
+        """
+        for output in self.request_outputs or []:
+            if output.name == name:
+                return output
+        return None
+
+    def is_output_requested(self, name: str) -> bool:
+        """Whether the output with the given name should be returned to the client.
+
+        All outputs are returned when the request does not name any output, models can
+        use this to skip computing outputs that are not going to be returned.
+
+        Args:
+            name: The name of the output.
+
+        Returns:
+            True if the output is requested, False otherwise.
+        """
+        return not self.request_outputs or self.get_requested_output(name) is not None
 
     def get_input_by_name(self, name: str) -> Optional[InferInput]:
         """Find an input Tensor in the InferenceRequest that has the given name
@@ -559,6 +936,8 @@ class InferRequest:
             return False
         if self.inputs != other.inputs:
             return False
+        if self.request_outputs != other.request_outputs:
+            return False
         return True
 
     def to_dict(self) -> dict:
@@ -696,9 +1075,49 @@ class InferOutput:
                 np_array = np.frombuffer(self._raw_data, dtype=dtype)
             return np_array.reshape(self._shape)
         else:
-            np_array = np.array(self._data, dtype=dtype)
+            np_array = np.asarray(self._data, dtype=dtype)
             return np_array.reshape(self._shape)
 
+    def as_torch(self, device: Any = None):
+        """Decode the inference output data as a torch tensor.
+
+        Binary data is wrapped with ``torch.frombuffer`` and numpy data with
+        ``torch.from_numpy``, so the tensor shares memory with the inference output instead of
+        being copied. The tensor must not be modified when it wraps binary data.
+
+        Args:
+            device: The device to move the tensor to, the tensor stays on the CPU if not set.
+
+        Returns:
+            A torch tensor of the inference output data.
+
+        Raises:
+            InvalidInput: If the datatype is BYTES or torch is not installed.
+        """
+        return _as_torch(self, device)
+
+    def set_data_from_torch(self, output_tensor, binary_data: bool = True):
+        """Set the tensor data from the specified torch tensor.
+
+        CPU tensors are viewed as numpy arrays without copying, other tensors are copied
+        to the CPU first.
+
+        Args:
+            output_tensor : The tensor data as torch tensor.
+            binary_data : Indicates whether to set data in binary format, see set_data_from_numpy.
+        """
+        self.set_data_from_numpy(
+            _torch_to_numpy(output_tensor), binary_data=binary_data
+        )
+
+    def __dlpack__(self, stream: Any = None):
+        """Export the inference output data through the DLPack protocol, e.g. for ``torch.from_dlpack``."""
+        return _dlpack_array(self).__dlpack__(stream=stream)
+
+    def __dlpack_device__(self):
+        # The tensor data always lives in host memory
+        return _DLPACK_CPU_DEVICE
+
     def set_data_from_numpy(self, output_tensor: np.ndarray, binary_data: bool = True):
         """Set the tensor data from the specified numpy array for the inference output associated with this object.
 
@@ -763,7 +1182,7 @@ class InferOutput:
                         " you want to pass a byte array."
                     )
             else:
-                self._data = [val.item() for val in output_tensor.flatten()]
+                self._data = output_tensor.flatten().tolist()
         else:
             self._data = None
             if self._datatype == "BYTES":
@@ -779,6 +1198,90 @@ class InferOutput:
             else:
                 self._parameters["binary_data_size"] = len(self._raw_data)
 
+    def as_datatype(self, datatype: str, binary_data: bool = False) -> "InferOutput":
+        """Cast a floating point output to another floating point datatype.
+
+        Down-casting FP32 outputs to FP16 or BF16 halves the size of binary outputs.
+
+        Args:
+            datatype: The datatype to cast to, one of FP16, BF16, FP32 or FP64.
+            binary_data: Whether to set the cast data in binary format.
+
+        Returns:
+            This InferOutput if it already has the datatype, otherwise a new InferOutput
+            with the same name holding the cast data.
+
+        Raises:
+            InvalidInput: If the output or the datatype is not a floating point datatype.
+        """
+        datatype = datatype.upper()
+        if datatype == self.datatype:
+            return self
+        if self.datatype not in FLOAT_DATATYPES or datatype not in FLOAT_DATATYPES:
+            raise InvalidInput(
+                f"Can not cast {self.datatype} output '{self.name}' to {datatype}"
+            )
+        output = InferOutput(name=self.name, shape=self.shape, datatype=datatype)
+        output.set_data_from_numpy(
+            self.as_numpy().astype(to_np_dtype(datatype)), binary_data=binary_data
+        )
+        return output
+
+    def as_classification(
+        self, k: int, labels: Optional[List[str]] = None, binary_data: bool = False
+    ) -> "InferOutput":
+        """Reduce the output scores to the top-k classes along the last axis.
+
+        Each class is encoded as a ``BYTES`` element ``"<score>:<index>"``, or
+        ``"<score>:<index>:<label>"`` when labels are given, sorted by descending score.
+        An output of shape ``[..., num_classes]`` becomes ``[..., min(k, num_classes)]``.
+
+        Args:
+            k: The number of classes to return.
+            labels: The class labels indexed by class index.
+            binary_data: Whether to set the classification data in binary format.
+
+        Returns:
+            A new InferOutput with the same name holding the top-k classes.
+
+        Raises:
+            InvalidInput: If the output is not a numeric tensor.
+        """
+        scores = self.as_numpy()
+        if self.datatype == "BF16":
+            scores = scores.astype(np.float32)
+        if scores.dtype.kind not in "biuf":
+            raise InvalidInput(
+                f"Classification is not supported for {self.datatype} output '{self.name}'"
+            )
+        if scores.ndim == 0:
+            scores = scores.reshape(1)
+        k = min(k, scores.shape[-1])
+        if k < scores.shape[-1]:
+            # argpartition only sorts the k largest scores instead of all classes
+            indices = np.argpartition(-scores, k - 1, axis=-1)[..., :k]
+            top_scores = np.take_along_axis(scores, indices, axis=-1)
+            order = np.argsort(-top_scores, axis=-1, kind="stable")
+            indices = np.take_along_axis(indices, order, axis=-1)
+        else:
+            indices = np.argsort(-scores, axis=-1, kind="stable")
+        top_scores = np.take_along_axis(scores, indices, axis=-1)
+        classes = np.empty(indices.shape, dtype=np.object_)
+        flat_classes = classes.reshape(-1)
+        # numpy scalars print the shortest representation of the score in its own dtype
+        for i, (score, index) in enumerate(
+            zip(top_scores.reshape(-1), indices.reshape(-1).tolist())
+        ):
+            if labels is not None and index < len(labels):
+                flat_classes[i] = f"{str(score)}:{index}:{labels[index]}"
+            else:
+                flat_classes[i] = f"{str(score)}:{index}"
+        output = InferOutput(
+            name=self.name, shape=list(classes.shape), datatype="BYTES"
+        )
+        output.set_data_from_numpy(classes, binary_data=binary_data)
+        return output
+
     def __eq__(self, other):
         if not isinstance(other, InferOutput):
             return False
@@ -944,8 +1447,8 @@ class InferResponse:
         infer_outputs = []
         raw_output_contents = []
         use_raw_outputs = False
-        # If FP16 datatype is present in the outputs use raw outputs.
-        if _contains_fp16_datatype(self):
+        # If FP16 or BF16 datatype is present in the outputs use raw outputs.
+        if _contains_raw_only_datatype(self):
             use_raw_outputs = True
         for infer_output in self.outputs:
             if (
@@ -993,6 +1496,52 @@ class InferResponse:
             parameters=to_grpc_parameters(self.parameters) if self.parameters else None,
         )
 
+    def select_outputs(
+        self,
+        request_outputs: Optional[List[RequestedOutput]],
+        labels: Optional[Dict[str, List[str]]] = None,
+        binary_data: bool = False,
+    ) -> "InferResponse":
+        """Keep only the requested outputs, in the requested order.
+
+        Outputs requested with the ``classification`` parameter are reduced to their
+        top-k classes, see :meth:`InferOutput.as_classification`. Outputs requested with
+        the ``datatype`` parameter are cast to it, see :meth:`InferOutput.as_datatype`.
+        The response is returned unchanged when no outputs are requested.
+
+        Args:
+            request_outputs: The outputs requested by the client.
+            labels: The class labels of the outputs keyed by output name.
+            binary_data: Whether to set classification data in binary format.
+
+        Returns:
+            This InferResponse object.
+
+        Raises:
+            InvalidInput: If a requested output is not produced by the model.
+        """
+        if not request_outputs:
+            return self
+        outputs = []
+        for requested in request_outputs:
+            output = self.get_output_by_name(requested.name)
+            if output is None:
+                raise InvalidInput(
+                    f"Requested output '{requested.name}' is not produced by the model"
+                )
+            k = requested.classification
+            if k is not None:
+                output = output.as_classification(
+                    k,
+                    labels=labels.get(output.name) if labels else None,
+                    binary_data=binary_data,
+                )
+            elif requested.datatype is not None:
+                output = output.as_datatype(requested.datatype, binary_data=binary_data)
+            outputs.append(output)
+        self.outputs = outputs
+        return self
+
     def get_output_by_name(self, name: str) -> Optional[InferOutput]:
         """Find an output Tensor in the InferResponse that has the given name
 
@@ -1048,6 +1597,116 @@ class InferResponse:
         return self.__repr__()
 
 
+# DLPack device type kDLCPU with device id 0
+_DLPACK_CPU_DEVICE = (1, 0)
+
+
+def _import_torch():
+    try:
+        import torch
+    except ImportError:
+        raise InvalidInput("Torch tensors require the 'torch' package to be installed")
+    return torch
+
+
+def _as_torch(tensor: Union[InferInput, InferOutput], device: Any = None):
+    torch = _import_torch()
+    if tensor.datatype == "BYTES":
+        raise InvalidInput(
+            f"BYTES tensor '{tensor.name}' can not be converted to a torch tensor"
+        )
+    with warnings.catch_warnings():
+        # torch warns when sharing memory with a read only buffer such as gRPC raw contents
+        warnings.simplefilter("ignore", UserWarning)
+        if tensor._raw_data:
+            if tensor.datatype == "BF16":
+                torch_dtype = torch.bfloat16
+            else:
+                np_dtype = to_np_dtype(tensor.datatype)
+                if np_dtype is None:
+                    raise InvalidInput(
+                        f"invalid datatype {tensor.datatype} in the tensor"
+                    )
+                torch_dtype = torch.from_numpy(np.empty(0, dtype=np_dtype)).dtype
+            torch_tensor = torch.frombuffer(tensor._raw_data, dtype=torch_dtype)
+            torch_tensor = torch_tensor.reshape(tensor.shape)
+        elif tensor.datatype == "BF16":
+            # torch has no numpy bfloat16 conversion, share the memory as int16 instead
+            np_array = np.ascontiguousarray(tensor.as_numpy()).view(np.int16)
+            torch_tensor = torch.from_numpy(np_array).view(torch.bfloat16)
+        else:
+            torch_tensor = torch.from_numpy(np.ascontiguousarray(tensor.as_numpy()))
+    if device is not None:
+        torch_tensor = torch_tensor.to(device)
+    return torch_tensor
+
+
+def _torch_to_numpy(tensor: Any) -> np.ndarray:
+    torch = _import_torch()
+    tensor = tensor.detach().cpu()
+    if tensor.dtype == torch.bfloat16:
+        return tensor.view(torch.int16).numpy().view(bfloat16_dtype())
+    return tensor.numpy()
+
+
+def _dlpack_array(tensor: Union[InferInput, InferOutput]) -> np.ndarray:
+    np_array = tensor.as_numpy()
+    if not np_array.flags.writeable:
+        # numpy can not export read only arrays, e.g. views of the raw binary data.
+        np_array = np_array.copy()
+    return np_array
+
+
+def _import_scipy_sparse():
+    try:
+        import scipy.sparse
+    except ImportError:
+        raise InvalidInput("Sparse tensors require the 'scipy' package to be installed")
+    return scipy.sparse
+
+
+def to_sparse_inputs(name: str, matrix: Any) -> List[InferInput]:
+    """Encodes a scipy sparse matrix as the CSR component inputs of a request.
+
+    Only the non zero values are sent, see :meth:`InferRequest.as_sparse` for the
+    layout. The components are kept as numpy arrays, so they are sent as JSON data
+    over REST and as raw contents over gRPC.
+
+    Args:
+        name: The sparse group name, used as prefix of the input names.
+        matrix: A two dimensional ``scipy.sparse`` matrix or array.
+
+    Returns:
+        The ``indptr``, ``indices`` and ``values`` inputs.
+    """
+    sparse = _import_scipy_sparse()
+    matrix = sparse.csr_matrix(matrix)
+    infer_inputs = []
+    for component, data in zip(
+        SPARSE_CSR_COMPONENTS,
+        (
+            matrix.indptr.astype(np.int64, copy=False),
+            matrix.indices.astype(np.int64, copy=False),
+            matrix.data,
+        ),
+    ):
+        infer_inputs.append(
+            InferInput(
+                name=f"{name}_{component}",
+                shape=list(data.shape),
+                datatype=from_np_dtype(data.dtype),
+                data=data,
+                parameters={
+                    SPARSE_FORMAT_PARAM: SPARSE_FORMAT_CSR,
+                    SPARSE_GROUP_PARAM: name,
+                    SPARSE_COMPONENT_PARAM: component,
+                    SPARSE_COLUMNS_PARAM: int(matrix.shape[1]),
+                },
+            )
+        )
+    return infer_inputs
+
+
 def to_grpc_parameters(
     parameters: Union[Dict[str, Union[str, bool, int]], MessageMap[str, InferParameter]]
 ) -> Dict[str, InferParameter]:
@@ -1096,14 +1755,15 @@ def to_http_parameters(
     return http_params
 
 
-def _contains_fp16_datatype(infer_response: InferResponse) -> bool:
+def _contains_raw_only_datatype(infer_response: InferResponse) -> bool:
     """
-    Checks whether the InferResponse outputs contains FP16 datatype.
+    Checks whether the InferResponse outputs contains FP16 or BF16 datatype.
 
     :param infer_response: An InferResponse object containing model inference results.
-    :return: A boolean indicating whether any output in the InferResponse uses the FP16 datatype.
+    :return: A boolean indicating whether any output in the InferResponse uses a datatype which
+             can only be sent as raw contents.
     """
     for infer_output in infer_response.outputs:
-        if infer_output.datatype == "FP16":
+        if infer_output.datatype in RAW_ONLY_DATATYPES:
             return True
     return False
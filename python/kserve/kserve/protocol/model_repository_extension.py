@@ -16,6 +16,7 @@ import inspect
 import sys
 from typing import Dict, List, Optional
 
+from .. import accounting
 from ..errors import ModelNotFound, ModelNotReady
 from ..model_repository import ModelRepository
 
@@ -46,6 +47,7 @@ class ModelRepositoryExtension:
                     name: model_name,
                     state: "Ready" or "NotReady"
                     reason: ""
+                    usage: {load_rss_bytes, cpu_seconds, requests} if measured
                 }
         """
         model_list = []
@@ -53,17 +55,19 @@ class ModelRepositoryExtension:
             model_ready = self._model_registry.is_model_ready(model_name)
             if model_ready or not filter_ready:
                 # If model is ready or filter_ready is set to False
-                model_list.append(
-                    {
-                        "name": model_name,
-                        "state": (
-                            "Ready"
-                            if self._model_registry.is_model_ready(model_name)
-                            else "NotReady"
-                        ),
-                        "reason": "",
-                    }
-                )
+                model_info = {
+                    "name": model_name,
+                    "state": (
+                        "Ready"
+                        if self._model_registry.is_model_ready(model_name)
+                        else "NotReady"
+                    ),
+                    "reason": "",
+                }
+                usage = accounting.model_usage(model_name)
+                if usage is not None:
+                    model_info["usage"] = usage.to_dict()
+                model_list.append(model_info)
 
         return model_list
 
@@ -80,10 +84,11 @@ class ModelRepositoryExtension:
         """
         try:
             # For backward compatibility, the synchronous `load` has been kept here.
-            if inspect.iscoroutinefunction(self._model_registry.load):
-                await self._model_registry.load(model_name)
-            else:
-                self._model_registry.load(model_name)
+            with accounting.measure_load(model_name):
+                if inspect.iscoroutinefunction(self._model_registry.load):
+                    await self._model_registry.load(model_name)
+                else:
+                    self._model_registry.load(model_name)
         except Exception:
             ex_type, ex_value, ex_traceback = sys.exc_info()
             raise ModelNotReady(
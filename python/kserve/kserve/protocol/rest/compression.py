@@ -0,0 +1,385 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import functools
+import gzip
+import re
+import zlib
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+import orjson
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ...constants.constants import (
+    DEFAULT_COMPRESSION_MIN_SIZE,
+    DEFAULT_MAX_DECOMPRESSED_SIZE,
+)
+from ...metrics import (
+    COMPRESSION_COMPRESSED_BYTES,
+    COMPRESSION_HIST_TIME,
+    COMPRESSION_UNCOMPRESSED_BYTES,
+    get_compression_labels,
+)
+
+# Extracts the model name from v1 (/v1/models/<name>:predict) and
+# v2 (/v2/models/<name>/infer) paths so that metrics can be compared per model.
+_MODEL_PATH_REGEX = re.compile(r"^/v[12]/models/([^/:]+)")
+
+# Streaming responses are never buffered for compression.
+_STREAMING_CONTENT_TYPES = ("text/event-stream",)
+
+
+class DecompressedSizeExceeded(ValueError):
+    """Raised when a body decompresses to more than the maximum size."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+
+    def __str__(self):
+        return f"Decompressed body exceeds the maximum size of {self.max_size} bytes"
+
+
+class Codec(NamedTuple):
+    compress: Callable[[bytes], bytes]
+    # Decompresses at most the given number of bytes, raising DecompressedSizeExceeded
+    # beyond it, so that a small compressed body cannot expand to exhaust the memory.
+    decompress: Callable[[bytes, int], bytes]
+
+
+def _gzip_decompress(data: bytes, max_size: int) -> bytes:
+    chunks = []
+    size = 0
+    # A gzip body may hold several members, as gzip.decompress accepts
+    while data:
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        chunk = decompressor.decompress(data, max_size - size + 1)
+        size += len(chunk)
+        if size > max_size:
+            raise DecompressedSizeExceeded(max_size)
+        if not decompressor.eof:
+            raise ValueError("Compressed file ended before the end-of-stream marker")
+        chunks.append(chunk)
+        data = decompressor.unused_data
+    return b"".join(chunks)
+
+
+def _gzip_codec() -> Codec:
+    return Codec(
+        compress=lambda data: gzip.compress(data, compresslevel=6, mtime=0),
+        decompress=_gzip_decompress,
+    )
+
+
+def _zstd_codec() -> Optional[Codec]:
+    try:
+        import zstandard
+    except ImportError:
+        return None
+
+    def decompress(data: bytes, max_size: int) -> bytes:
+        # Frames written in streaming mode do not record the content size,
+        # so always go through the stream reader.
+        chunks = []
+        size = 0
+        with zstandard.ZstdDecompressor().stream_reader(data) as reader:
+            while True:
+                chunk = reader.read(min(max_size - size + 1, 1 << 20))
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_size:
+                    raise DecompressedSizeExceeded(max_size)
+                chunks.append(chunk)
+        return b"".join(chunks)
+
+    return Codec(
+        compress=lambda data: zstandard.ZstdCompressor(level=3).compress(data),
+        decompress=decompress,
+    )
+
+
+def _lz4_codec() -> Optional[Codec]:
+    try:
+        import lz4.frame
+    except ImportError:
+        return None
+
+    def decompress(data: bytes, max_size: int) -> bytes:
+        decompressor = lz4.frame.LZ4FrameDecompressor()
+        result = decompressor.decompress(data, max_length=max_size + 1)
+        if len(result) > max_size:
+            raise DecompressedSizeExceeded(max_size)
+        if not decompressor.eof:
+            raise ValueError("Compressed frame ended before the end mark")
+        return result
+
+    return Codec(compress=lz4.frame.compress, decompress=decompress)
+
+
+def _load_codecs() -> Dict[str, Codec]:
+    # Ordered by server preference, used to break ties between
+    # equally weighted encodings in the Accept-Encoding header.
+    codecs = {}
+    for name, factory in (("zstd", _zstd_codec), ("lz4", _lz4_codec)):
+        codec = factory()
+        if codec is not None:
+            codecs[name] = codec
+    codecs["gzip"] = _gzip_codec()
+    return codecs
+
+
+CODECS = _load_codecs()
+
+
+def supported_encodings() -> List[str]:
+    """Returns the content encodings available in this environment.
+
+    ``gzip`` is always available, ``zstd`` and ``lz4`` require the optional
+    ``zstandard`` and ``lz4`` packages.
+    """
+    return list(CODECS.keys())
+
+
+def get_codec(encoding: str) -> Optional[Codec]:
+    return CODECS.get(encoding.strip().lower())
+
+
+def select_encoding(
+    accept_encoding: Optional[str], encodings: Optional[List[str]] = None
+) -> Optional[str]:
+    """Negotiates the response encoding from an ``Accept-Encoding`` header.
+
+    Args:
+        accept_encoding: Value of the ``Accept-Encoding`` request header.
+        encodings: Encodings the server is willing to use, in order of preference.
+                   Defaults to all supported encodings.
+
+    Returns:
+        The selected encoding or ``None`` if the response should not be compressed.
+    """
+    if not accept_encoding:
+        return None
+    encodings = supported_encodings() if encodings is None else encodings
+    weights = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name] = weight
+    best, best_weight = None, 0.0
+    for encoding in encodings:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def model_name_from_path(path: str) -> str:
+    match = _MODEL_PATH_REGEX.match(path)
+    return match.group(1) if match else ""
+
+
+def _timed(
+    func: Callable[[bytes], bytes], model_name: str, encoding: str, direction: str
+) -> Callable[[bytes], bytes]:
+    labels = get_compression_labels(model_name, encoding, direction)
+
+    def run(data: bytes) -> bytes:
+        with COMPRESSION_HIST_TIME.labels(**labels).time():
+            result = func(data)
+        if direction == "request":
+            compressed, uncompressed = data, result
+        else:
+            compressed, uncompressed = result, data
+        COMPRESSION_COMPRESSED_BYTES.labels(**labels).inc(len(compressed))
+        COMPRESSION_UNCOMPRESSED_BYTES.labels(**labels).inc(len(uncompressed))
+        return result
+
+    return run
+
+
+class CompressionMiddleware:
+    """ASGI middleware negotiating request and response body compression.
+
+    Request bodies with a supported ``Content-Encoding`` are decompressed before they
+    reach the endpoints, those decompressing to more than ``max_decompressed_size``
+    bytes are rejected with a 413 status. Responses are compressed with the best encoding accepted by
+    the client, but only when the body is at least ``minimum_size`` bytes. Streaming
+    responses are passed through untouched. (De)compression runs in the default
+    executor so that large tensors do not block the event loop.
+
+    Args:
+        app: The ASGI application.
+        minimum_size: Minimum response body size in bytes to be compressed.
+        encodings: Encodings to offer for responses, in order of preference.
+                   Defaults to all supported encodings.
+        max_decompressed_size: Maximum size in bytes of a decompressed request body.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = DEFAULT_COMPRESSION_MIN_SIZE,
+        encodings: Optional[List[str]] = None,
+        max_decompressed_size: int = DEFAULT_MAX_DECOMPRESSED_SIZE,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.max_decompressed_size = max_decompressed_size
+        self.encodings = (
+            supported_encodings()
+            if encodings is None
+            else [e for e in encodings if e in CODECS]
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        model_name = model_name_from_path(scope["path"])
+        content_encoding = headers.get("content-encoding", "identity").lower()
+        if content_encoding != "identity":
+            codec = get_codec(content_encoding)
+            if codec is None:
+                await _send_error(
+                    send, 415, f"Unsupported Content-Encoding: {content_encoding}"
+                )
+                return
+            body = await _read_body(receive)
+            decompress = functools.partial(
+                codec.decompress, max_size=self.max_decompressed_size
+            )
+            try:
+                body = await _run_in_executor(
+                    _timed(decompress, model_name, content_encoding, "request"),
+                    body,
+                )
+            except DecompressedSizeExceeded as e:
+                await _send_error(send, 413, str(e))
+                return
+            except Exception as e:
+                await _send_error(
+                    send, 400, f"Failed to decode {content_encoding} request body: {e}"
+                )
+                return
+            scope = dict(scope)
+            scope["headers"] = [
+                (key, value)
+                for key, value in scope["headers"]
+                if key not in (b"content-encoding", b"content-length")
+            ] + [(b"content-length", str(len(body)).encode("latin-1"))]
+            receive = _replay_body(body, receive)
+
+        encoding = select_encoding(headers.get("accept-encoding"), self.encodings)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressingResponder(send, encoding, self.minimum_size, model_name)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressingResponder:
+    def __init__(self, send: Send, encoding: str, minimum_size: int, model_name: str):
+        self._send = send
+        self._encoding = encoding
+        self._minimum_size = minimum_size
+        self._model_name = model_name
+        self._start_message: Optional[Message] = None
+        self._passthrough = False
+
+    async def send(self, message: Message) -> None:
+        if self._passthrough:
+            await self._send(message)
+            return
+        if message["type"] == "http.response.start":
+            self._start_message = message
+            return
+        if message["type"] != "http.response.body" or self._start_message is None:
+            await self._send(message)
+            return
+
+        start_message, self._start_message = self._start_message, None
+        self._passthrough = True
+        headers = MutableHeaders(raw=start_message["headers"])
+        body = message.get("body", b"")
+        if (
+            message.get("more_body", False)
+            or len(body) < self._minimum_size
+            or "content-encoding" in headers
+            or headers.get("content-type", "").startswith(_STREAMING_CONTENT_TYPES)
+        ):
+            await self._send(start_message)
+            await self._send(message)
+            return
+
+        codec = CODECS[self._encoding]
+        body = await _run_in_executor(
+            _timed(codec.compress, self._model_name, self._encoding, "response"), body
+        )
+        headers["content-encoding"] = self._encoding
+        headers["content-length"] = str(len(body))
+        headers.add_vary_header("Accept-Encoding")
+        await self._send(start_message)
+        await self._send({"type": "http.response.body", "body": body})
+
+
+async def _run_in_executor(func: Callable[[bytes], bytes], data: bytes) -> bytes:
+    return await asyncio.get_running_loop().run_in_executor(None, func, data)
+
+
+async def _read_body(receive: Receive) -> bytes:
+    chunks = []
+    more_body = True
+    while more_body:
+        message = await receive()
+        chunks.append(message.get("body", b""))
+        more_body = message.get("more_body", False)
+    return b"".join(chunks)
+
+
+def _replay_body(body: bytes, receive: Receive) -> Receive:
+    sent = False
+
+    async def replay() -> Message:
+        nonlocal sent
+        if sent:
+            return await receive()
+        sent = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    return replay
+
+
+async def _send_error(send: Send, status_code: int, reason: str) -> None:
+    content = orjson.dumps({"error": reason})
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status_code,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(content)).encode("latin-1")),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": content})
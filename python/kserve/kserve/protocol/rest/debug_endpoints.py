@@ -0,0 +1,136 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import concurrent.futures
+import threading
+from http import HTTPStatus
+
+from fastapi import APIRouter, FastAPI, HTTPException
+from fastapi.responses import PlainTextResponse
+
+from kserve.errors import InvalidInput
+from ... import profiling
+from ...constants.constants import DEBUG_ROUTE_PREFIX
+from ...logging import logger
+
+MAX_PROFILE_SECONDS = 300
+
+
+class DebugEndpoints:
+    """KServe debug endpoints, only registered when enabled on the model server.
+
+    A single profiling session, CPU or memory, runs at a time.
+    """
+
+    def __init__(self):
+        self._session_lock = threading.Lock()
+
+    def _start_session(self):
+        if not self._session_lock.acquire(blocking=False):
+            raise HTTPException(
+                status_code=HTTPStatus.CONFLICT,
+                detail="A profiling session is already running",
+            )
+
+    @staticmethod
+    def _validate(seconds: float, interval_ms: float = 1.0, limit: int = 1):
+        if not 0 < seconds <= MAX_PROFILE_SECONDS:
+            raise InvalidInput(
+                f"seconds must be between 0 and {MAX_PROFILE_SECONDS}, got {seconds}"
+            )
+        if interval_ms <= 0 or limit <= 0:
+            raise InvalidInput("interval_ms and limit must be positive")
+
+    async def profile(
+        self, seconds: float = 10, interval_ms: float = 10
+    ) -> PlainTextResponse:
+        """Samples the stacks of all the threads, including the event loop.
+
+        Args:
+            seconds (float): How long to sample for.
+            interval_ms (float): The time between two samples in milliseconds.
+
+        Returns:
+            PlainTextResponse: The samples in the collapsed stack format, which is read
+            by flamegraph.pl and speedscope.
+        """
+        self._validate(seconds, interval_ms)
+        self._start_session()
+        try:
+            logger.info(f"Profiling the CPU for {seconds}s")
+            # A dedicated thread so that a busy default executor does not delay it
+            with concurrent.futures.ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="kserve-profiler"
+            ) as executor:
+                counts = await asyncio.get_running_loop().run_in_executor(
+                    executor, profiling.sample_stacks, seconds, interval_ms / 1000
+                )
+        finally:
+            self._session_lock.release()
+        return PlainTextResponse(profiling.format_collapsed(counts))
+
+    async def stacks(self) -> PlainTextResponse:
+        """Dumps the stack of every thread and asyncio task.
+
+        Returns:
+            PlainTextResponse: The stacks as formatted by the traceback module.
+        """
+        return PlainTextResponse(profiling.dump_stacks())
+
+    async def tracemalloc(
+        self, seconds: float = 10, limit: int = 25, key_type: str = "lineno"
+    ) -> PlainTextResponse:
+        """Diffs the memory allocations over a time window.
+
+        Args:
+            seconds (float): The length of the window.
+            limit (int): The number of top differences returned.
+            key_type (str): How the allocations are grouped, ``lineno``, ``filename`` or
+                ``traceback``.
+
+        Returns:
+            PlainTextResponse: The top differences, largest first.
+        """
+        self._validate(seconds, limit=limit)
+        if key_type not in ("lineno", "filename", "traceback"):
+            raise InvalidInput(f"Unsupported key_type {key_type}")
+        self._start_session()
+        try:
+            logger.info(f"Tracing the memory allocations for {seconds}s")
+            diff = await profiling.tracemalloc_diff(
+                seconds,
+                limit=limit,
+                key_type=key_type,
+                frames=10 if key_type == "traceback" else 1,
+            )
+        finally:
+            self._session_lock.release()
+        return PlainTextResponse(diff)
+
+
+def register_debug_endpoints(app: FastAPI):
+    """Register the debug endpoints.
+
+    Args:
+        app (FastAPI): FastAPI app.
+    """
+    debug_endpoints = DebugEndpoints()
+    debug_router = APIRouter(prefix=DEBUG_ROUTE_PREFIX, tags=["Debug"])
+    debug_router.add_api_route(r"/profile", debug_endpoints.profile, methods=["GET"])
+    debug_router.add_api_route(r"/stacks", debug_endpoints.stacks, methods=["GET"])
+    debug_router.add_api_route(
+        r"/tracemalloc", debug_endpoints.tracemalloc, methods=["GET"]
+    )
+    app.include_router(debug_router)
@@ -0,0 +1,223 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Raw ASGI handlers for the v1 predict and v2 infer endpoints.
+
+The handlers read the request body, dispatch to the :class:`DataPlane` and write the
+encoded response bytes directly, skipping FastAPI routing, dependency resolution,
+pydantic validation of the request and response, and the middlewares installed
+below them. All other routes, e.g. model management and ``/docs``, are still served
+by the FastAPI application.
+"""
+
+import re
+from typing import AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple
+
+import orjson
+from starlette.responses import Response, StreamingResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from ...constants.constants import ARROW_CONTENT_TYPE
+from ...errors import (
+    InferenceError,
+    InvalidInput,
+    ModelNotFound,
+    ModelNotReady,
+    ServerNotReady,
+    UnsupportedProtocol,
+    generic_exception_handler,
+    inference_error_handler,
+    invalid_input_handler,
+    model_not_found_handler,
+    model_not_ready_handler,
+    server_not_ready_handler,
+    not_implemented_error_handler,
+    unsupported_protocol_error_handler,
+)
+from ...utils import arrow_codec, json_codec
+from ..dataplane import DataPlane
+from ..infer_type import InferRequest
+
+V1_PREDICT_PATH = re.compile(r"^/v1/models/(?P<model_name>[^/:]+):predict$")
+V2_INFER_PATH = re.compile(r"^/v2/models/(?P<model_name>[^/]+)/infer$")
+
+# Same handlers and resolution order as the exception handlers of the FastAPI app
+_EXCEPTION_HANDLERS = (
+    (InvalidInput, invalid_input_handler),
+    (InferenceError, inference_error_handler),
+    (ModelNotFound, model_not_found_handler),
+    (ModelNotReady, model_not_ready_handler),
+    (ServerNotReady, server_not_ready_handler),
+    (NotImplementedError, not_implemented_error_handler),
+    (UnsupportedProtocol, unsupported_protocol_error_handler),
+)
+
+JSON_MEDIA_TYPE = "application/json"
+
+
+def _request_headers(scope: Scope) -> Dict[str, str]:
+    return {
+        key.decode("latin-1"): value.decode("latin-1")
+        for key, value in scope["headers"]
+    }
+
+
+async def _read_body(receive: Receive) -> bytes:
+    message = await receive()
+    body = message.get("body", b"")
+    if not message.get("more_body", False):
+        return body
+    chunks = [body]
+    while message.get("more_body", False):
+        message = await receive()
+        chunks.append(message.get("body", b""))
+    return b"".join(chunks)
+
+
+async def _send_bytes(
+    send: Send,
+    body: bytes,
+    headers: Optional[Dict[str, str]],
+    media_type: Optional[str] = None,
+):
+    raw_headers = [(b"content-length", str(len(body)).encode("latin-1"))]
+    if headers:
+        raw_headers.extend(
+            (key.lower().encode("latin-1"), value.encode("latin-1"))
+            for key, value in headers.items()
+        )
+    if media_type and not (headers and "content-type" in headers):
+        raw_headers.append((b"content-type", media_type.encode("latin-1")))
+    await send({"type": "http.response.start", "status": 200, "headers": raw_headers})
+    await send({"type": "http.response.body", "body": body})
+
+
+class LeanInferenceRoutes:
+    """ASGI middleware serving the hot inference endpoints without FastAPI.
+
+    ``POST /v1/models/{model_name}:predict`` and ``POST /v2/models/{model_name}/infer``
+    are handled here, every other request is passed on to the wrapped application.
+    Responses and error bodies are the same as the ones of the FastAPI endpoints.
+
+    Args:
+        app: The wrapped ASGI application.
+        dataplane: The data plane the inference requests are dispatched to.
+    """
+
+    def __init__(self, app: ASGIApp, dataplane: DataPlane):
+        self.app = app
+        self.dataplane = dataplane
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        handler = self._match(scope)
+        if handler is None:
+            await self.app(scope, receive, send)
+            return
+        handle, model_name = handler
+        try:
+            await handle(model_name, scope, receive, send)
+        except Exception as e:
+            response = await self._handle_exception(e)
+            await response(scope, receive, send)
+
+    def _match(
+        self, scope: Scope
+    ) -> Optional[Tuple[Callable[..., Awaitable[None]], str]]:
+        if scope["type"] != "http" or scope["method"] != "POST":
+            return None
+        path = scope["path"]
+        if path.startswith("/v1/"):
+            match = V1_PREDICT_PATH.match(path)
+            if match:
+                return self.predict, match.group("model_name")
+        elif path.startswith("/v2/"):
+            match = V2_INFER_PATH.match(path)
+            if match:
+                return self.infer, match.group("model_name")
+        return None
+
+    @staticmethod
+    async def _handle_exception(exc: Exception) -> Response:
+        for exc_type, handler in _EXCEPTION_HANDLERS:
+            if isinstance(exc, exc_type):
+                return await handler(None, exc)
+        return await generic_exception_handler(None, exc)
+
+    def _check_model_ready(self, model_name: str):
+        if not self.dataplane.model_ready(model_name):
+            raise ModelNotReady(model_name)
+
+    async def predict(
+        self, model_name: str, scope: Scope, receive: Receive, send: Send
+    ):
+        """v1 predict handler, see ``V1Endpoints.predict``."""
+        self._check_model_ready(model_name)
+        body = await _read_body(receive)
+        headers = _request_headers(scope)
+        infer_request, req_attributes = self.dataplane.decode(
+            body=body, headers=headers
+        )
+        response, response_headers = await self.dataplane.infer(
+            model_name=model_name, request=infer_request, headers=headers
+        )
+        response, response_headers = self.dataplane.encode(
+            model_name=model_name,
+            response=response,
+            headers=headers,
+            req_attributes=req_attributes,
+        )
+        if isinstance(response, AsyncIterator):
+            await StreamingResponse(content=response)(scope, receive, send)
+        elif isinstance(response, (bytes, str)):
+            if isinstance(response, str):
+                response = response.encode("utf-8")
+            await _send_bytes(send, response, response_headers)
+        else:
+            await _send_bytes(
+                send, json_codec.dumps(response), response_headers, JSON_MEDIA_TYPE
+            )
+
+    async def infer(self, model_name: str, scope: Scope, receive: Receive, send: Send):
+        """v2 infer handler, see ``V2Endpoints.infer``."""
+        self._check_model_ready(model_name)
+        body = await _read_body(receive)
+        headers = _request_headers(scope)
+        content_type = headers.get("content-type", "").split(";")[0].strip()
+        if content_type == ARROW_CONTENT_TYPE:
+            infer_request = arrow_codec.decode_infer_request(
+                body, model_name=model_name
+            )
+        else:
+            try:
+                request = orjson.loads(body)
+            except orjson.JSONDecodeError as e:
+                raise InvalidInput(f"Unrecognized request format: {e}")
+            if not isinstance(request, dict):
+                raise InvalidInput("Expected a v2 inference request object")
+            infer_request = InferRequest.from_rest(model_name, request)
+        response, response_headers = await self.dataplane.infer(
+            model_name=model_name, request=infer_request, headers=headers
+        )
+        response, response_headers = self.dataplane.encode(
+            model_name=model_name,
+            response=response,
+            headers=response_headers,
+            req_attributes={},
+        )
+        if isinstance(response, bytes):
+            await _send_bytes(send, response, response_headers)
+        else:
+            await _send_bytes(
+                send, json_codec.dumps(response), response_headers, JSON_MEDIA_TYPE
+            )
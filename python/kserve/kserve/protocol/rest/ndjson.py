@@ -0,0 +1,95 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Incremental reading and writing of newline delimited JSON (NDJSON) payloads."""
+
+from typing import Any, AsyncIterator, Iterable, List
+
+import orjson
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+from ...errors import InvalidInput
+from ...utils import json_codec
+
+NDJSON_CONTENT_TYPE = "application/x-ndjson"
+
+
+async def iter_ndjson_batches(
+    chunks: AsyncIterator[bytes], batch_size: int
+) -> AsyncIterator[List[Any]]:
+    """Decodes a stream of NDJSON body chunks into batches of values.
+
+    Only the current batch and the trailing partial line are held in memory, so the
+    memory used does not depend on the size of the body. Blank lines are skipped.
+
+    Args:
+        chunks: The body chunks, e.g. ``Request.stream()``.
+        batch_size: The maximum number of values in a batch.
+
+    Yields:
+        Lists of at most ``batch_size`` decoded values, in body order.
+
+    Raises:
+        InvalidInput: If a line is not a valid JSON document.
+    """
+    buffer = bytearray()
+    batch: List[Any] = []
+    line_number = 0
+    async for chunk in chunks:
+        buffer.extend(chunk)
+        end = buffer.rfind(b"\n")
+        if end < 0:
+            continue
+        lines = bytes(buffer[:end]).split(b"\n")
+        del buffer[: end + 1]
+        for line in lines:
+            line_number += 1
+            if not line.strip():
+                continue
+            batch.append(_loads(line, line_number))
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+    if buffer.strip():
+        batch.append(_loads(bytes(buffer), line_number + 1))
+    if batch:
+        yield batch
+
+
+def _loads(line: bytes, line_number: int) -> Any:
+    try:
+        return orjson.loads(line)
+    except orjson.JSONDecodeError as e:
+        raise InvalidInput(f"Invalid JSON on line {line_number}: {e}")
+
+
+class BodyStreamingResponse(StreamingResponse):
+    """Streams a response computed while the request body is still being read.
+
+    ``StreamingResponse`` listens for the client disconnect by receiving from the request
+    channel while it streams, which consumes and drops the body chunks not read yet.
+    This response only streams, a disconnect is raised as ``ClientDisconnect`` by the
+    body stream instead.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+def dumps_lines(values: Iterable[Any]) -> bytes:
+    """Encodes values as NDJSON, one value per line."""
+    return b"".join(json_codec.dumps(value) + b"\n" for value in values)
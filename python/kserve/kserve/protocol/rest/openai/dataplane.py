@@ -12,7 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import AsyncIterator, Union, List
+from typing import Any, AsyncIterable, AsyncIterator, Dict, List, Union
 
 from fastapi import Response
 from starlette.datastructures import Headers
@@ -29,6 +29,8 @@ from kserve.protocol.rest.openai.types.openapi import (
     CreateCompletionResponse as Completion,
 )
 
+from ....constants.constants import LLM_STATS_KEY
+from ....metrics import observe_llm_stats, request_started
 from ...dataplane import DataPlane
 from .openai_model import ChatCompletionRequest, CompletionRequest, OpenAIModel
 
@@ -65,7 +67,9 @@ class OpenAIDataPlane(DataPlane):
             params=request,
             context={"headers": dict(headers), "response": response},
         )
-        return await model.create_completion(completion_request)
+        request_started(model_name)
+        completion = await model.create_completion(completion_request)
+        return _observe_llm_stats(model_name, completion_request.context, completion)
 
     async def create_chat_completion(
         self,
@@ -97,7 +101,9 @@ class OpenAIDataPlane(DataPlane):
             # We pass the response object in the context so it can be used to set response headers or a custom status code
             context={"headers": dict(headers), "response": response},
         )
-        return await model.create_chat_completion(completion_request)
+        request_started(model_name)
+        completion = await model.create_chat_completion(completion_request)
+        return _observe_llm_stats(model_name, completion_request.context, completion)
 
     async def models(self) -> List[OpenAIModel]:
         """Retrieve a list of models
@@ -110,3 +116,23 @@ class OpenAIDataPlane(DataPlane):
             for model in self.model_registry.get_models().values()
             if isinstance(model, OpenAIModel)
         ]
+
+
+def _observe_llm_stats(model_name: str, context: Dict[str, Any], completion):
+    # The token counts of streamed completions are only known once the stream ends
+    if isinstance(completion, AsyncIterable):
+        return _observe_stream_llm_stats(model_name, context, completion)
+    if LLM_STATS_KEY in context:
+        observe_llm_stats(model_name, context[LLM_STATS_KEY])
+    return completion
+
+
+async def _observe_stream_llm_stats(
+    model_name: str, context: Dict[str, Any], completion: AsyncIterable
+) -> AsyncIterator:
+    try:
+        async for chunk in completion:
+            yield chunk
+    finally:
+        if LLM_STATS_KEY in context:
+            observe_llm_stats(model_name, context[LLM_STATS_KEY])
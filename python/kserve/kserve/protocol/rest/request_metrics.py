@@ -0,0 +1,89 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import re
+from typing import Optional, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ...metrics import track_request
+from ..dataplane import DataPlane
+from .openai.endpoints import OPENAI_ROUTE_PREFIX
+
+_V1_PATH_REGEX = re.compile(r"^/v1/models/([^/:]+):")
+_V2_PATH_REGEX = re.compile(r"^/v2/models/([^/]+)/(?:versions/[^/]+/)?infer$")
+_OPENAI_PATHS = (
+    f"{OPENAI_ROUTE_PREFIX}/v1/completions",
+    f"{OPENAI_ROUTE_PREFIX}/v1/chat/completions",
+)
+
+
+class RequestMetricsMiddleware:
+    """Records the per protocol request counters, body sizes and in-flight gauges.
+
+    Only the v1, v2 and OpenAI inference routes are tracked. Model names are taken from
+    the path and only used as labels for registered models so that requests for unknown
+    models do not create new time series. The OpenAI model name is set by the data
+    plane once the request body is parsed.
+
+    Args:
+        app: The wrapped ASGI application.
+        dataplane: The data plane holding the model registry.
+    """
+
+    def __init__(self, app: ASGIApp, dataplane: DataPlane):
+        self.app = app
+        self.dataplane = dataplane
+
+    def _match(self, path: str) -> Optional[Tuple[str, Optional[str]]]:
+        if path.startswith("/v1/"):
+            match = _V1_PATH_REGEX.match(path)
+            protocol = "v1"
+        elif path.startswith("/v2/"):
+            match = _V2_PATH_REGEX.match(path)
+            protocol = "v2"
+        elif path in _OPENAI_PATHS:
+            return "openai", None
+        else:
+            return None
+        if match is None:
+            return None
+        model_name = match.group(1)
+        if self.dataplane.model_registry.get_model(model_name) is None:
+            model_name = None
+        return protocol, model_name
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        route = self._match(scope["path"]) if scope["type"] == "http" else None
+        if route is None:
+            await self.app(scope, receive, send)
+            return
+
+        with track_request(*route) as metrics:
+
+            async def receive_wrapper() -> Message:
+                message = await receive()
+                if message["type"] == "http.request":
+                    metrics.request_bytes += len(message.get("body", b""))
+                return message
+
+            async def send_wrapper(message: Message):
+                if message["type"] == "http.response.start":
+                    metrics.status = str(message["status"])
+                elif message["type"] == "http.response.body":
+                    metrics.response_bytes += len(message.get("body", b""))
+                await send(message)
+
+            metrics.status = "500"
+            await self.app(scope, receive_wrapper, send_wrapper)
@@ -13,32 +13,49 @@
 # limitations under the License.
 
 import logging
+import time
 from typing import Dict, Optional, Union
 
 import uvicorn
 from fastapi import FastAPI, Request, Response
 from fastapi.routing import APIRouter
-from prometheus_client import REGISTRY, exposition
-from timing_asgi import TimingClient, TimingMiddleware
-from timing_asgi.integrations import StarletteScopeToName
+from prometheus_client import exposition
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from kserve.constants.constants import (
+    DEFAULT_COMPRESSION_MIN_SIZE,
+    DEFAULT_MAX_DECOMPRESSED_SIZE,
+)
 from kserve.errors import (
     InferenceError,
     InvalidInput,
     ModelNotFound,
     ModelNotReady,
+    ServerNotReady,
     generic_exception_handler,
     inference_error_handler,
     invalid_input_handler,
     model_not_found_handler,
     model_not_ready_handler,
+    server_not_ready_handler,
     not_implemented_error_handler,
     UnsupportedProtocol,
     unsupported_protocol_error_handler,
 )
-from kserve.logging import trace_logger
+from kserve.logging import (
+    log_fields,
+    request_log_context,
+    trace_logger,
+    trace_sampled,
+)
+from kserve import tracing
+from kserve.metrics import metrics_registry
 from kserve.protocol.dataplane import DataPlane
 
+from .compression import CompressionMiddleware
+from .debug_endpoints import register_debug_endpoints
+from .lean_routes import LeanInferenceRoutes
+from .request_metrics import RequestMetricsMiddleware
 from .openai.config import maybe_register_openai_endpoints
 from .v1_endpoints import register_v1_endpoints
 from .v2_endpoints import register_v2_endpoints
@@ -47,12 +64,83 @@ from ..model_repository_extension import ModelRepositoryExtension
 
 async def metrics_handler(request: Request) -> Response:
     encoder, content_type = exposition.choose_encoder(request.headers.get("accept"))
-    return Response(content=encoder(REGISTRY), headers={"content-type": content_type})
+    return Response(
+        content=encoder(metrics_registry()), headers={"content-type": content_type}
+    )
+
+
+class LatencyLoggingMiddleware:
+    """Logs a single trace line per sampled HTTP request.
+
+    The line holds the method, path, status and wall time of the request together
+    with the latency fields logged by the model while handling it, see
+    :func:`kserve.logging.log_request_fields`.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status = 500
+
+        async def send_wrapper(message: Message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
 
+        start = time.perf_counter()
+        with request_log_context() as fields:
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                if trace_sampled():
+                    log_fields(
+                        trace_logger,
+                        {
+                            "method": scope["method"],
+                            "path": scope["path"],
+                            "status": status,
+                            "wall_ms": round((time.perf_counter() - start) * 1000, 3),
+                            **fields,
+                        },
+                    )
 
-class PrintTimings(TimingClient):
-    def timing(self, metric_name, timing, tags):
-        trace_logger.info(f"{metric_name}: {timing}")
+
+class TracingMiddleware:
+    """Traces each HTTP request as a server span.
+
+    The span continues the trace of the caller when the request carries a W3C
+    ``traceparent`` header, the decode, model stage and encode spans are its children.
+    Only installed when tracing is enabled, see :func:`kserve.tracing.configure_tracing`.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = {
+            key.decode("latin-1"): value.decode("latin-1")
+            for key, value in scope["headers"]
+        }
+        with tracing.server_span(
+            f"{scope['method']} {scope['path']}",
+            headers,
+            {"http.method": scope["method"], "http.target": scope["path"]},
+        ) as span:
+
+            async def send_wrapper(message: Message):
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.status_code", message["status"])
+                await send(message)
+
+            await self.app(scope, receive, send_wrapper)
 
 
 class _NoSignalUvicornServer(uvicorn.Server):
@@ -89,6 +177,7 @@ class RESTServer:
         self.app.add_exception_handler(InferenceError, inference_error_handler)
         self.app.add_exception_handler(ModelNotFound, model_not_found_handler)
         self.app.add_exception_handler(ModelNotReady, model_not_ready_handler)
+        self.app.add_exception_handler(ServerNotReady, server_not_ready_handler)
         self.app.add_exception_handler(
             NotImplementedError, not_implemented_error_handler
         )
@@ -108,15 +197,33 @@ class UvicornServer:
         log_config: Optional[Union[str, Dict]] = None,
         access_log_format: Optional[str] = None,
         workers: int = 1,
+        enable_compression: bool = False,
+        compression_min_size: int = DEFAULT_COMPRESSION_MIN_SIZE,
+        max_decompressed_size: int = DEFAULT_MAX_DECOMPRESSED_SIZE,
+        enable_lean_routes: bool = False,
+        enable_latency_logging: bool = True,
+        enable_debug_endpoints: bool = False,
     ):
         super().__init__()
         rest_server = RESTServer(app, data_plane, model_repository_extension)
         rest_server.create_application()
-        app.add_middleware(
-            TimingMiddleware,
-            client=PrintTimings(),
-            metric_namer=StarletteScopeToName(prefix="kserve.io", starlette_app=app),
-        )
+        if enable_debug_endpoints:
+            register_debug_endpoints(app)
+        if enable_lean_routes:
+            # Added first so that the other middlewares wrap it, requests served by the
+            # lean routes are still measured, logged and decompressed.
+            app.add_middleware(LeanInferenceRoutes, dataplane=data_plane)
+        app.add_middleware(RequestMetricsMiddleware, dataplane=data_plane)
+        if enable_latency_logging:
+            app.add_middleware(LatencyLoggingMiddleware)
+        if tracing.is_enabled():
+            app.add_middleware(TracingMiddleware)
+        if enable_compression:
+            app.add_middleware(
+                CompressionMiddleware,
+                minimum_size=compression_min_size,
+                max_decompressed_size=max_decompressed_size,
+            )
         self.cfg = uvicorn.Config(
             app="kserve.model_server:app",
             host="0.0.0.0",
@@ -15,12 +15,22 @@
 from typing import Optional, Union, Dict, List, AsyncIterator
 
 from fastapi import Request, Response, FastAPI, APIRouter
+from starlette.requests import ClientDisconnect
 from starlette.responses import StreamingResponse
 
-from kserve.errors import ModelNotReady
+from kserve.errors import InvalidInput, ModelNotReady
 from ..dataplane import DataPlane
 from ..model_repository_extension import ModelRepositoryExtension
-from ...constants.constants import V1_ROUTE_PREFIX
+from .ndjson import (
+    NDJSON_CONTENT_TYPE,
+    BodyStreamingResponse,
+    dumps_lines,
+    iter_ndjson_batches,
+)
+from ...constants.constants import DEFAULT_BATCH_PREDICT_SIZE, V1_ROUTE_PREFIX
+from ...logging import logger
+from ...metrics import observe_batch_size
+from ...utils import json_codec
 
 
 class V1Endpoints:
@@ -94,7 +104,82 @@ class V1Endpoints:
             return Response(content=response, headers=response_headers)
         if isinstance(response, AsyncIterator):
             return StreamingResponse(content=response)
-        return response
+        return Response(
+            content=json_codec.dumps(response),
+            media_type="application/json",
+            headers=response_headers,
+        )
+
+    async def batch_predict(
+        self,
+        model_name: str,
+        request: Request,
+        batch_size: int = DEFAULT_BATCH_PREDICT_SIZE,
+    ) -> StreamingResponse:
+        """Streaming batch predict request handler.
+
+        The request body is read incrementally as newline delimited JSON with one instance
+        per line. The model predicts ``batch_size`` instances at a time as they arrive and
+        the predictions are streamed back as newline delimited JSON with one prediction per
+        line, in request order. The server memory used does not depend on the number of
+        instances. Errors after the first batch are reported as a final ``{"error": ...}``
+        line since the response status has already been sent.
+
+        Args:
+            model_name (str): Model name.
+            request (Request): Raw request object.
+            batch_size (int): Number of instances sent to the model at a time.
+
+        Returns:
+            StreamingResponse: The predictions as newline delimited JSON.
+        """
+        model_ready = self.dataplane.model_ready(model_name)
+
+        if not model_ready:
+            raise ModelNotReady(model_name)
+        if batch_size <= 0:
+            raise InvalidInput("batch_size must be a positive integer")
+
+        headers = dict(request.headers.items())
+        # The predictions are streamed as NDJSON, not in the request content type
+        headers.pop("content-type", None)
+        batches = iter_ndjson_batches(request.stream(), batch_size)
+
+        async def predict_batch(instances: List) -> bytes:
+            observe_batch_size(model_name, len(instances))
+            response, _ = await self.dataplane.infer(
+                model_name=model_name,
+                request={"instances": instances},
+                headers=headers,
+            )
+            predictions = response["predictions"]
+            if len(predictions) != len(instances):
+                raise InvalidInput(
+                    f"Model returned {len(predictions)} predictions "
+                    f"for {len(instances)} instances"
+                )
+            return dumps_lines(predictions)
+
+        # Predict the first batch before the response starts so that invalid requests
+        # are still reported with an error status code.
+        try:
+            first_batch = await predict_batch(await batches.__anext__())
+        except StopAsyncIteration:
+            first_batch = b""
+
+        async def stream() -> AsyncIterator[bytes]:
+            yield first_batch
+            try:
+                async for instances in batches:
+                    yield await predict_batch(instances)
+            except ClientDisconnect:
+                logger.info("Client disconnected during streaming batch predict")
+            except Exception as e:
+                logger.error(f"Streaming batch predict failed: {e}", exc_info=True)
+                yield dumps_lines([{"error": str(e)}])
+
+        # The rest of the body is read while the predictions are streamed
+        return BodyStreamingResponse(stream(), media_type=NDJSON_CONTENT_TYPE)
 
     async def explain(self, model_name: str, request: Request) -> Union[Response, Dict]:
         """Explain handler.
@@ -128,7 +213,11 @@ class V1Endpoints:
 
         if not isinstance(response, dict):
             return Response(content=response, headers=response_headers)
-        return response
+        return Response(
+            content=json_codec.dumps(response),
+            media_type="application/json",
+            headers=response_headers,
+        )
 
 
 def register_v1_endpoints(
@@ -158,6 +247,12 @@ def register_v1_endpoints(
         response_model=None,
         methods=["POST"],
     )
+    v1_router.add_api_route(
+        r"/models/{model_name}:batch_predict",
+        v1_endpoints.batch_predict,
+        response_model=None,
+        methods=["POST"],
+    )
     v1_router.add_api_route(
         r"/models/{model_name}:explain",
         v1_endpoints.explain,
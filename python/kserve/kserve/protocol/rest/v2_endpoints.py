@@ -12,13 +12,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Optional, Dict
+from typing import Optional, Dict, List, Union
+
+import orjson
 
 from fastapi import FastAPI, APIRouter
 from fastapi.requests import Request
 from fastapi.responses import Response
 
-from ..infer_type import InferInput, InferRequest
+from ..infer_type import InferInput, InferRequest, RequestedOutput
 from .v2_datamodels import (
     InferenceRequest,
     ServerMetadataResponse,
@@ -31,8 +33,9 @@ from .v2_datamodels import (
 )
 from ..dataplane import DataPlane
 from ..model_repository_extension import ModelRepositoryExtension
-from ...constants.constants import V2_ROUTE_PREFIX
-from ...errors import ModelNotReady
+from ...constants.constants import ARROW_CONTENT_TYPE, V2_ROUTE_PREFIX
+from ...errors import InvalidInput, ModelNotReady, ServerNotReady
+from ...utils import arrow_codec
 
 
 class V2Endpoints:
@@ -54,22 +57,29 @@ class V2Endpoints:
         """
         return ServerMetadataResponse.parse_obj(self.dataplane.metadata())
 
-    @staticmethod
-    async def live() -> ServerLiveResponse:
+    async def live(self) -> ServerLiveResponse:
         """Server live endpoint.
 
         Returns:
             ServerLiveResponse: Server live message.
+
+        Raises:
+            ServerNotReady: Raised when the server is not live.
         """
+        await self.dataplane.live()
         return ServerLiveResponse(live=True)
 
-    @staticmethod
-    async def ready() -> ServerReadyResponse:
+    async def ready(self) -> ServerReadyResponse:
         """Server ready endpoint.
 
         Returns:
             ServerReadyResponse: Server ready message.
+
+        Raises:
+            ServerNotReady: Raised when the server is overloaded.
         """
+        if not await self.dataplane.ready():
+            raise ServerNotReady("Model server is not ready, it is overloaded.")
         return ServerReadyResponse(ready=True)
 
     async def models(self) -> ListModelsResponse:
@@ -128,20 +138,22 @@ class V2Endpoints:
         raw_request: Request,
         raw_response: Response,
         model_name: str,
-        request_body: InferenceRequest,
+        request_body: Union[InferenceRequest, bytes],
         model_version: Optional[str] = None,
-    ) -> InferenceResponse:
+    ) -> Union[InferenceResponse, Response]:
         """Infer handler.
 
         Args:
             raw_request (Request): fastapi request object,
             raw_response (Response): fastapi response object,
             model_name (str): Model name.
-            request_body (InferenceRequest): Inference request body.
+            request_body (InferenceRequest|bytes): Inference request body, or the raw body
+                for ``application/vnd.apache.arrow.stream`` requests.
             model_version (Optional[str]): Model version (optional).
 
         Returns:
-            InferenceResponse: Inference response object.
+            InferenceResponse|Response: Inference response object, or an Arrow IPC stream
+                response when requested through the ``Accept`` header.
         """
         # TODO: support model_version
         if model_version:
@@ -153,22 +165,37 @@ class V2Endpoints:
             raise ModelNotReady(model_name)
 
         request_headers = dict(raw_request.headers)
-        infer_inputs = [
-            InferInput(
-                name=input.name,
-                shape=input.shape,
-                datatype=input.datatype,
-                data=input.data,
-                parameters={} if input.parameters is None else input.parameters,
+        if isinstance(request_body, bytes):
+            content_type = request_headers.get("content-type", "")
+            if content_type.split(";")[0].strip() != ARROW_CONTENT_TYPE:
+                raise InvalidInput(f"Unsupported content type '{content_type}'")
+            infer_request = arrow_codec.decode_infer_request(
+                request_body, model_name=model_name
+            )
+        else:
+            infer_inputs = [
+                InferInput(
+                    name=input.name,
+                    shape=input.shape,
+                    datatype=input.datatype,
+                    data=input.data,
+                    parameters={} if input.parameters is None else input.parameters,
+                )
+                for input in request_body.inputs
+            ]
+            request_outputs = None
+            if request_body.outputs:
+                request_outputs = [
+                    RequestedOutput(name=output.name, parameters=output.parameters)
+                    for output in request_body.outputs
+                ]
+            infer_request = InferRequest(
+                request_id=request_body.id,
+                model_name=model_name,
+                infer_inputs=infer_inputs,
+                parameters=request_body.parameters,
+                request_outputs=request_outputs,
             )
-            for input in request_body.inputs
-        ]
-        infer_request = InferRequest(
-            request_id=request_body.id,
-            model_name=model_name,
-            infer_inputs=infer_inputs,
-            parameters=request_body.parameters,
-        )
         response, response_headers = await self.dataplane.infer(
             model_name=model_name, request=infer_request, headers=request_headers
         )
@@ -180,6 +207,8 @@ class V2Endpoints:
             req_attributes={},
         )
 
+        if isinstance(response, bytes):
+            return Response(content=response, headers=response_headers)
         if response_headers:
             raw_response.headers.update(response_headers)
         res = InferenceResponse.parse_obj(response)
@@ -197,6 +226,23 @@ class V2Endpoints:
         await self.model_repository_extension.load(model_name)
         return {"name": model_name, "load": True}
 
+    async def index(self, request: Request) -> List[Dict]:
+        """Model repository index handler.
+
+        Args:
+            request (Request): Request with an optional ``{"ready": true}`` JSON body to list
+                               only the ready models.
+
+        Returns:
+            List[Dict]: The name, state and resource usage of every model.
+        """
+        body = await request.body()
+        try:
+            ready = bool(orjson.loads(body).get("ready", False)) if body else False
+        except (orjson.JSONDecodeError, AttributeError) as e:
+            raise InvalidInput(f"Unrecognized request format: {e}")
+        return self.model_repository_extension.index(filter_ready=ready)
+
     async def unload(self, model_name: str) -> Dict:
         """Model unload handler.
 
@@ -288,6 +334,7 @@ def register_v2_endpoints(
         methods=["POST"],
         include_in_schema=False,
     )
+    v2_router.add_api_route(r"/repository/index", v2_endpoints.index, methods=["POST"])
     v2_router.add_api_route(
         r"/repository/models/{model_name}/load", v2_endpoints.load, methods=["POST"]
     )
@@ -0,0 +1,212 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Samples the inference requests received by the data plane to local files.
+
+Every recorded request is one JSON line holding its arrival time, model, protocol,
+verb, headers, body, latency and error, see :class:`RequestRecorder`. The files are
+replayed against a server with ``python -m kserve.benchmark.replay``.
+"""
+
+import contextlib
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import time
+from typing import Dict, Iterator, List, Optional, Sequence, Union
+
+import orjson
+
+from .logging import logger
+from .protocol.infer_type import InferInput, InferRequest, to_http_parameters
+
+DEFAULT_REDACTED_HEADERS = (
+    "authorization",
+    "proxy-authorization",
+    "cookie",
+    "x-api-key",
+)
+REDACTED = "<redacted>"
+# The bodies are recorded decoded and replayed as JSON, the original encoding headers
+# would not match them.
+_DROPPED_HEADERS = frozenset(
+    ["content-length", "content-type", "content-encoding", "host", "transfer-encoding"]
+)
+
+
+def request_protocol(request: Union[Dict, InferRequest]) -> str:
+    if isinstance(request, InferRequest):
+        return "grpc" if request.from_grpc else "v2"
+    return "v1"
+
+
+def _tensor_data(infer_input: InferInput) -> List:
+    # Decodes binary and gRPC raw inputs, without changing the input like to_rest does
+    data = infer_input.as_numpy().flatten().tolist()
+    if infer_input.datatype == "BYTES":
+        data = [
+            value.decode("utf-8", "replace") if isinstance(value, bytes) else value
+            for value in data
+        ]
+    return data
+
+
+def _v2_body(request: InferRequest) -> Dict:
+    body = {
+        "id": request.id,
+        "inputs": [
+            {
+                "name": infer_input.name,
+                "shape": list(infer_input.shape),
+                "datatype": infer_input.datatype,
+                "data": _tensor_data(infer_input),
+                **(
+                    {"parameters": to_http_parameters(infer_input.parameters)}
+                    if infer_input.parameters
+                    else {}
+                ),
+            }
+            for infer_input in request.inputs
+        ],
+    }
+    if request.parameters:
+        body["parameters"] = to_http_parameters(request.parameters)
+    if request.request_outputs:
+        body["outputs"] = [{"name": output.name} for output in request.request_outputs]
+    return body
+
+
+class RequestRecorder:
+    """Writes a sample of the inference requests to rotating JSON lines files.
+
+    The requests are serialized when they are received, before the model can modify
+    them, and written to the files from a background thread.
+
+    Args:
+        path: The file the requests are written to, rotated files get a numeric suffix.
+        sample_rate: The fraction of the requests which are recorded.
+        max_bytes: The size of a file from which it is rotated.
+        backup_count: The number of rotated files kept.
+        redact_headers: The names of the headers whose value is replaced with
+                        ``<redacted>``.
+        record_bodies: Whether to record the request bodies, only the metadata and
+                       headers of the requests are recorded otherwise.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        sample_rate: float = 1.0,
+        max_bytes: int = 100 * 1024 * 1024,
+        backup_count: int = 5,
+        redact_headers: Sequence[str] = DEFAULT_REDACTED_HEADERS,
+        record_bodies: bool = True,
+    ):
+        if not 0 <= sample_rate <= 1:
+            raise ValueError(f"sample_rate must be between 0 and 1, got {sample_rate}")
+        self.path = path
+        self.sample_rate = sample_rate
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.redact_headers = frozenset(name.lower() for name in redact_headers)
+        self.record_bodies = record_bodies
+        self._pid = None
+        self._handler = None
+        self._listener = None
+        # Not registered with the logging module so that records are never propagated
+        self._logger = logging.Logger("kserve.recorder")
+
+    def _start(self):
+        # Started in the process recording the requests, the writer thread does not
+        # survive a fork. Worker processes write to their own files.
+        path = self.path
+        if self._pid is not None:
+            self._logger.handlers.clear()
+            path = f"{self.path}.{os.getpid()}"
+        self._pid = os.getpid()
+        self._handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=self.max_bytes, backupCount=self.backup_count, delay=True
+        )
+        records = queue.SimpleQueue()
+        self._listener = logging.handlers.QueueListener(records, self._handler)
+        self._logger.addHandler(logging.handlers.QueueHandler(records))
+        self._listener.start()
+
+    def sampled(self) -> bool:
+        return self.sample_rate >= 1 or random.random() < self.sample_rate
+
+    def _headers(self, headers: Optional[Dict[str, str]]) -> Dict[str, str]:
+        return {
+            name: REDACTED if name.lower() in self.redact_headers else value
+            for name, value in (headers or {}).items()
+            if name.lower() not in _DROPPED_HEADERS
+        }
+
+    def _body(self, request: Union[Dict, InferRequest]):
+        if not self.record_bodies:
+            return None
+        if isinstance(request, InferRequest):
+            return _v2_body(request)
+        try:
+            # Serialized now as the model may modify the request
+            return orjson.loads(
+                orjson.dumps(request, option=orjson.OPT_SERIALIZE_NUMPY)
+            )
+        except TypeError as e:
+            logger.warning(f"Request body of type {type(request)} not recorded: {e}")
+            return None
+
+    @contextlib.contextmanager
+    def record(
+        self,
+        model_name: str,
+        request: Union[Dict, InferRequest],
+        headers: Optional[Dict[str, str]] = None,
+        verb: str = "predict",
+    ) -> Iterator[None]:
+        """Records the request handled within the context."""
+        if self._pid != os.getpid():
+            self._start()
+        entry = {
+            "time": time.time(),
+            "model": model_name,
+            "protocol": request_protocol(request),
+            "verb": verb,
+            "headers": self._headers(headers),
+            "body": self._body(request),
+        }
+        start = time.perf_counter()
+        error = None
+        try:
+            yield
+        except BaseException as e:
+            error = type(e).__name__
+            raise
+        finally:
+            entry["latency_ms"] = round((time.perf_counter() - start) * 1000, 3)
+            entry["error"] = error
+            self._logger.info(
+                orjson.dumps(entry, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+            )
+
+    def close(self):
+        """Writes the pending requests and closes the file."""
+        if self._pid != os.getpid():
+            return
+        self._listener.stop()
+        self._handler.close()
+        self._logger.handlers.clear()
+        self._pid = None
@@ -0,0 +1,141 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Plans the thread pools of the model server from the CPUs it is allowed to use.
+
+Without a plan every worker process sizes its pools from the host core count, and
+the numerical libraries (OpenMP, BLAS, PyTorch, XGBoost, LightGBM) each start one
+thread per core, so that a container limited to a few CPUs runs many times more
+compute threads than it has CPUs and is throttled.
+"""
+
+import os
+import sys
+from typing import NamedTuple, Optional
+
+from .logging import logger
+from .metrics import CPU_LIMIT, THREAD_BUDGET
+from .utils import utils
+
+# Read by the native libraries when they are loaded, also by the worker processes
+NATIVE_THREADS_ENV = (
+    "OMP_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "VECLIB_MAXIMUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+)
+DEFAULT_GRPC_THREADS = 4
+MAX_ASYNCIO_WORKERS = 32
+
+
+class ThreadBudget(NamedTuple):
+    """The threads of every model server process.
+
+    Args:
+        cpus: The CPUs available to the model server, the minimum of the host cores,
+              the CPU affinity and the cgroup limit.
+        workers: The number of model server processes sharing the CPUs.
+        native_threads: The intra-op threads of the numerical libraries per process.
+        asyncio_workers: The threads of the default asyncio executor per process.
+        grpc_threads: The threads of the gRPC server per process.
+    """
+
+    cpus: int
+    workers: int
+    native_threads: int
+    asyncio_workers: int
+    grpc_threads: int
+
+
+def _env_native_threads() -> Optional[int]:
+    try:
+        threads = int(os.environ.get("OMP_NUM_THREADS", ""))
+    except ValueError:
+        return None
+    return threads if threads > 0 else None
+
+
+def plan_thread_budget(
+    workers: int = 1,
+    max_asyncio_workers: Optional[int] = None,
+    max_threads: int = DEFAULT_GRPC_THREADS,
+    cpus: Optional[int] = None,
+) -> ThreadBudget:
+    """Divides the available CPUs among the model server processes and their pools.
+
+    Every process gets an equal share of the CPUs for the native threads of its model,
+    unless ``OMP_NUM_THREADS`` is set. The asyncio executor mostly runs short or
+    blocking I/O tasks and gets a few more threads than the share, as the default
+    executor of Python does.
+
+    Args:
+        workers: The number of model server processes.
+        max_asyncio_workers: The threads of the asyncio executor, planned if not set.
+        max_threads: The threads of the gRPC server.
+        cpus: The CPUs available, ``utils.cpu_count()`` if not set.
+
+    Returns:
+        The planned threads per process.
+    """
+    cpus = utils.cpu_count() if cpus is None else cpus
+    workers = max(1, workers)
+    share = max(1, cpus // workers)
+    return ThreadBudget(
+        cpus=cpus,
+        workers=workers,
+        native_threads=_env_native_threads() or share,
+        # Formula as suggested in https://bugs.python.org/issue35279
+        asyncio_workers=(
+            max_asyncio_workers
+            if max_asyncio_workers is not None
+            else min(MAX_ASYNCIO_WORKERS, share + 4)
+        ),
+        grpc_threads=max_threads,
+    )
+
+
+def _limit_native_threads(threads: int):
+    for name in NATIVE_THREADS_ENV:
+        os.environ.setdefault(name, str(threads))
+    # The libraries already loaded read the environment variables at load time
+    try:
+        from threadpoolctl import threadpool_limits
+
+        threadpool_limits(limits=threads)
+    except ImportError:
+        pass
+    torch = sys.modules.get("torch")
+    if torch is not None:
+        torch.set_num_threads(threads)
+
+
+def apply_thread_budget(budget: ThreadBudget):
+    """Limits the native threads of this process and exposes the budget.
+
+    The native libraries loaded later and the worker processes started later read the
+    limit from the ``OMP_NUM_THREADS`` family of environment variables, explicitly set
+    ones are kept. The libraries already loaded are limited with ``threadpoolctl`` if it
+    is installed, and PyTorch with ``torch.set_num_threads``.
+    """
+    _limit_native_threads(budget.native_threads)
+    CPU_LIMIT.set(budget.cpus)
+    THREAD_BUDGET.labels("native").set(budget.native_threads)
+    THREAD_BUDGET.labels("asyncio").set(budget.asyncio_workers)
+    THREAD_BUDGET.labels("grpc").set(budget.grpc_threads)
+    logger.info(
+        f"Thread budget for {budget.cpus} CPUs and {budget.workers} worker processes: "
+        f"{budget.native_threads} native, {budget.asyncio_workers} asyncio and "
+        f"{budget.grpc_threads} gRPC threads per process"
+    )
@@ -0,0 +1,228 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Optional OpenTelemetry tracing of the inference path.
+
+Tracing is disabled until :func:`configure_tracing` is called, the helpers below then
+return no-op context managers so that the instrumented code does not pay for it. The
+``opentelemetry-sdk`` package, and ``opentelemetry-exporter-otlp`` for the OTLP exporter,
+are only imported when tracing is configured. Trace context is propagated between
+servers with the W3C ``traceparent`` and ``tracestate`` headers.
+"""
+
+import atexit
+import contextlib
+import functools
+from typing import (
+    Any,
+    Callable,
+    ContextManager,
+    Dict,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from .logging import logger
+
+TRACING_EXPORTERS = ["none", "otlp", "file"]
+DEFAULT_SERVICE_NAME = "kserve"
+
+# OpenTelemetry tracer, None when tracing is disabled
+_tracer = None
+_provider = None
+# File the spans are written to by the file exporter, closed on shutdown
+_span_file = None
+_NOOP = contextlib.nullcontext()
+
+
+def configure_tracing(
+    exporter: str = "otlp",
+    endpoint: Optional[str] = None,
+    file_path: Optional[str] = None,
+    service_name: str = DEFAULT_SERVICE_NAME,
+    sample_rate: float = 1.0,
+):
+    """Enables tracing and configures where the spans are exported.
+
+    Args:
+        exporter: ``otlp`` to export to an OpenTelemetry collector over gRPC, ``file`` to
+                  write one JSON span per line to ``file_path`` or ``none`` to disable
+                  tracing.
+        endpoint: The OTLP endpoint, e.g. ``http://otel-collector:4317``. Defaults to the
+                  ``OTEL_EXPORTER_OTLP_ENDPOINT`` environment variable.
+        file_path: The file the spans are appended to with the ``file`` exporter.
+        service_name: The ``service.name`` resource attribute of the spans.
+        sample_rate: The fraction of traces started by this server which are sampled,
+                     the decision of the caller is followed for propagated traces.
+
+    Raises:
+        ValueError: If the exporter is not supported or the file path is missing.
+        RuntimeError: If the OpenTelemetry packages are not installed.
+    """
+    global _tracer, _provider, _span_file
+    if exporter == "none":
+        return
+    if exporter not in TRACING_EXPORTERS:
+        raise ValueError(
+            f"Unsupported tracing exporter {exporter}, expected one of {TRACING_EXPORTERS}"
+        )
+    try:
+        from opentelemetry import trace
+        from opentelemetry.sdk.resources import SERVICE_NAME, Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+        from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+    except ImportError:
+        raise RuntimeError(
+            "Tracing requires the 'opentelemetry-sdk' package to be installed"
+        )
+
+    if exporter == "otlp":
+        try:
+            from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import (
+                OTLPSpanExporter,
+            )
+        except ImportError:
+            raise RuntimeError(
+                "The otlp tracing exporter requires the 'opentelemetry-exporter-otlp' "
+                "package to be installed"
+            )
+        span_exporter = OTLPSpanExporter(endpoint=endpoint)
+    else:
+        if file_path is None:
+            raise ValueError("The file tracing exporter requires a file path")
+        from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+
+        _span_file = open(file_path, "a")
+        span_exporter = ConsoleSpanExporter(
+            out=_span_file,
+            formatter=lambda span: span.to_json(indent=None) + "\n",
+        )
+
+    _provider = TracerProvider(
+        resource=Resource.create({SERVICE_NAME: service_name}),
+        sampler=ParentBased(TraceIdRatioBased(sample_rate)),
+    )
+    # Spans are exported in batches from a background thread
+    _provider.add_span_processor(BatchSpanProcessor(span_exporter))
+    _tracer = trace.get_tracer("kserve", tracer_provider=_provider)
+    atexit.register(shutdown_tracing)
+    logger.info(f"Exporting traces with the {exporter} exporter")
+
+
+def shutdown_tracing():
+    """Flushes the pending spans and disables tracing."""
+    global _tracer, _provider, _span_file
+    if _provider is not None:
+        _provider.shutdown()
+    if _span_file is not None:
+        _span_file.close()
+    _tracer = None
+    _provider = None
+    _span_file = None
+
+
+def is_enabled() -> bool:
+    return _tracer is not None
+
+
+def _clean(attributes: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    # OpenTelemetry rejects None attribute values
+    if attributes is None:
+        return None
+    return {key: value for key, value in attributes.items() if value is not None}
+
+
+def span(name: str, attributes: Optional[Dict[str, Any]] = None) -> ContextManager:
+    """Returns a context manager tracing a span of the current trace."""
+    if _tracer is None:
+        return _NOOP
+    return _tracer.start_as_current_span(name, attributes=_clean(attributes))
+
+
+def traced(name: str) -> Callable:
+    """Decorator tracing each call of a synchronous function as a span."""
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _tracer is None:
+                return func(*args, **kwargs)
+            with _tracer.start_as_current_span(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def server_span(
+    name: str,
+    headers: Optional[Mapping[str, str]],
+    attributes: Optional[Dict[str, Any]] = None,
+) -> ContextManager:
+    """Returns a context manager tracing a request received by the server.
+
+    The span continues the trace of the caller when the request headers carry a
+    ``traceparent``, otherwise a new trace is started.
+    """
+    if _tracer is None:
+        return _NOOP
+    from opentelemetry import propagate
+    from opentelemetry.trace import SpanKind
+
+    return _tracer.start_as_current_span(
+        name,
+        context=propagate.extract(headers or {}),
+        kind=SpanKind.SERVER,
+        attributes=_clean(attributes),
+    )
+
+
+def client_span(name: str, attributes: Optional[Dict[str, Any]] = None):
+    """Returns a context manager tracing a call to another server.
+
+    Use :func:`inject_headers` within it to propagate the trace to the server.
+    """
+    if _tracer is None:
+        return _NOOP
+    from opentelemetry.trace import SpanKind
+
+    return _tracer.start_as_current_span(
+        name, kind=SpanKind.CLIENT, attributes=_clean(attributes)
+    )
+
+
+def inject_headers(headers: Optional[Mapping[str, str]]) -> Optional[Dict[str, str]]:
+    """Adds the trace context headers of the current span to the HTTP headers."""
+    if _tracer is None:
+        return headers
+    from opentelemetry import propagate
+
+    headers = dict(headers) if headers is not None else {}
+    propagate.inject(headers)
+    return headers
+
+
+def inject_metadata(metadata: Optional[Sequence[Tuple[str, str]]]):
+    """Adds the trace context of the current span to the gRPC metadata."""
+    if _tracer is None:
+        return metadata
+    from opentelemetry import propagate
+
+    carrier = {}
+    propagate.inject(carrier)
+    return tuple(metadata or ()) + tuple(carrier.items())
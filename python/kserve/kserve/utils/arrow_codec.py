@@ -0,0 +1,212 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Apache Arrow IPC stream codec for tabular inference payloads.
+
+``pyarrow`` is an optional dependency, it is imported lazily so that servers which
+never receive Arrow payloads do not need to install it.
+"""
+
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from ..errors import InvalidInput
+from ..protocol.infer_type import InferInput, InferRequest, InferResponse
+from .numpy_codec import from_np_dtype
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise InvalidInput(
+            "Apache Arrow payloads require the 'pyarrow' package to be installed"
+        )
+    return pyarrow
+
+
+def is_available() -> bool:
+    """Returns whether Arrow payloads can be encoded in this environment."""
+    try:
+        _import_pyarrow()
+    except InvalidInput:
+        return False
+    return True
+
+
+def _read_table(body: bytes):
+    pa = _import_pyarrow()
+    try:
+        with pa.ipc.open_stream(pa.py_buffer(body)) as reader:
+            return reader.read_all()
+    except pa.ArrowInvalid as e:
+        raise InvalidInput(f"Failed to decode Arrow IPC stream: {e}")
+
+
+def _write_table(table) -> bytes:
+    pa = _import_pyarrow()
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def _column_to_numpy(column) -> np.ndarray:
+    """Converts an Arrow column to a numpy array without copying where possible.
+
+    Fixed size list columns are unpacked into the trailing dimensions of the array.
+    """
+    pa = _import_pyarrow()
+    array = column.chunk(0) if column.num_chunks == 1 else column.combine_chunks()
+    shape = [len(array)]
+    while pa.types.is_fixed_size_list(array.type):
+        shape.append(array.type.list_size)
+        array = array.flatten()
+    if (
+        pa.types.is_string(array.type)
+        or pa.types.is_large_string(array.type)
+        or pa.types.is_binary(array.type)
+        or pa.types.is_large_binary(array.type)
+    ):
+        values = np.array(array.to_pylist(), dtype=np.object_)
+    else:
+        # Zero-copy for primitive types without nulls.
+        values = array.to_numpy(zero_copy_only=False)
+    return values.reshape(shape)
+
+
+def _numpy_to_arrow(values: np.ndarray):
+    pa = _import_pyarrow()
+    if values.ndim == 0:
+        values = values.reshape(1)
+    array = pa.array(values.reshape(-1))
+    for dim in reversed(values.shape[1:]):
+        array = pa.FixedSizeListArray.from_arrays(array, dim)
+    return array
+
+
+def decode_dataframe(body: bytes) -> pd.DataFrame:
+    """Decodes an Arrow IPC stream into a pandas DataFrame.
+
+    Each column is kept in its own block so that numeric columns without nulls are
+    not copied.
+
+    Args:
+        body: The Arrow IPC stream.
+
+    Returns:
+        The decoded DataFrame.
+    """
+    return _read_table(body).to_pandas(split_blocks=True)
+
+
+def decode_infer_request(
+    body: bytes, model_name: str, request_id: Optional[str] = None
+) -> InferRequest:
+    """Decodes an Arrow IPC stream into an InferRequest with one input per column.
+
+    When all columns are one dimensional the request is marked with the ``pd``
+    content type so that the framework servers decode it as a DataFrame.
+
+    Args:
+        body: The Arrow IPC stream.
+        model_name: The model name.
+        request_id: The id for the inference request.
+
+    Returns:
+        The decoded InferRequest.
+    """
+    table = _read_table(body)
+    infer_inputs = []
+    for name, column in zip(table.column_names, table.columns):
+        values = _column_to_numpy(column)
+        datatype = from_np_dtype(values.dtype)
+        if datatype is None:
+            raise InvalidInput(f"Unsupported Arrow type {column.type} for '{name}'")
+        infer_inputs.append(
+            InferInput(
+                name=name, shape=list(values.shape), datatype=datatype, data=values
+            )
+        )
+    parameters = None
+    if infer_inputs and all(len(i.shape) == 1 for i in infer_inputs):
+        parameters = {"content_type": "pd"}
+    return InferRequest(
+        model_name=model_name,
+        infer_inputs=infer_inputs,
+        request_id=request_id,
+        parameters=parameters,
+    )
+
+
+def encode_predictions(predictions: Any) -> bytes:
+    """Encodes v1 predictions as an Arrow IPC stream.
+
+    DataFrames and lists of records keep their columns, other predictions are
+    returned in a single ``predictions`` column.
+
+    Args:
+        predictions: The ``predictions`` of a v1 response.
+
+    Returns:
+        The Arrow IPC stream.
+    """
+    pa = _import_pyarrow()
+    if isinstance(predictions, pd.DataFrame):
+        table = pa.Table.from_pandas(predictions, preserve_index=False)
+    elif (
+        isinstance(predictions, list)
+        and len(predictions) > 0
+        and isinstance(predictions[0], Dict)
+    ):
+        table = pa.Table.from_pylist(predictions)
+    else:
+        table = pa.table({"predictions": _numpy_to_arrow(np.asarray(predictions))})
+    return _write_table(table)
+
+
+def encode_infer_response(response: InferResponse) -> bytes:
+    """Encodes an InferResponse as an Arrow IPC stream with one column per output.
+
+    The first dimension of every output is used as the row dimension, the remaining
+    dimensions are encoded as fixed size lists.
+
+    Args:
+        response: The inference response.
+
+    Returns:
+        The Arrow IPC stream.
+
+    Raises:
+        InvalidInput: If the outputs do not share the same first dimension.
+    """
+    pa = _import_pyarrow()
+    columns: Dict[str, Any] = {}
+    num_rows: List[int] = []
+    for output in response.outputs:
+        values = output.as_numpy()
+        if values.ndim == 0:
+            values = values.reshape(1)
+        num_rows.append(values.shape[0])
+        columns[output.name] = _numpy_to_arrow(values)
+    if len(set(num_rows)) > 1:
+        raise InvalidInput(
+            "Outputs with different first dimensions can not be encoded as an Arrow table"
+        )
+    metadata = {"model_name": response.model_name}
+    if response.id:
+        metadata["id"] = response.id
+    return _write_table(pa.table(columns, metadata=metadata))
@@ -0,0 +1,47 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Any
+
+import numpy as np
+import orjson
+from fastapi.encoders import jsonable_encoder
+
+_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, np.ndarray):
+        # Arrays with dtypes or memory layouts orjson does not serialize natively.
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    return jsonable_encoder(obj)
+
+
+def dumps(obj: Any) -> bytes:
+    """Encodes a response as JSON with orjson.
+
+    Numpy arrays are serialized natively without converting them to Python lists
+    first. Unlike returning the dict from the endpoint, the response does not go
+    through FastAPI's ``jsonable_encoder`` which walks every element in Python, only
+    the objects orjson can not serialize are passed to it.
+
+    Args:
+        obj: The response to encode.
+
+    Returns:
+        The JSON document.
+    """
+    return orjson.dumps(obj, default=_default, option=_OPTIONS)
@@ -0,0 +1,120 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""MessagePack codec for v1 protocol payloads.
+
+Numeric numpy arrays are packed as a MessagePack extension type holding the dtype,
+the shape and the raw array buffer, so they round trip without being converted to
+lists of Python numbers. ``msgpack`` is an optional dependency, it is imported lazily
+so that servers which never receive MessagePack payloads do not need to install it.
+"""
+
+from typing import Any
+
+import numpy as np
+
+from ..errors import InvalidInput
+
+# Extension type code used for numpy arrays
+NDARRAY_EXT_TYPE = 1
+
+# Numpy dtype kinds which are packed as raw buffers: bool, integers, floats, complex
+_BUFFER_KINDS = "biufc"
+
+
+def _import_msgpack():
+    try:
+        import msgpack
+    except ImportError:
+        raise InvalidInput(
+            "MessagePack payloads require the 'msgpack' package to be installed"
+        )
+    return msgpack
+
+
+def is_available() -> bool:
+    """Returns whether MessagePack payloads can be encoded in this environment."""
+    try:
+        _import_msgpack()
+    except InvalidInput:
+        return False
+    return True
+
+
+def _default(obj: Any) -> Any:
+    msgpack = _import_msgpack()
+    if isinstance(obj, np.ndarray):
+        if obj.dtype.kind not in _BUFFER_KINDS:
+            return obj.tolist()
+        header = msgpack.packb([obj.dtype.str, list(obj.shape)])
+        return msgpack.ExtType(
+            NDARRAY_EXT_TYPE, header + np.ascontiguousarray(obj).tobytes()
+        )
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not serializable")
+
+
+def _ext_hook(code: int, data: bytes) -> Any:
+    msgpack = _import_msgpack()
+    if code != NDARRAY_EXT_TYPE:
+        return msgpack.ExtType(code, data)
+    unpacker = msgpack.Unpacker()
+    unpacker.feed(data)
+    try:
+        dtype, shape = unpacker.unpack()
+        offset = unpacker.tell()
+        # Copy so that the array is writable and does not keep the request body alive
+        return (
+            np.frombuffer(data, dtype=np.dtype(dtype), offset=offset)
+            .reshape(shape)
+            .copy()
+        )
+    # A truncated header raises OutOfData, which is not a ValueError
+    except (msgpack.UnpackException, ValueError, TypeError) as e:
+        raise InvalidInput(f"Invalid numpy array extension: {e}")
+
+
+def dumps(obj: Any) -> bytes:
+    """Encodes a payload as MessagePack.
+
+    Args:
+        obj: The payload to encode, numeric numpy arrays are packed as extension types.
+
+    Returns:
+        The MessagePack document.
+    """
+    msgpack = _import_msgpack()
+    return msgpack.packb(obj, default=_default, use_bin_type=True)
+
+
+def loads(body: bytes) -> Any:
+    """Decodes a MessagePack payload.
+
+    Args:
+        body: The MessagePack document.
+
+    Returns:
+        The decoded payload, numpy array extension types are returned as ``np.ndarray``.
+
+    Raises:
+        InvalidInput: If the body is not a valid MessagePack document.
+    """
+    msgpack = _import_msgpack()
+    try:
+        return msgpack.unpackb(
+            body, ext_hook=_ext_hook, raw=False, strict_map_key=False
+        )
+    except (msgpack.UnpackException, ValueError, TypeError) as e:
+        raise InvalidInput(f"Failed to decode MessagePack payload: {e}")
@@ -14,8 +14,27 @@
 
 import numpy as np
 
+from ..errors import InvalidInput
+
+
+def bfloat16_dtype() -> np.dtype:
+    """Returns the numpy bfloat16 dtype provided by the optional ``ml_dtypes`` package.
+
+    Raises:
+        InvalidInput: If ``ml_dtypes`` is not installed.
+    """
+    try:
+        import ml_dtypes
+    except ImportError:
+        raise InvalidInput(
+            "BF16 tensors require the 'ml_dtypes' package to be installed"
+        )
+    return np.dtype(ml_dtypes.bfloat16)
+
 
 def to_np_dtype(dtype):
+    if dtype == "BF16":
+        return bfloat16_dtype()
     dtype_map = {
         "BOOL": bool,
         "INT8": np.int8,
@@ -61,4 +80,6 @@ def from_np_dtype(np_dtype):
         return "FP64"
     elif np_dtype == np.object_ or np_dtype.type == np.bytes_:
         return "BYTES"
+    elif getattr(np_dtype, "name", None) == "bfloat16":
+        return "BF16"
     return None
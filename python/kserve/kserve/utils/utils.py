@@ -12,12 +12,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import itertools
 import os
 import sys
 import uuid
 
 from kserve.protocol.grpc.grpc_predict_v2_pb2 import InferParameter
-from typing import Dict, Union, List
+from typing import Dict, List, Optional, Union
 
 from kserve.utils.numpy_codec import from_np_dtype
 import pandas as pd
@@ -54,12 +55,45 @@ def get_ig_namespace(inferencegraph):
     return inferencegraph.metadata.namespace or get_default_target_namespace()
 
 
+CGROUP_V2_CPU_MAX = "/sys/fs/cgroup/cpu.max"
+CGROUP_V1_CPU_QUOTA = "/sys/fs/cgroup/cpu,cpuacct/cpu.cfs_quota_us"
+CGROUP_V1_CPU_PERIOD = "/sys/fs/cgroup/cpu,cpuacct/cpu.cfs_period_us"
+
+
+def cgroup_cpu_limit() -> Optional[float]:
+    """Get the CPU limit of the cgroup of this process, None if it is not limited.
+
+    Reads the cgroup v2 ``cpu.max`` quota and period, or the cgroup v1 CFS quota and
+    period.
+    """
+    if sys.platform != "linux":
+        return None
+    try:
+        with open(CGROUP_V2_CPU_MAX) as f:
+            quota, period = f.read().split()
+        if quota == "max":
+            return None
+        return int(quota) / int(period)
+    except Exception:
+        pass
+    try:
+        with open(CGROUP_V1_CPU_QUOTA) as f:
+            quota = int(f.read())
+        with open(CGROUP_V1_CPU_PERIOD) as f:
+            period = int(f.read())
+        if quota > 0 and period > 0:
+            return quota / period
+    except Exception:
+        pass
+    return None
+
+
 def cpu_count():
     """Get the available CPU count for this system.
     Takes the minimum value from the following locations:
     - Total system cpus available on the host.
     - CPU Affinity (if set)
-    - Cgroups limit (if set)
+    - Cgroups v1 or v2 limit (if set), a fractional limit counts as at least one CPU
     """
     count = os.cpu_count()
 
@@ -72,17 +106,9 @@ def cpu_count():
         pass
 
     # Check cgroups if available
-    if sys.platform == "linux":
-        try:
-            with open("/sys/fs/cgroup/cpu,cpuacct/cpu.cfs_quota_us") as f:
-                quota = int(f.read())
-            with open("/sys/fs/cgroup/cpu,cpuacct/cpu.cfs_period_us") as f:
-                period = int(f.read())
-            cgroups_count = int(quota / period)
-            if cgroups_count > 0:
-                count = min(count, cgroups_count)
-        except Exception:
-            pass
+    cgroup_limit = cgroup_cpu_limit()
+    if cgroup_limit is not None:
+        count = min(count, max(1, int(cgroup_limit)))
 
     return count
 
@@ -146,11 +172,58 @@ def to_headers(context: ServicerContext) -> Dict[str, str]:
     return headers
 
 
+def _instances_to_dataframe(instances: List, columns: List = None) -> pd.DataFrame:
+    """Builds a single DataFrame from tabular v1 instances.
+
+    Supported instance formats:
+        - records: ``[{"a": 1, "b": 2}, ...]``, one row per instance.
+        - column lists: ``[{"a": [1, 2], "b": [3, 4]}, ...]``, the columns of all
+          instances are concatenated.
+        - lists of records: ``[[{"a": 1}, {"b": 2}], ...]``, one row per record.
+
+    Any other layout falls back to building one DataFrame per instance.
+    """
+    # Use the builtin types for the per instance checks, isinstance against the
+    # typing aliases is an order of magnitude slower.
+    first = instances[0]
+    if isinstance(first, dict):
+        if not any(
+            isinstance(value, (list, dict, np.ndarray)) for value in first.values()
+        ):
+            # Records, missing keys are filled with NaN.
+            return pd.DataFrame.from_records(instances, columns=columns)
+        keys = first.keys()
+        if all(
+            isinstance(instance, dict)
+            and instance.keys() == keys
+            and all(
+                isinstance(value, list)
+                and len(value) == len(next(iter(instance.values())))
+                for value in instance.values()
+            )
+            for instance in instances
+        ):
+            merged = {key: [] for key in keys}
+            for instance in instances:
+                for key, value in instance.items():
+                    merged[key].extend(value)
+            return pd.DataFrame(merged, columns=columns)
+    elif all(isinstance(instance, list) for instance in instances):
+        return pd.DataFrame(
+            list(itertools.chain.from_iterable(instances)), columns=columns
+        )
+    dfs = [pd.DataFrame(instance, columns=columns) for instance in instances]
+    return pd.concat(dfs, axis=0)
+
+
 def get_predict_input(
     payload: Union[Dict, InferRequest], columns: List = None
 ) -> Union[np.ndarray, pd.DataFrame, List[str]]:
     if isinstance(payload, Dict):
         instances = payload["inputs"] if "inputs" in payload else payload["instances"]
+        if isinstance(instances, pd.DataFrame):
+            # Already decoded column-wise, e.g. from an Arrow IPC stream
+            return instances
         if len(instances) == 0:
             return np.array(instances)
         if isinstance(instances[0], Dict) or (
@@ -158,11 +231,7 @@ def get_predict_input(
             and len(instances[0]) != 0
             and isinstance(instances[0][0], Dict)
         ):
-            dfs = []
-            for instance in instances:
-                dfs.append(pd.DataFrame(instance, columns=columns))
-            inputs = pd.concat(dfs, axis=0)
-            return inputs
+            return _instances_to_dataframe(instances, columns)
         else:
             if isinstance(instances[0], str):
                 return instances
@@ -178,6 +247,9 @@ def get_predict_input(
                 # for v2 http, we get string eg: {"content_type": "pd"}
                 content_type = parameters.get("content_type")
 
+        if payload.has_sparse_inputs():
+            # Passed as is to the sklearn, xgboost and lightgbm models
+            return payload.as_sparse()
         if content_type == "pd":
             return payload.as_dataframe()
         else:
@@ -199,9 +271,7 @@ def get_predict_response(
     if isinstance(payload, Dict):
         infer_outputs = result
         if isinstance(result, pd.DataFrame):
-            infer_outputs = []
-            for label, row in result.iterrows():
-                infer_outputs.append(row.to_dict())
+            infer_outputs = result.to_dict(orient="records")
         elif isinstance(result, np.ndarray):
             infer_outputs = result.tolist()
         return {"predictions": infer_outputs}
@@ -209,6 +279,8 @@ def get_predict_response(
         infer_outputs = []
         if isinstance(result, pd.DataFrame):
             for col in result.columns:
+                if not payload.is_output_requested(col):
+                    continue
                 infer_output = InferOutput(
                     name=col,
                     shape=list(result[col].shape),
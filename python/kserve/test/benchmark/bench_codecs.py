@@ -0,0 +1,137 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""pytest-benchmark suite of the request and response codecs.
+
+Not collected by the default test run, use the ``benchmark`` targets of the Makefile in
+``python/kserve``, which save and compare against a local baseline::
+
+    make benchmark_save      # on the base commit
+    make benchmark_compare   # on the change, fails on a regression above the threshold
+"""
+
+import numpy as np
+import orjson
+import pytest
+
+from kserve.model_repository import ModelRepository
+from kserve.protocol.dataplane import DataPlane
+from kserve.protocol.infer_type import InferInput, InferRequest, InferResponse
+from kserve.utils.utils import get_predict_input, get_predict_response
+
+pytest.importorskip("pytest_benchmark")
+
+SIZES = [16, 4096, 262144]
+DATATYPES = {"FP32": np.float32, "INT64": np.int64, "BYTES": np.object_}
+# Strings are much slower to encode, keep their runs short
+MAX_BYTES_SIZE = 4096
+JSON_HEADERS = {"content-type": "application/json"}
+
+
+def tensor(datatype: str, size: int) -> np.ndarray:
+    if datatype == "BYTES":
+        return np.array([f"token-{i}" for i in range(size)], dtype=np.object_)
+    return np.arange(size, dtype=DATATYPES[datatype]).reshape(-1, 16)
+
+
+def cases():
+    return [
+        pytest.param(datatype, size, id=f"{datatype}-{size}")
+        for datatype in DATATYPES
+        for size in SIZES
+        if datatype != "BYTES" or size <= MAX_BYTES_SIZE
+    ]
+
+
+def infer_request(datatype: str, size: int, binary_data: bool = False) -> InferRequest:
+    data = tensor(datatype, size)
+    infer_input = InferInput("input-0", list(data.shape), datatype)
+    infer_input.set_data_from_numpy(data, binary_data=binary_data)
+    return InferRequest(model_name="model", infer_inputs=[infer_input])
+
+
+@pytest.fixture
+def dataplane() -> DataPlane:
+    return DataPlane(model_registry=ModelRepository())
+
+
+@pytest.mark.parametrize("datatype,size", cases())
+class TestInferType:
+    def test_set_data_from_numpy(self, benchmark, datatype, size):
+        data = tensor(datatype, size)
+        infer_input = InferInput("input-0", list(data.shape), datatype)
+        benchmark(infer_input.set_data_from_numpy, data, binary_data=False)
+
+    def test_set_data_from_numpy_binary(self, benchmark, datatype, size):
+        data = tensor(datatype, size)
+        infer_input = InferInput("input-0", list(data.shape), datatype)
+        benchmark(infer_input.set_data_from_numpy, data, binary_data=True)
+
+    def test_as_numpy(self, benchmark, datatype, size):
+        benchmark(infer_request(datatype, size).inputs[0].as_numpy)
+
+    def test_as_numpy_from_grpc(self, benchmark, datatype, size):
+        request = InferRequest.from_grpc(
+            infer_request(datatype, size, binary_data=True).to_grpc()
+        )
+        benchmark(request.inputs[0].as_numpy)
+
+    def test_to_grpc(self, benchmark, datatype, size):
+        benchmark(infer_request(datatype, size, binary_data=True).to_grpc)
+
+    def test_from_grpc(self, benchmark, datatype, size):
+        grpc_request = infer_request(datatype, size, binary_data=True).to_grpc()
+        benchmark(InferRequest.from_grpc, grpc_request)
+
+    def test_to_rest(self, benchmark, datatype, size):
+        benchmark(infer_request(datatype, size).to_rest)
+
+    def test_as_dataframe(self, benchmark, datatype, size):
+        benchmark(infer_request(datatype, size).as_dataframe)
+
+
+@pytest.mark.parametrize("datatype,size", cases())
+class TestDataPlane:
+    def test_decode_v1(self, benchmark, dataplane, datatype, size):
+        body = orjson.dumps({"instances": tensor(datatype, size).tolist()})
+        benchmark(dataplane.decode, body, JSON_HEADERS)
+
+    def test_encode_v1(self, benchmark, dataplane, datatype, size):
+        response = {"predictions": tensor(datatype, size).tolist()}
+        benchmark(dataplane.encode, "model", response, JSON_HEADERS, {})
+
+    def test_encode_v2(self, benchmark, dataplane, datatype, size):
+        request = infer_request(datatype, size)
+        response = get_predict_response(request, tensor(datatype, size), "model")
+        assert isinstance(response, InferResponse)
+        benchmark(dataplane.encode, "model", response, JSON_HEADERS, {})
+
+
+@pytest.mark.parametrize("datatype,size", cases())
+class TestPredictUtils:
+    def test_get_predict_input_v1(self, benchmark, datatype, size):
+        payload = {"instances": tensor(datatype, size).tolist()}
+        benchmark(get_predict_input, payload)
+
+    def test_get_predict_input_v2(self, benchmark, datatype, size):
+        benchmark(get_predict_input, infer_request(datatype, size))
+
+    def test_get_predict_response_v1(self, benchmark, datatype, size):
+        result = tensor(datatype, size)
+        benchmark(get_predict_response, {"instances": []}, result, "model")
+
+    def test_get_predict_response_v2(self, benchmark, datatype, size):
+        request = infer_request(datatype, size)
+        result = tensor(datatype, size)
+        benchmark(get_predict_response, request, result, "model")
@@ -0,0 +1,114 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmarks the per request overhead of the REST server with and without the lean
+inference routes, using a model which returns its input unchanged.
+
+Requests are sent in process through the ASGI interface so that only the server side
+request handling is measured. Run from ``python/kserve``::
+
+    python -m test.benchmark.rest_overhead
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Dict
+
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
+
+from kserve import Model
+from kserve.model_repository import ModelRepository
+from kserve.protocol.dataplane import DataPlane
+from kserve.protocol.infer_type import InferRequest
+from kserve.protocol.model_repository_extension import ModelRepositoryExtension
+from kserve.protocol.rest.lean_routes import LeanInferenceRoutes
+from kserve.protocol.rest.server import LatencyLoggingMiddleware, RESTServer
+from kserve.utils.utils import get_predict_input, get_predict_response
+
+
+class EchoModel(Model):
+    def __init__(self, name):
+        super().__init__(name)
+        self.ready = True
+
+    async def predict(self, request, headers=None):
+        if isinstance(request, InferRequest):
+            return get_predict_response(request, get_predict_input(request), self.name)
+        return {"predictions": request["instances"]}
+
+
+def create_app(lean: bool) -> FastAPI:
+    # Same middleware setup as UvicornServer
+    registry = ModelRepository()
+    registry.update(EchoModel("model"))
+    dataplane = DataPlane(model_registry=registry)
+    app = FastAPI(default_response_class=ORJSONResponse)
+    RESTServer(app, dataplane, ModelRepositoryExtension(registry)).create_application()
+    if lean:
+        app.add_middleware(LeanInferenceRoutes, dataplane=dataplane)
+    app.add_middleware(LatencyLoggingMiddleware)
+    return app
+
+
+def payloads(elements: int) -> Dict[str, bytes]:
+    data = list(range(elements))
+    v1 = {"instances": [data]}
+    v2 = {
+        "inputs": [
+            {"name": "input-0", "shape": [elements], "datatype": "INT64", "data": data}
+        ]
+    }
+    return {
+        "/v1/models/model:predict": json.dumps(v1).encode(),
+        "/v2/models/model/infer": json.dumps(v2).encode(),
+    }
+
+
+async def measure(app: FastAPI, path: str, body: bytes, requests: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    headers = {"content-type": "application/json"}
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        for _ in range(min(requests, 100)):
+            (await client.post(path, content=body, headers=headers)).raise_for_status()
+        start = time.perf_counter()
+        for _ in range(requests):
+            await client.post(path, content=body, headers=headers)
+        return (time.perf_counter() - start) / requests
+
+
+async def run(elements: int, requests: int):
+    apps = {"fastapi": create_app(lean=False), "lean": create_app(lean=True)}
+    print(f"{'endpoint':<28}{'elements':>10}{'fastapi (us)':>15}{'lean (us)':>12}")
+    for num_elements in elements:
+        for path, body in payloads(num_elements).items():
+            timings = {
+                name: await measure(app, path, body, requests)
+                for name, app in apps.items()
+            }
+            print(
+                f"{path:<28}{num_elements:>10}"
+                f"{timings['fastapi'] * 1e6:>15.1f}{timings['lean'] * 1e6:>12.1f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--elements", type=int, nargs="+", default=[1, 1000])
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(run(args.elements, args.requests))
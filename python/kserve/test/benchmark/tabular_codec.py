@@ -0,0 +1,120 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmarks the tabular helpers shared by the sklearn, xgboost, lightgbm and
+pmml servers.
+
+Run from ``python/kserve``::
+
+    python -m test.benchmark.tabular_codec
+"""
+
+import argparse
+import timeit
+from typing import Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from kserve.protocol.infer_type import InferInput, InferRequest
+from kserve.utils.utils import get_predict_input, get_predict_response
+
+NUM_FEATURES = 8
+COLUMNS = [f"f{i}" for i in range(NUM_FEATURES)]
+
+
+def records_payload(rows: int) -> Dict:
+    values = np.random.rand(rows, NUM_FEATURES).tolist()
+    return {"instances": [dict(zip(COLUMNS, row)) for row in values]}
+
+
+def column_lists_payload(rows: int) -> Dict:
+    values = np.random.rand(NUM_FEATURES, rows).tolist()
+    return {"instances": [dict(zip(COLUMNS, values))]}
+
+
+def lists_of_records_payload(rows: int) -> Dict:
+    values = np.random.rand(rows, NUM_FEATURES).tolist()
+    return {"instances": [[dict(zip(COLUMNS, row)) for row in values]]}
+
+
+def v2_dataframe_payload(rows: int) -> InferRequest:
+    values = np.random.rand(NUM_FEATURES, rows)
+    infer_inputs = []
+    for name, column in zip(COLUMNS, values):
+        infer_input = InferInput(name=name, shape=[rows], datatype="FP64")
+        infer_input.set_data_from_numpy(column)
+        infer_inputs.append(infer_input)
+    return InferRequest(
+        model_name="model",
+        infer_inputs=infer_inputs,
+        parameters={"content_type": "pd"},
+    )
+
+
+PAYLOADS: Dict[str, Callable] = {
+    "records": records_payload,
+    "column_lists": column_lists_payload,
+    "lists_of_records": lists_of_records_payload,
+    "v2_pd": v2_dataframe_payload,
+}
+
+
+def sklearn_xgboost(payload):
+    # sklearnserver and xgbserver decode without columns and return an ndarray.
+    instances = get_predict_input(payload)
+    return get_predict_response(payload, np.zeros(len(instances)), "model")
+
+
+def lightgbm(payload):
+    instances = get_predict_input(payload, columns=COLUMNS)
+    return get_predict_response(payload, np.zeros(len(instances)), "model")
+
+
+def pmml(payload):
+    # pmmlserver returns a DataFrame built from per row result records.
+    instances = get_predict_input(payload)
+    result = pd.DataFrame({"label": np.zeros(len(instances), dtype=np.int64)})
+    result["probability"] = 0.5
+    return get_predict_response(payload, result, "model")
+
+
+SERVERS: Dict[str, Callable] = {
+    "sklearn/xgboost": sklearn_xgboost,
+    "lightgbm": lightgbm,
+    "pmml": pmml,
+}
+
+
+def run(rows: List[int], repeat: int):
+    print(f"{'server':<16}{'payload':<18}{'rows':>8}{'best (ms)':>12}")
+    for num_rows in rows:
+        for payload_name, make_payload in PAYLOADS.items():
+            payload = make_payload(num_rows)
+            for server_name, handler in SERVERS.items():
+                timings = timeit.repeat(
+                    lambda: handler(payload), number=1, repeat=repeat
+                )
+                print(
+                    f"{server_name:<16}{payload_name:<18}{num_rows:>8}"
+                    f"{min(timings) * 1000:>12.3f}"
+                )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10, 1000, 100000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.rows, args.repeat)
@@ -0,0 +1,103 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pytest
+
+from kserve import Model, accounting
+from kserve.metrics import MODEL_CPU_SECONDS, MODEL_RSS_GROWTH_ALERTS
+from kserve.model_repository import ModelRepository
+from kserve.protocol.model_repository_extension import ModelRepositoryExtension
+
+MIB = 1024 * 1024
+
+
+class BaseModel(Model):
+    def load(self):
+        # Touched so that the pages are resident
+        self.weights = np.ones(64 * MIB, dtype=np.uint8)
+        self.ready = True
+        return self.ready
+
+
+class LeakingModel(BaseModel):
+    def load(self):
+        self.loads = getattr(self, "loads", 0) + 1
+        self.leaked = []
+        return super().load()
+
+    def predict(self, payload, headers=None):
+        self.leaked.append(np.ones(4 * MIB, dtype=np.uint8))
+        sum(range(10000))
+        return {"predictions": payload["instances"]}
+
+
+@pytest.fixture
+def alerts():
+    accounting.configure_rss_growth_alerts(8 * MIB, warmup_requests=1)
+    yield
+    accounting.configure_rss_growth_alerts(0)
+
+
+class LeakingModelRepository(ModelRepository):
+    def load(self, name):
+        model = LeakingModel(name)
+        model.load()
+        self.update(model)
+        return model.ready
+
+
+@pytest.mark.asyncio
+async def test_repository_load_memory():
+    # Defining or loading a model outside of the server is not measured
+    LeakingModel("leaking-direct").load()
+    assert accounting.model_usage("leaking-direct") is None
+
+    repository = LeakingModelRepository()
+    await ModelRepositoryExtension(repository).load("leaking-load")
+    assert accounting.model_usage("leaking-load").load_rss_bytes >= 32 * MIB
+
+
+@pytest.mark.asyncio
+async def test_handler_cpu_time_and_index():
+    model = LeakingModel("leaking-cpu")
+    with accounting.measure_load(model.name):
+        model.load()
+    repository = ModelRepository()
+    repository.update(model)
+    await model({"instances": [1]})
+
+    [info] = ModelRepositoryExtension(repository).index()
+    usage = info["usage"]
+    assert usage["requests"] == 1
+    assert usage["load_rss_bytes"] >= 32 * MIB
+    # The coroutine preprocess and postprocess handlers are not measured
+    assert set(usage["cpu_seconds"]) == {"predict"}
+    assert MODEL_CPU_SECONDS.labels("leaking-cpu", "predict")._value.get() > 0
+
+    repository.unload("leaking-cpu")
+    assert accounting.model_usage("leaking-cpu") is None
+
+
+@pytest.mark.asyncio
+async def test_rss_growth_alert(alerts):
+    model = LeakingModel("leaking-rss")
+    model.load()
+    for _ in range(5):
+        await model({"instances": [1]})
+
+    usage = accounting.model_usage("leaking-rss")
+    assert usage.rss_growth_bytes >= 12 * MIB
+    assert MODEL_RSS_GROWTH_ALERTS.labels("leaking-rss")._value.get() >= 1
+    assert "rss_growth_bytes" in usage.to_dict()
@@ -0,0 +1,207 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pandas as pd
+import pytest
+import pytest_asyncio
+from fastapi.testclient import TestClient
+
+from kserve import Model, ModelServer
+from kserve.constants.constants import ARROW_CONTENT_TYPE
+from kserve.errors import InvalidInput
+from kserve.model_server import app as kserve_app
+from kserve.protocol.infer_type import InferOutput, InferResponse
+from kserve.protocol.rest.server import RESTServer
+from kserve.utils import arrow_codec
+from kserve.utils.utils import get_predict_input, get_predict_response
+
+pa = pytest.importorskip("pyarrow")
+
+
+def to_arrow_stream(table) -> bytes:
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def read_arrow_stream(body: bytes):
+    with pa.ipc.open_stream(body) as reader:
+        return reader.read_all()
+
+
+class DummyTabularModel(Model):
+    def __init__(self, name):
+        super().__init__(name)
+        self.name = name
+        self.ready = False
+
+    def load(self):
+        self.ready = True
+
+    async def predict(self, payload, headers=None):
+        inputs = get_predict_input(payload)
+        assert isinstance(inputs, pd.DataFrame)
+        result = (inputs["a"] + inputs["b"]).to_numpy()
+        return get_predict_response(payload, result, self.name)
+
+
+def test_decode_dataframe_is_columnar():
+    table = pa.table({"a": np.arange(5, dtype=np.float32), "b": ["x"] * 5})
+    df = arrow_codec.decode_dataframe(to_arrow_stream(table))
+    assert list(df.columns) == ["a", "b"]
+    assert df["a"].dtype == np.float32
+    assert df["b"].tolist() == ["x"] * 5
+
+
+def test_decode_infer_request():
+    tensor = pa.FixedSizeListArray.from_arrays(pa.array(np.arange(6)), 3)
+    table = pa.table({"a": np.arange(2, dtype=np.int32), "t": tensor})
+    request = arrow_codec.decode_infer_request(to_arrow_stream(table), "model")
+    assert request.parameters is None
+    assert request.inputs[0].datatype == "INT32"
+    assert request.inputs[1].shape == [2, 3]
+    assert np.array_equal(request.inputs[1].as_numpy(), np.arange(6).reshape(2, 3))
+
+
+def test_decode_tabular_infer_request_as_dataframe():
+    table = pa.table({"a": np.arange(3.0), "s": ["x", "y", "z"]})
+    request = arrow_codec.decode_infer_request(to_arrow_stream(table), "model")
+    assert request.parameters == {"content_type": "pd"}
+    df = request.as_dataframe()
+    assert df["a"].tolist() == [0.0, 1.0, 2.0]
+    assert df["s"].tolist() == ["x", "y", "z"]
+
+
+def test_decode_invalid_stream():
+    with pytest.raises(InvalidInput):
+        arrow_codec.decode_dataframe(b"not arrow")
+
+
+def test_encode_infer_response():
+    output = InferOutput(name="out", shape=[2, 2], datatype="FP32")
+    output.set_data_from_numpy(np.ones((2, 2), dtype=np.float32))
+    response = InferResponse("1", "model", infer_outputs=[output])
+    table = read_arrow_stream(arrow_codec.encode_infer_response(response))
+    assert table.schema.metadata[b"model_name"] == b"model"
+    assert table.column("out").to_pylist() == [[1.0, 1.0], [1.0, 1.0]]
+
+
+def test_encode_infer_response_mismatched_rows():
+    out_1 = InferOutput(name="a", shape=[2], datatype="INT64", data=[1, 2])
+    out_2 = InferOutput(name="b", shape=[3], datatype="INT64", data=[1, 2, 3])
+    with pytest.raises(InvalidInput):
+        arrow_codec.encode_infer_response(InferResponse("1", "m", [out_1, out_2]))
+
+
+def test_encode_predictions():
+    table = read_arrow_stream(arrow_codec.encode_predictions([[1, 2], [3, 4]]))
+    assert table.column("predictions").to_pylist() == [[1, 2], [3, 4]]
+    table = read_arrow_stream(arrow_codec.encode_predictions([{"a": 1}, {"a": 2}]))
+    assert table.column("a").to_pylist() == [1, 2]
+
+
+class TestArrowEndpoints:
+    @pytest.fixture(scope="class")
+    def server(self):
+        server = ModelServer()
+        rest_server = RESTServer(
+            kserve_app, server.dataplane, server.model_repository_extension
+        )
+        rest_server.create_application()
+        yield server
+        kserve_app.routes.clear()
+
+    @pytest_asyncio.fixture(scope="class")
+    async def app(self, server):
+        model = DummyTabularModel("TestModel")
+        model.load()
+        server.register_model(model)
+        yield kserve_app
+        await server.model_repository_extension.unload("TestModel")
+
+    @pytest.fixture(scope="class")
+    def http_server_client(self, app):
+        return TestClient(app)
+
+    @pytest.fixture(scope="class")
+    def body(self):
+        return to_arrow_stream(
+            pa.table({"a": np.arange(4.0), "b": np.ones(4, dtype=np.float64)})
+        )
+
+    def test_predict_arrow_v1(self, http_server_client, body):
+        resp = http_server_client.post(
+            "/v1/models/TestModel:predict",
+            content=body,
+            headers={"content-type": ARROW_CONTENT_TYPE},
+        )
+        assert resp.status_code == 200
+        assert resp.json() == {"predictions": [1.0, 2.0, 3.0, 4.0]}
+
+    def test_predict_arrow_response_v1(self, http_server_client, body):
+        resp = http_server_client.post(
+            "/v1/models/TestModel:predict",
+            content=body,
+            headers={"content-type": ARROW_CONTENT_TYPE, "accept": ARROW_CONTENT_TYPE},
+        )
+        assert resp.status_code == 200
+        assert resp.headers["content-type"] == ARROW_CONTENT_TYPE
+        table = read_arrow_stream(resp.content)
+        assert table.column("predictions").to_pylist() == [1.0, 2.0, 3.0, 4.0]
+
+    def test_infer_arrow_v2(self, http_server_client, body):
+        resp = http_server_client.post(
+            "/v2/models/TestModel/infer",
+            content=body,
+            headers={"content-type": ARROW_CONTENT_TYPE},
+        )
+        assert resp.status_code == 200
+        assert resp.json()["outputs"][0]["data"] == [1.0, 2.0, 3.0, 4.0]
+
+    def test_infer_arrow_response_v2(self, http_server_client, body):
+        resp = http_server_client.post(
+            "/v2/models/TestModel/infer",
+            content=body,
+            headers={"content-type": ARROW_CONTENT_TYPE, "accept": ARROW_CONTENT_TYPE},
+        )
+        assert resp.status_code == 200
+        assert resp.headers["content-type"] == ARROW_CONTENT_TYPE
+        table = read_arrow_stream(resp.content)
+        assert table.column("output-0").to_pylist() == [1.0, 2.0, 3.0, 4.0]
+
+    def test_infer_json_v2_with_arrow_accept(self, http_server_client):
+        resp = http_server_client.post(
+            "/v2/models/TestModel/infer",
+            json={
+                "inputs": [
+                    {"name": "a", "shape": [2], "datatype": "FP64", "data": [1, 2]},
+                    {"name": "b", "shape": [2], "datatype": "FP64", "data": [3, 4]},
+                ],
+                "parameters": {"content_type": "pd"},
+            },
+            headers={"accept": ARROW_CONTENT_TYPE},
+        )
+        assert resp.status_code == 200
+        table = read_arrow_stream(resp.content)
+        assert table.column("output-0").to_pylist() == [4.0, 6.0]
+
+    def test_infer_unsupported_content_type_v2(self, http_server_client):
+        resp = http_server_client.post(
+            "/v2/models/TestModel/infer",
+            content=b"a,b\n1,2",
+            headers={"content-type": "text/csv"},
+        )
+        assert resp.status_code == 400
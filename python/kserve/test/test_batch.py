@@ -0,0 +1,117 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+from typing import Dict
+
+import numpy as np
+import orjson
+import pandas as pd
+import pytest
+
+from kserve import Model
+from kserve.batch import ModelSpec, read_batches, run
+from kserve.utils.utils import get_predict_input
+
+MODEL_CLASS = f"{__name__}:SumModel"
+LOOP_BOUND_MODEL_CLASS = f"{__name__}:LoopBoundModel"
+
+
+class SumModel(Model):
+    def __init__(self, name: str, offset: int = 0):
+        super().__init__(name)
+        self.offset = offset
+
+    def load(self) -> bool:
+        self.ready = True
+        return self.ready
+
+    def predict(self, payload: Dict, headers: Dict[str, str] = None) -> Dict:
+        inputs = get_predict_input(payload)
+        if isinstance(inputs, pd.DataFrame):
+            inputs = inputs.to_numpy()
+        return {"predictions": (np.asarray(inputs).sum(axis=1) + self.offset).tolist()}
+
+
+class LoopBoundModel(SumModel):
+    """Fails like an async client used from another event loop than its own."""
+
+    async def load(self) -> bool:
+        self.loop = asyncio.get_running_loop()
+        self.ready = True
+        return self.ready
+
+    async def predict(self, payload: Dict, headers: Dict[str, str] = None) -> Dict:
+        if asyncio.get_running_loop() is not self.loop:
+            raise RuntimeError("attached to a different loop")
+        await asyncio.sleep(0.01)
+        return super().predict(payload, headers)
+
+
+@pytest.fixture
+def inputs(tmp_path):
+    input_dir = tmp_path / "inputs"
+    input_dir.mkdir()
+    rows = np.arange(20).reshape(10, 2)
+    with open(input_dir / "a.jsonl", "wb") as f:
+        f.write(b"".join(orjson.dumps(row.tolist()) + b"\n" for row in rows[:4]))
+    pd.DataFrame(rows[4:7], columns=["x", "y"]).to_csv(input_dir / "b.csv", index=False)
+    np.save(input_dir / "c.npy", rows[7:])
+    (input_dir / "README").write_text("skipped")
+    return input_dir, rows.sum(axis=1)
+
+
+def test_read_batches(inputs):
+    input_dir, _ = inputs
+    sizes = [len(batch) for batch in read_batches(str(input_dir), batch_size=3)]
+    assert sizes == [3, 1, 3, 3]
+
+
+@pytest.mark.parametrize("parallelism", ["thread", "process"])
+def test_run(inputs, tmp_path, parallelism):
+    input_dir, expected = inputs
+    output = tmp_path / "out" / "predictions.jsonl"
+    stats = run(
+        ModelSpec(MODEL_CLASS, "sum", {"offset": 1}),
+        str(input_dir),
+        str(output),
+        batch_size=3,
+        workers=2,
+        parallelism=parallelism,
+    )
+    assert (stats.instances, stats.batches) == (10, 4)
+    predictions = [orjson.loads(line) for line in output.read_bytes().splitlines()]
+    assert predictions == (expected + 1).tolist()
+
+
+def test_run_csv_output(inputs, tmp_path):
+    input_dir, expected = inputs
+    output = tmp_path / "predictions.csv"
+    run(ModelSpec(MODEL_CLASS, "sum"), str(input_dir), str(output), batch_size=4)
+    assert pd.read_csv(output)["predictions"].tolist() == expected.tolist()
+
+
+def test_run_async_model_threads(inputs, tmp_path):
+    input_dir, expected = inputs
+    output = tmp_path / "predictions.jsonl"
+    stats = run(
+        ModelSpec(LOOP_BOUND_MODEL_CLASS, "loop-bound"),
+        str(input_dir),
+        str(output),
+        batch_size=1,
+        workers=4,
+    )
+    assert stats.instances == 10
+    predictions = [orjson.loads(line) for line in output.read_bytes().splitlines()]
+    assert predictions == expected.tolist()
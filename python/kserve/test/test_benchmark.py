@@ -0,0 +1,166 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+
+import pytest
+
+from kserve.benchmark import LoadResult, compare, run_load
+from kserve.benchmark.dummy import DummyCompletionModel, DummyModel
+from kserve.benchmark.harness import REFERENCE_MODELS, scenarios
+from kserve.benchmark.loadgen import Target
+from kserve.benchmark.tune import ServerConfig, batch_target, best_point, server_configs
+from kserve.protocol.rest.openai import CompletionRequest
+from kserve.protocol.rest.openai.types import CreateCompletionRequest
+
+
+@pytest.mark.asyncio
+async def test_closed_loop():
+    in_flight = 0
+    max_in_flight = 0
+
+    async def send():
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+
+    result = await run_load(send, duration=0.2, concurrency=4)
+    assert max_in_flight == 4
+    assert result.errors == 0
+    assert 40 <= result.requests <= 100
+    assert 0.01 <= result.latency_ms()["p50"] / 1000 < 0.05
+
+
+@pytest.mark.asyncio
+async def test_open_loop_counts_errors():
+    calls = 0
+
+    async def send():
+        nonlocal calls
+        calls += 1
+        if calls % 2:
+            raise RuntimeError("failed")
+
+    result = await run_load(send, duration=0.5, qps=100, warmup=0.1)
+    assert result.requests == 50
+    assert result.errors == 25
+    assert len(result.latencies) == 25
+    assert result.throughput == pytest.approx(50, rel=0.2)
+
+
+@pytest.mark.asyncio
+async def test_load_mode_is_required():
+    with pytest.raises(ValueError):
+        await run_load(asyncio.sleep, duration=1)
+
+
+def test_latency_percentiles():
+    result = LoadResult(100, 0, 1.0, [i / 1000 for i in range(1, 101)])
+    latency = result.to_dict()["latency_ms"]
+    assert latency["p50"] == pytest.approx(50.5)
+    assert latency["p99"] == pytest.approx(99.01)
+    assert latency["max"] == 100
+
+
+def test_compare():
+    def report(throughput, p99):
+        return {
+            "results": [
+                {
+                    "model": "dummy",
+                    "protocol": "v1",
+                    "mode": "concurrency",
+                    "load": 8,
+                    "throughput": throughput,
+                    "latency_ms": {"p99": p99},
+                }
+            ]
+        }
+
+    [change] = compare(report(90, 12), report(100, 10))
+    assert change["throughput_change"] == pytest.approx(-0.1)
+    assert change["p99_change"] == pytest.approx(0.2)
+
+
+def test_scenarios_skip_unsupported_protocols():
+    supported = REFERENCE_MODELS["sklearn"].protocols
+    runs = scenarios([p for p in ["v1", "openai"] if p in supported], [10], [1, 2])
+    assert [(s.protocol, s.mode, s.load) for s in runs] == [
+        ("v1", "qps", 10),
+        ("v1", "concurrency", 1),
+        ("v1", "concurrency", 2),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_dummy_models():
+    infer_request = REFERENCE_MODELS["dummy"].infer_request
+    response = await DummyModel("dummy")(infer_request)
+    assert response.outputs[0].data == infer_request.inputs[0].data
+
+    request = CompletionRequest(
+        params=CreateCompletionRequest(model="dummy-llm", prompt="a b c")
+    )
+    completion = await DummyCompletionModel("dummy-llm").create_completion(request)
+    assert completion.choices[0].text == "a b c"
+    assert completion.usage.total_tokens == 6
+
+
+def test_server_configs():
+    configs = server_configs(max_threads=[4, 8], nthread=[1, 2])
+    assert len(configs) == 4
+    assert configs[-1] == ServerConfig(max_threads=8, nthread=2)
+    assert configs[-1].server_args() == [
+        "--max_threads",
+        "8",
+        "--nthread",
+        "2",
+    ]
+
+
+def test_batch_target():
+    target = Target("model", "http://127.0.0.1:8080", "127.0.0.1:8081")
+    v1 = batch_target(target, {"instances": [[1, 2], [3, 4]]}, 3)
+    assert v1.instances == [[1, 2], [3, 4], [1, 2]]
+
+    payload = {
+        "inputs": [
+            {"name": "a", "shape": [2, 2], "datatype": "INT32", "data": [1, 2, 3, 4]}
+        ]
+    }
+    [infer_input] = batch_target(target, payload, 3).infer_request.inputs
+    assert infer_input.shape == [3, 2]
+    assert infer_input.data == [1, 2, 3, 4, 1, 2]
+
+
+def test_best_point():
+    def point(batch_size, instances_per_second, p99, within_slo=True):
+        return {
+            "batch_size": batch_size,
+            "instances_per_second": instances_per_second,
+            "percentile": "p99",
+            "latency_ms": {"p99": p99},
+            "within_slo": within_slo,
+        }
+
+    curve = [
+        point(1, 100, 5),
+        point(8, 400, 9),
+        point(8, 400, 7),
+        point(32, 900, 50, False),
+    ]
+    assert best_point(curve) == point(8, 400, 7)
+    assert best_point([point(32, 900, 50, False)]) is None
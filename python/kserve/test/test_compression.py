@@ -0,0 +1,216 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import gzip
+
+import httpx
+import orjson
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from kserve.inference_client import InferenceRESTClient, RESTConfig
+from kserve.protocol.rest.compression import (
+    CompressionMiddleware,
+    DecompressedSizeExceeded,
+    get_codec,
+    model_name_from_path,
+    select_encoding,
+    supported_encodings,
+)
+
+MIN_SIZE = 1024
+
+
+@pytest.fixture(scope="module")
+def app():
+    app = FastAPI(default_response_class=ORJSONResponse)
+
+    @app.post("/v1/models/{model_name}:predict")
+    async def predict(model_name: str, request: Request):
+        body = orjson.loads(await request.body())
+        return {"predictions": body["instances"]}
+
+    @app.get("/v1/models/{model_name}:stream")
+    async def stream(model_name: str):
+        async def chunks():
+            for _ in range(3):
+                yield b"x" * MIN_SIZE
+
+        return StreamingResponse(chunks(), media_type="text/event-stream")
+
+    app.add_middleware(CompressionMiddleware, minimum_size=MIN_SIZE)
+    return app
+
+
+@pytest.fixture(scope="module")
+def client(app):
+    return TestClient(app)
+
+
+def test_select_encoding():
+    assert select_encoding(None) is None
+    assert select_encoding("identity") is None
+    assert select_encoding("gzip, deflate") == "gzip"
+    assert select_encoding("gzip;q=0") is None
+    assert select_encoding("*") == supported_encodings()[0]
+    assert select_encoding("br, gzip;q=0.5", ["gzip"]) == "gzip"
+
+
+def test_model_name_from_path():
+    assert model_name_from_path("/v1/models/sklearn:predict") == "sklearn"
+    assert model_name_from_path("/v2/models/sklearn/infer") == "sklearn"
+    assert model_name_from_path("/metrics") == ""
+
+
+def test_response_compressed_above_threshold(client):
+    instances = list(range(1000))
+    resp = client.post(
+        "/v1/models/test:predict",
+        content=orjson.dumps({"instances": instances}),
+        headers={"accept-encoding": "gzip"},
+    )
+    assert resp.status_code == 200
+    assert resp.headers["content-encoding"] == "gzip"
+    assert "accept-encoding" in resp.headers["vary"].lower()
+    assert resp.json() == {"predictions": instances}
+    labels = {"model_name": "test", "encoding": "gzip", "direction": "response"}
+    assert REGISTRY.get_sample_value(
+        "compression_compressed_bytes_total", labels
+    ) < REGISTRY.get_sample_value("compression_uncompressed_bytes_total", labels)
+
+
+def test_response_not_compressed_below_threshold(client):
+    resp = client.post(
+        "/v1/models/test:predict",
+        content=orjson.dumps({"instances": [1, 2]}),
+        headers={"accept-encoding": "gzip"},
+    )
+    assert resp.status_code == 200
+    assert "content-encoding" not in resp.headers
+    assert resp.json() == {"predictions": [1, 2]}
+
+
+def test_streaming_response_not_compressed(client):
+    resp = client.get("/v1/models/test:stream", headers={"accept-encoding": "gzip"})
+    assert resp.status_code == 200
+    assert "content-encoding" not in resp.headers
+    assert resp.content == b"x" * MIN_SIZE * 3
+
+
+def test_request_decompressed(client):
+    body = gzip.compress(orjson.dumps({"instances": [[1, 2], [3, 4]]}))
+    resp = client.post(
+        "/v1/models/test:predict",
+        content=body,
+        headers={"content-encoding": "gzip", "accept-encoding": "identity"},
+    )
+    assert resp.status_code == 200
+    assert resp.json() == {"predictions": [[1, 2], [3, 4]]}
+
+
+def test_request_decompressed_size_limited():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, max_decompressed_size=1024)
+    client = TestClient(app)
+    # Deflates to a few bytes, the limit applies to the decompressed size
+    resp = client.post(
+        "/v1/models/test:predict",
+        content=gzip.compress(b" " * 100_000),
+        headers={"content-encoding": "gzip"},
+    )
+    assert resp.status_code == 413
+
+
+@pytest.mark.parametrize("encoding", supported_encodings())
+def test_decompress_max_size(encoding):
+    codec = get_codec(encoding)
+    data = codec.compress(b"x" * 4096)
+    assert codec.decompress(data, 4096) == b"x" * 4096
+    with pytest.raises(DecompressedSizeExceeded):
+        codec.decompress(data, 4095)
+
+
+def test_unsupported_request_encoding(client):
+    resp = client.post(
+        "/v1/models/test:predict",
+        content=b"{}",
+        headers={"content-encoding": "compress"},
+    )
+    assert resp.status_code == 415
+    assert "compress" in resp.json()["error"]
+
+
+def test_invalid_compressed_request(client):
+    resp = client.post(
+        "/v1/models/test:predict",
+        content=b"not gzip",
+        headers={"content-encoding": "gzip"},
+    )
+    assert resp.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_rest_client_request_compression(app):
+    config = RESTConfig(
+        transport=httpx.ASGITransport(app=app),
+        request_compression="gzip",
+        compression_min_size=MIN_SIZE,
+    )
+    client = InferenceRESTClient(config=config)
+    instances = list(range(1000))
+    result = await client.infer(
+        "http://test", {"instances": instances}, model_name="client"
+    )
+    assert result == {"predictions": instances}
+    labels = {"model_name": "client", "encoding": "gzip", "direction": "request"}
+    assert REGISTRY.get_sample_value("compression_compressed_bytes_total", labels) > 0
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_rest_client_large_request_compressed_in_executor(app, monkeypatch):
+    monkeypatch.setattr(
+        "kserve.inference_client.CLIENT_COMPRESSION_EXECUTOR_MIN_SIZE", MIN_SIZE
+    )
+    loop = asyncio.get_running_loop()
+    run_in_executor = loop.run_in_executor
+    executor_calls = []
+
+    def record_run_in_executor(executor, func, *args):
+        executor_calls.append(func)
+        return run_in_executor(executor, func, *args)
+
+    monkeypatch.setattr(loop, "run_in_executor", record_run_in_executor)
+    config = RESTConfig(
+        transport=httpx.ASGITransport(app=app),
+        request_compression="gzip",
+        compression_min_size=MIN_SIZE,
+    )
+    client = InferenceRESTClient(config=config)
+    instances = list(range(1000))
+    result = await client.infer(
+        "http://test", {"instances": instances}, model_name="client"
+    )
+    assert result == {"predictions": instances}
+    assert get_codec("gzip").compress in executor_calls
+    await client.close()
+
+
+def test_rest_config_unsupported_compression():
+    with pytest.raises(ValueError):
+        RESTConfig(request_compression="compress")
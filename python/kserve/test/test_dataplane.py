@@ -86,7 +86,8 @@ class TestDataPlane:
         dataplane.get_model_from_registry("Model")
 
     async def test_liveness(self):
-        assert (await DataPlane.live()) == {"status": "alive"}
+        dataplane = DataPlane(model_registry=ModelRepository())
+        assert (await dataplane.live()) == {"status": "alive"}
 
     async def test_server_readiness(self, dataplane_with_model):
         assert (await dataplane_with_model.ready()) is True
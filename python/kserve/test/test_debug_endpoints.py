@@ -0,0 +1,79 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import threading
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from kserve.errors import InvalidInput, invalid_input_handler
+from kserve.profiling import tracemalloc_diff
+from kserve.protocol.rest.debug_endpoints import register_debug_endpoints
+
+
+@pytest.fixture(scope="module")
+def client():
+    app = FastAPI()
+    register_debug_endpoints(app)
+    app.add_exception_handler(InvalidInput, invalid_input_handler)
+    return TestClient(app)
+
+
+def spin(stop: threading.Event):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_profile(client):
+    stop = threading.Event()
+    thread = threading.Thread(target=spin, args=(stop,), name="spinner")
+    thread.start()
+    try:
+        resp = client.get("/debug/profile", params={"seconds": 0.2, "interval_ms": 5})
+    finally:
+        stop.set()
+        thread.join()
+    assert resp.status_code == 200
+    stacks = [line.rsplit(" ", 1) for line in resp.text.splitlines()]
+    spinner = [int(count) for stack, count in stacks if stack.startswith("spinner;")]
+    assert sum(spinner) > 0
+    assert any("spin (" in stack for stack, _ in stacks)
+
+
+def test_stacks(client):
+    resp = client.get("/debug/stacks")
+    assert resp.status_code == 200
+    assert "Thread MainThread" in resp.text
+    assert "Stack for <Task" in resp.text
+
+
+def test_invalid_duration(client):
+    assert client.get("/debug/profile", params={"seconds": 0}).status_code == 400
+    assert client.get("/debug/tracemalloc", params={"seconds": 1e6}).status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_tracemalloc_diff():
+    allocated = []
+
+    async def allocate():
+        await asyncio.sleep(0.05)
+        allocated.extend(bytearray(1024) for _ in range(100))
+
+    task = asyncio.create_task(allocate())
+    diff = await tracemalloc_diff(0.2, limit=5)
+    await task
+    assert "test_debug_endpoints.py" in diff
@@ -18,7 +18,7 @@ import numpy as np
 import pandas as pd
 import pytest
 from google.protobuf.json_format import MessageToDict
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 from kserve import Model, ModelServer
 from kserve.errors import InvalidInput
@@ -678,3 +678,46 @@ async def test_grpc_raw_inputs_with_contents_specified(mock_to_headers, server):
     with pytest.raises(InvalidInput):
         response, _, _, _ = model_infer_method.termination()
         _ = await response
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "compression_min_size, compression_disabled", [(1024, True), (1, False)]
+)
+@patch(
+    "kserve.protocol.grpc.servicer.to_headers", return_value=[]
+)  # To avoid NotImplementedError from trailing_metadata function
+async def test_grpc_compression_min_size(
+    mock_to_headers, compression_min_size, compression_disabled
+):
+    model_server = ModelServer()
+    model = DummyFP16OutputModel("FP16OutputModel")
+    model.load()
+    model_server.register_model(model)
+    inference_servicer = servicer.InferenceServicer(
+        model_server.dataplane,
+        model_server.model_repository_extension,
+        compression_min_size=compression_min_size,
+    )
+    request = grpc_predict_v2_pb2.ModelInferRequest(
+        model_name="FP16OutputModel",
+        id="123",
+        inputs=[
+            {
+                "name": "fp32_input",
+                "shape": [2, 4],
+                "datatype": "FP32",
+                "contents": {"fp32_contents": [6.8, 2.8, 4.8, 1.4, 6.0, 3.4, 4.5, 1.6]},
+            },
+        ],
+    )
+    context = MagicMock()
+    response = await inference_servicer.ModelInfer(request, context)
+    assert response.model_name == "FP16OutputModel"
+    assert context.disable_next_message_compression.called == compression_disabled
+
+
+def test_grpc_compression_from_model_server():
+    model_server = ModelServer(grpc_compression="gzip", compression_min_size=128)
+    assert model_server._grpc_server._compression == "gzip"
+    assert model_server._grpc_server._compression_min_size == 128
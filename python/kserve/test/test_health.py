@@ -0,0 +1,124 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from kserve.health import HealthMonitor
+from kserve.metrics import RequestMetrics, requests_in_flight, requests_queued
+from kserve.model_repository import ModelRepository
+from kserve.protocol.dataplane import DataPlane
+from kserve.protocol.grpc import grpc_predict_v2_pb2 as pb
+from kserve.protocol.grpc.servicer import InferenceServicer
+from kserve.protocol.model_repository_extension import ModelRepositoryExtension
+from kserve.protocol.rest.server import RESTServer
+
+
+class FakeLoopMonitor:
+    stall_threshold = 0.5
+
+    def __init__(self):
+        self.lag_seconds = 0.0
+        self.stall_seconds = 0.0
+        self.last = (0.0, 0.0)
+
+    def lag(self):
+        return self.lag_seconds
+
+    def current_stall(self):
+        return self.stall_seconds
+
+    def last_stall(self):
+        return self.last
+
+
+def test_request_counts():
+    in_flight, queued = requests_in_flight(), requests_queued()
+    metrics = RequestMetrics("v1", "health-model")
+    assert (requests_in_flight(), requests_queued()) == (in_flight + 1, queued + 1)
+    metrics.start()
+    assert requests_queued() == queued
+    metrics.finish()
+    assert (requests_in_flight(), requests_queued()) == (in_flight, queued)
+
+
+def test_readiness_hysteresis():
+    requests = [RequestMetrics("v1", "health-model") for _ in range(4)]
+    base = requests_in_flight() - len(requests)
+    monitor = HealthMonitor(max_in_flight=base + 3, recovery_ratio=0.5)
+    assert not monitor.ready()
+
+    # Still above half the limit
+    requests.pop().finish()
+    assert not monitor.ready()
+
+    while requests_in_flight() > (base + 3) * 0.5:
+        requests.pop().finish()
+    assert monitor.ready()
+    for metrics in requests:
+        metrics.finish()
+
+
+def test_readiness_loop_lag():
+    loop_monitor = FakeLoopMonitor()
+    monitor = HealthMonitor(max_loop_lag=0.2, loop_monitor=loop_monitor)
+    assert monitor.ready()
+    loop_monitor.lag_seconds = 0.3
+    assert not monitor.ready()
+    loop_monitor.lag_seconds = 0.1
+    assert monitor.ready()
+
+
+def test_liveness_after_stall():
+    loop_monitor = FakeLoopMonitor()
+    monitor = HealthMonitor(
+        liveness_stall_timeout=5, loop_monitor=loop_monitor, liveness_window=60
+    )
+    loop_monitor.last = (time.monotonic(), 2.0)
+    assert monitor.live()
+    loop_monitor.last = (time.monotonic(), 10.0)
+    assert not monitor.live()
+    loop_monitor.last = (time.monotonic() - 61, 10.0)
+    assert monitor.live()
+
+    with pytest.raises(ValueError):
+        HealthMonitor(liveness_stall_timeout=0.1, loop_monitor=loop_monitor)
+
+
+@pytest.mark.asyncio
+async def test_probes_report_overload():
+    loop_monitor = FakeLoopMonitor()
+    monitor = HealthMonitor(
+        max_loop_lag=0.2, liveness_stall_timeout=1, loop_monitor=loop_monitor
+    )
+    registry = ModelRepository()
+    dataplane = DataPlane(model_registry=registry, health_monitor=monitor)
+    app = FastAPI()
+    RESTServer(app, dataplane, ModelRepositoryExtension(registry)).create_application()
+    client = TestClient(app)
+    servicer = InferenceServicer(dataplane, ModelRepositoryExtension(registry))
+
+    assert client.get("/v2/health/ready").status_code == 200
+    loop_monitor.lag_seconds = 0.5
+    assert client.get("/v2/health/ready").status_code == 503
+    assert not (await servicer.ServerReady(pb.ServerReadyRequest(), None)).ready
+
+    assert client.get("/").status_code == 200
+    loop_monitor.stall_seconds = 2
+    assert client.get("/").status_code == 503
+    assert client.get("/v2/health/live").status_code == 503
+    assert not (await servicer.ServerLive(pb.ServerLiveRequest(), None)).live
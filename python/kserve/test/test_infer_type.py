@@ -12,8 +12,18 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import numpy as np
+import pytest
 
-from kserve import InferRequest, InferInput, InferResponse, InferOutput
+from kserve import (
+    InferRequest,
+    InferInput,
+    InferResponse,
+    InferOutput,
+    RequestedOutput,
+)
+from kserve.errors import InvalidInput
+from kserve.protocol.infer_type import to_sparse_inputs
 from kserve.protocol.grpc.grpc_predict_v2_pb2 import (
     ModelInferRequest,
     InferParameter,
@@ -302,3 +312,304 @@ class TestInferRequest:
             )
             res = InferResponse.from_grpc(infer_res)
             assert res == expected
+
+    def test_as_dataframe_nested_json(self):
+        infer_req = InferRequest.from_rest(
+            "TestModel",
+            {
+                "inputs": [
+                    {
+                        "name": "a",
+                        "shape": [2, 1],
+                        "datatype": "INT32",
+                        "data": [[1], [2]],
+                    },
+                    {
+                        "name": "b",
+                        "shape": [2, 1],
+                        "datatype": "BYTES",
+                        "data": [["x"], ["y"]],
+                    },
+                ]
+            },
+        )
+        df = infer_req.as_dataframe()
+        assert df["a"].tolist() == [1, 2]
+        assert df["a"].dtype == np.int32
+        assert df["b"].tolist() == ["x", "y"]
+
+    def test_as_dataframe_mismatched_lengths(self):
+        infer_req = InferRequest.from_rest(
+            "TestModel",
+            {
+                "inputs": [
+                    {"name": "a", "shape": [2], "datatype": "FP32", "data": [1.0, 2.0]},
+                    {
+                        "name": "b",
+                        "shape": [3],
+                        "datatype": "FP32",
+                        "data": [1.0, 2.0, 3.0],
+                    },
+                ]
+            },
+        )
+        with pytest.raises(InvalidInput):
+            infer_req.as_dataframe()
+
+
+class TestRequestedOutputs:
+    @pytest.fixture
+    def response(self):
+        scores = InferOutput(name="scores", shape=[2, 3], datatype="FP32")
+        scores.set_data_from_numpy(
+            np.array([[0.1, 0.7, 0.2], [0.5, 0.25, 0.25]], dtype=np.float32),
+            binary_data=False,
+        )
+        label = InferOutput(name="label", shape=[2], datatype="INT64", data=[1, 0])
+        return InferResponse(
+            response_id="1", model_name="TestModel", infer_outputs=[scores, label]
+        )
+
+    def test_grpc_round_trip(self):
+        infer_req = InferRequest(
+            model_name="TestModel",
+            infer_inputs=[
+                InferInput(name="input-0", datatype="INT32", shape=[1], data=[1])
+            ],
+            request_outputs=[
+                RequestedOutput(name="scores", parameters={"classification": 2}),
+                RequestedOutput(name="label"),
+            ],
+        )
+        grpc_req = infer_req.to_grpc()
+        assert [output.name for output in grpc_req.outputs] == ["scores", "label"]
+        res = InferRequest.from_grpc(grpc_req)
+        assert res.get_requested_output("scores").classification == 2
+        assert res.get_requested_output("label").classification is None
+        assert infer_req.to_rest()["outputs"] == [
+            {"name": "scores", "parameters": {"classification": 2}},
+            {"name": "label"},
+        ]
+
+    def test_is_output_requested(self):
+        infer_req = InferRequest(model_name="TestModel", infer_inputs=[])
+        assert infer_req.is_output_requested("label")
+        infer_req.request_outputs = [RequestedOutput(name="scores")]
+        assert infer_req.is_output_requested("scores")
+        assert not infer_req.is_output_requested("label")
+
+    def test_select_outputs(self, response):
+        response.select_outputs([RequestedOutput(name="label")])
+        assert [output.name for output in response.outputs] == ["label"]
+
+    def test_select_outputs_classification(self, response):
+        response.select_outputs(
+            [RequestedOutput(name="scores", parameters={"classification": 2})],
+            labels={"scores": ["a", "b", "c"]},
+        )
+        assert response.outputs == [
+            InferOutput(
+                name="scores",
+                shape=[2, 2],
+                datatype="BYTES",
+                data=["0.7:1:b", "0.2:2:c", "0.5:0:a", "0.25:1:b"],
+            )
+        ]
+
+    def test_select_outputs_classification_k_larger_than_classes(self, response):
+        response.select_outputs(
+            [RequestedOutput(name="scores", parameters={"classification": 10})]
+        )
+        assert response.outputs[0].shape == [2, 3]
+        assert response.outputs[0].data[:3] == ["0.7:1", "0.2:2", "0.1:0"]
+
+    def test_select_outputs_invalid(self, response):
+        with pytest.raises(InvalidInput):
+            response.select_outputs([RequestedOutput(name="missing")])
+        with pytest.raises(InvalidInput):
+            response.select_outputs(
+                [RequestedOutput(name="scores", parameters={"classification": 0})]
+            )
+
+
+class TestTensorInterop:
+    @pytest.fixture
+    def array(self):
+        return np.arange(6, dtype=np.float32).reshape(2, 3)
+
+    @pytest.mark.parametrize("binary_data", [True, False])
+    def test_dlpack(self, array, binary_data):
+        infer_input = InferInput(name="input-0", shape=[2, 3], datatype="FP32")
+        infer_input.set_data_from_numpy(array, binary_data=binary_data)
+        np.testing.assert_array_equal(np.from_dlpack(infer_input), array)
+        infer_output = InferOutput(name="output-0", shape=[2, 3], datatype="FP32")
+        infer_output.set_data_from_numpy(array, binary_data=binary_data)
+        np.testing.assert_array_equal(np.from_dlpack(infer_output), array)
+
+    def test_as_torch_shares_memory(self, array):
+        torch = pytest.importorskip("torch")
+        infer_input = InferInput(
+            name="input-0", shape=[2, 3], datatype="FP32", data=array
+        )
+        tensor = infer_input.as_torch()
+        assert tensor.data_ptr() == array.ctypes.data
+        infer_output = InferOutput(name="output-0", shape=[2, 3], datatype="FP32")
+        infer_output.set_data_from_numpy(array, binary_data=True)
+        tensor = infer_output.as_torch()
+        assert tensor.dtype == torch.float32
+        assert tensor.tolist() == array.tolist()
+
+    def test_set_data_from_torch(self, array):
+        torch = pytest.importorskip("torch")
+        infer_output = InferOutput(name="output-0", shape=[2, 3], datatype="FP32")
+        infer_output.set_data_from_torch(torch.from_numpy(array), binary_data=False)
+        assert infer_output.data == array.flatten().tolist()
+
+    def test_as_torch_bytes(self):
+        pytest.importorskip("torch")
+        infer_input = InferInput(
+            name="input-0", shape=[1], datatype="BYTES", data=["a"]
+        )
+        with pytest.raises(InvalidInput):
+            infer_input.as_torch()
+
+
+class TestBFloat16:
+    @pytest.fixture
+    def array(self):
+        ml_dtypes = pytest.importorskip("ml_dtypes")
+        return np.array([[0.5, 1.25], [2.0, -3.5]], dtype=ml_dtypes.bfloat16)
+
+    def test_grpc_round_trip(self, array):
+        infer_output = InferOutput(name="output-0", shape=[2, 2], datatype="BF16")
+        infer_output.set_data_from_numpy(array, binary_data=False)
+        assert infer_output.data == [0.5, 1.25, 2.0, -3.5]
+        infer_res = InferResponse(
+            response_id="1", model_name="TestModel", infer_outputs=[infer_output]
+        )
+        grpc_res = infer_res.to_grpc()
+        assert grpc_res.raw_output_contents[0] == array.tobytes()
+        res = InferResponse.from_grpc(grpc_res)
+        np.testing.assert_array_equal(res.outputs[0].as_numpy(), array)
+        assert res.to_rest()["outputs"][0]["data"] == [[0.5, 1.25], [2.0, -3.5]]
+
+    def test_request_list_data_sent_as_raw(self, array):
+        infer_req = InferRequest(
+            model_name="TestModel",
+            infer_inputs=[
+                InferInput(
+                    name="input-0", shape=[2, 2], datatype="BF16", data=array.tolist()
+                )
+            ],
+        )
+        grpc_req = infer_req.to_grpc()
+        assert grpc_req.raw_input_contents[0] == array.tobytes()
+
+    def test_downcast_requested_output(self):
+        pytest.importorskip("ml_dtypes")
+        fp32 = InferOutput(name="fp32", shape=[2], datatype="FP32")
+        fp32.set_data_from_numpy(np.array([0.1, 2.5], dtype=np.float32))
+        res = InferResponse(
+            response_id="1", model_name="TestModel", infer_outputs=[fp32]
+        )
+        res.select_outputs(
+            [RequestedOutput(name="fp32", parameters={"datatype": "bf16"})],
+            binary_data=True,
+        )
+        assert res.outputs[0].datatype == "BF16"
+        assert len(res.outputs[0]._raw_data) == 4
+        res.select_outputs(
+            [RequestedOutput(name="fp32", parameters={"datatype": "FP16"})]
+        )
+        assert res.outputs[0].data == [0.10009765625, 2.5]
+
+    def test_downcast_invalid_datatype(self):
+        output = InferOutput(name="output-0", shape=[1], datatype="INT32", data=[1])
+        with pytest.raises(InvalidInput):
+            output.as_datatype("FP16")
+
+
+class TestSparseInferRequest:
+    @pytest.fixture
+    def matrix(self):
+        sparse = pytest.importorskip("scipy.sparse")
+        return sparse.random(5, 1000, density=0.01, format="csr", random_state=1)
+
+    def test_as_sparse(self, matrix):
+        infer_req = InferRequest(
+            model_name="TestModel", infer_inputs=to_sparse_inputs("input-0", matrix)
+        )
+        assert infer_req.has_sparse_inputs()
+        res = infer_req.as_sparse()
+        assert res.shape == (5, 1000)
+        assert (res != matrix).nnz == 0
+
+    def test_as_sparse_rest_round_trip(self, matrix):
+        infer_req = InferRequest(
+            model_name="TestModel", infer_inputs=to_sparse_inputs("input-0", matrix)
+        )
+        rest = infer_req.to_rest()
+        assert len(rest["inputs"][2]["data"]) == matrix.nnz
+        infer_inputs = [
+            InferInput(
+                name=i["name"],
+                shape=i["shape"],
+                datatype=i["datatype"],
+                data=i["data"],
+                parameters=i["parameters"],
+            )
+            for i in rest["inputs"]
+        ]
+        res = InferRequest(model_name="TestModel", infer_inputs=infer_inputs)
+        assert (res.as_sparse() != matrix).nnz == 0
+
+    def test_as_sparse_grpc_round_trip(self, matrix):
+        infer_req = InferRequest(
+            model_name="TestModel", infer_inputs=to_sparse_inputs("input-0", matrix)
+        )
+        res = InferRequest.from_grpc(infer_req.to_grpc())
+        assert res.has_sparse_inputs()
+        assert (res.as_sparse("input-0") != matrix).nnz == 0
+
+    def test_as_sparse_missing_component(self, matrix):
+        infer_inputs = to_sparse_inputs("input-0", matrix)[:2]
+        infer_req = InferRequest(model_name="TestModel", infer_inputs=infer_inputs)
+        with pytest.raises(InvalidInput):
+            infer_req.as_sparse()
+
+    def test_as_sparse_multiple_groups(self, matrix):
+        infer_req = InferRequest(
+            model_name="TestModel",
+            infer_inputs=to_sparse_inputs("a", matrix) + to_sparse_inputs("b", matrix),
+        )
+        with pytest.raises(InvalidInput):
+            infer_req.as_sparse()
+        assert infer_req.as_sparse("b").shape == (5, 1000)
+
+    def test_as_sparse_invalid_columns(self, matrix):
+        infer_inputs = to_sparse_inputs("input-0", matrix)
+        infer_inputs[0].parameters["sparse_columns"] = "abc"
+        infer_req = InferRequest(model_name="TestModel", infer_inputs=infer_inputs)
+        with pytest.raises(InvalidInput, match="sparse_columns"):
+            infer_req.as_sparse()
+
+    def test_as_sparse_invalid_datatype(self, matrix):
+        infer_inputs = to_sparse_inputs("input-0", matrix)
+        values = infer_inputs[2]
+        infer_inputs[2] = InferInput(
+            values.name,
+            values.shape,
+            "BYTES",
+            data=["x"] * matrix.nnz,
+            parameters=values.parameters,
+        )
+        infer_req = InferRequest(model_name="TestModel", infer_inputs=infer_inputs)
+        with pytest.raises(InvalidInput, match="BYTES"):
+            infer_req.as_sparse()
+
+    def test_as_sparse_invalid_indices(self, matrix):
+        infer_inputs = to_sparse_inputs("input-0", matrix)
+        infer_inputs[1]._data = infer_inputs[1].data + 1000
+        infer_req = InferRequest(model_name="TestModel", infer_inputs=infer_inputs)
+        with pytest.raises(InvalidInput):
+            infer_req.as_sparse()
@@ -0,0 +1,58 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from datetime import datetime
+
+import numpy as np
+import orjson
+from pydantic import BaseModel
+
+from kserve.utils.json_codec import dumps
+
+
+class Prediction(BaseModel):
+    label: str
+    score: float
+
+
+def test_dumps_numpy():
+    predictions = np.arange(6, dtype=np.float32).reshape(2, 3)
+    assert orjson.loads(dumps({"predictions": predictions})) == {
+        "predictions": [[0.0, 1.0, 2.0], [3.0, 4.0, 5.0]]
+    }
+    assert dumps({"predictions": np.int64(1)}) == b'{"predictions":1}'
+
+
+def test_dumps_numpy_fallback():
+    # float16 and non contiguous arrays are not supported natively by orjson
+    predictions = np.arange(6, dtype=np.float16).reshape(2, 3)
+    assert orjson.loads(dumps({"predictions": predictions})) == {
+        "predictions": [[0.0, 1.0, 2.0], [3.0, 4.0, 5.0]]
+    }
+    assert orjson.loads(dumps({"predictions": np.arange(6)[::2]})) == {
+        "predictions": [0, 2, 4]
+    }
+
+
+def test_dumps_jsonable_encoder_fallback():
+    response = {
+        "predictions": [Prediction(label="cat", score=0.5)],
+        "created": datetime(2024, 1, 1),
+        1: "non str key",
+    }
+    assert orjson.loads(dumps(response)) == {
+        "predictions": [{"label": "cat", "score": 0.5}],
+        "created": "2024-01-01T00:00:00",
+        "1": "non str key",
+    }
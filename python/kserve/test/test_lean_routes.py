@@ -0,0 +1,146 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
+from fastapi.testclient import TestClient
+
+from kserve import Model
+from kserve.model_repository import ModelRepository
+from kserve.protocol.model_repository_extension import ModelRepositoryExtension
+from kserve.protocol.dataplane import DataPlane
+from kserve.protocol.infer_type import InferRequest
+from kserve.protocol.rest.lean_routes import LeanInferenceRoutes
+from kserve.protocol.rest.server import RESTServer
+from kserve.utils.utils import get_predict_input, get_predict_response
+
+
+class EchoModel(Model):
+    def __init__(self, name):
+        super().__init__(name)
+        self.ready = True
+
+    async def predict(self, request, headers=None):
+        if isinstance(request, InferRequest):
+            return get_predict_response(request, get_predict_input(request), self.name)
+        if request.get("fail"):
+            raise ValueError("prediction failed")
+        return {"predictions": request["instances"]}
+
+
+class NotReadyModel(Model):
+    def __init__(self, name):
+        super().__init__(name)
+        self.ready = False
+
+
+def create_app(lean: bool):
+    registry = ModelRepository()
+    registry.update(EchoModel("TestModel"))
+    registry.update(NotReadyModel("NotReady"))
+    dataplane = DataPlane(model_registry=registry)
+    app = FastAPI(default_response_class=ORJSONResponse)
+    RESTServer(app, dataplane, ModelRepositoryExtension(registry)).create_application()
+    if lean:
+        return LeanInferenceRoutes(app, dataplane)
+    return app
+
+
+@pytest.fixture(scope="module")
+def fastapi_client():
+    return TestClient(create_app(lean=False), raise_server_exceptions=False)
+
+
+@pytest.fixture(scope="module")
+def lean_client():
+    return TestClient(create_app(lean=True), raise_server_exceptions=False)
+
+
+V2_REQUEST = {
+    "id": "123",
+    "inputs": [
+        {
+            "name": "input-0",
+            "shape": [1, 2],
+            "datatype": "INT32",
+            "data": [1, 2],
+            "parameters": {"test": "value"},
+        }
+    ],
+    "parameters": {"test": 1},
+}
+
+
+def without_nulls(value):
+    # The FastAPI v2 endpoint serializes unset optional fields as null
+    if isinstance(value, dict):
+        return {k: without_nulls(v) for k, v in value.items() if v is not None}
+    if isinstance(value, list):
+        return [without_nulls(v) for v in value]
+    return value
+
+
+@pytest.mark.parametrize(
+    "path,body",
+    [
+        ("/v1/models/TestModel:predict", {"instances": [[1, 2]]}),
+        ("/v1/models/TestModel:predict", {"fail": True}),
+        ("/v1/models/TestModel:predict", b"{"),
+        ("/v1/models/Missing:predict", {"instances": [[1, 2]]}),
+        ("/v1/models/NotReady:predict", {"instances": [[1, 2]]}),
+        ("/v2/models/TestModel/infer", V2_REQUEST),
+        ("/v2/models/Missing/infer", V2_REQUEST),
+    ],
+)
+def test_same_response_as_fastapi(fastapi_client, lean_client, path, body):
+    content = body if isinstance(body, bytes) else json.dumps(body)
+    headers = {"content-type": "application/json"}
+    expected = fastapi_client.post(path, content=content, headers=headers)
+    resp = lean_client.post(path, content=content, headers=headers)
+    assert resp.status_code == expected.status_code
+    assert resp.headers["content-type"] == expected.headers["content-type"]
+    if expected.status_code == 200:
+        assert without_nulls(resp.json()) == without_nulls(expected.json())
+    else:
+        assert resp.json() == expected.json()
+
+
+def test_v2_response(lean_client):
+    resp = lean_client.post("/v2/models/TestModel/infer", json=V2_REQUEST)
+    assert resp.status_code == 200
+    result = resp.json()
+    assert result["id"] == "123"
+    assert result["outputs"][0]["data"] == [1, 2]
+
+
+def test_v2_invalid_request(lean_client):
+    resp = lean_client.post(
+        "/v2/models/TestModel/infer", json={"inputs": [{"name": "input-0"}]}
+    )
+    assert resp.status_code == 400
+    assert "datatype" in resp.json()["error"] or "shape" in resp.json()["error"]
+
+
+def test_other_routes_are_served_by_fastapi(lean_client):
+    assert lean_client.get("/v2/models/TestModel/ready").json() == {
+        "name": "TestModel",
+        "ready": True,
+    }
+    assert lean_client.get("/v1/models/TestModel").json() == {
+        "name": "TestModel",
+        "ready": True,
+    }
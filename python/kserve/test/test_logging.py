@@ -0,0 +1,139 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import logging
+from typing import List
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from kserve import Model
+from kserve import logging as kserve_logging
+from kserve.logging import (
+    KSERVE_LOG_FIELDS_ATTR,
+    JSONFormatter,
+    trace_logger,
+)
+from kserve.model_repository import ModelRepository
+from kserve.protocol.dataplane import DataPlane
+from kserve.protocol.model_repository_extension import ModelRepositoryExtension
+from kserve.protocol.rest.server import LatencyLoggingMiddleware, RESTServer
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records: List[logging.LogRecord] = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+class EchoModel(Model):
+    def __init__(self, name):
+        super().__init__(name)
+        self.ready = True
+        self.enable_latency_logging = True
+
+    async def predict(self, request, headers=None):
+        return {"predictions": request["instances"]}
+
+
+@pytest.fixture
+def trace_records():
+    handler = ListHandler()
+    trace_logger.addHandler(handler)
+    level = trace_logger.level
+    trace_logger.setLevel(logging.INFO)
+    yield handler.records
+    trace_logger.removeHandler(handler)
+    trace_logger.setLevel(level)
+    kserve_logging.set_trace_sample_rate(1.0)
+
+
+@pytest.fixture
+def client():
+    registry = ModelRepository()
+    registry.update(EchoModel("TestModel"))
+    app = FastAPI()
+    RESTServer(
+        app, DataPlane(model_registry=registry), ModelRepositoryExtension(registry)
+    ).create_application()
+    app.add_middleware(LatencyLoggingMiddleware)
+    return TestClient(app)
+
+
+def test_one_line_per_request(client, trace_records):
+    resp = client.post(
+        "/v1/models/TestModel:predict",
+        json={"instances": [1]},
+        headers={"x-request-id": "abc"},
+    )
+    assert resp.status_code == 200
+    assert len(trace_records) == 1
+    fields = getattr(trace_records[0], KSERVE_LOG_FIELDS_ATTR)
+    assert fields["method"] == "POST"
+    assert fields["path"] == "/v1/models/TestModel:predict"
+    assert fields["status"] == 200
+    assert fields["requestId"] == "abc"
+    assert {"wall_ms", "preprocess_ms", "predict_ms", "postprocess_ms"} <= set(fields)
+    assert "requestId: abc" in trace_records[0].getMessage()
+
+
+def test_sampling(client, trace_records):
+    kserve_logging.set_trace_sample_rate(0)
+    for _ in range(5):
+        client.post("/v1/models/TestModel:predict", json={"instances": [1]})
+    assert trace_records == []
+
+
+@pytest.mark.asyncio
+async def test_model_logs_outside_request_context(trace_records):
+    await EchoModel("TestModel")({"instances": [1]}, headers={"x-request-id": "abc"})
+    assert len(trace_records) == 1
+    assert getattr(trace_records[0], KSERVE_LOG_FIELDS_ATTR)["requestId"] == "abc"
+
+
+def test_invalid_sample_rate():
+    with pytest.raises(ValueError):
+        kserve_logging.set_trace_sample_rate(1.5)
+
+
+def test_json_formatter():
+    record = logging.LogRecord(
+        "kserve.trace", logging.INFO, __file__, 1, "predict_ms: %s", (1.5,), None
+    )
+    setattr(record, KSERVE_LOG_FIELDS_ATTR, {"predict_ms": 1.5})
+    entry = json.loads(JSONFormatter().format(record))
+    assert entry["message"] == "predict_ms: 1.5"
+    assert entry["predict_ms"] == 1.5
+    assert entry["level"] == "INFO"
+    assert entry["logger"] == "kserve.trace"
+
+
+def test_async_logging():
+    log = logging.getLogger("kserve.test_async")
+    handler = ListHandler()
+    log.addHandler(handler)
+    try:
+        kserve_logging.enable_async_logging(["kserve.test_async"])
+        assert isinstance(log.handlers[0], logging.handlers.QueueHandler)
+        log.warning("hello %s", "world")
+        kserve_logging.disable_async_logging()
+        assert log.handlers == [handler]
+        assert [r.getMessage() for r in handler.records] == ["hello world"]
+    finally:
+        log.removeHandler(handler)
@@ -0,0 +1,84 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import logging
+import time
+
+import pytest
+from prometheus_client import REGISTRY
+
+from kserve import Model
+from kserve.logging import logger
+from kserve.loop_monitor import LoopMonitor
+
+
+class BlockingModel(Model):
+    def __init__(self, name):
+        super().__init__(name)
+        self.ready = True
+
+    async def predict(self, request, headers=None):
+        time.sleep(0.3)
+        return {"predictions": request["instances"]}
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__(logging.WARNING)
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+@pytest.fixture
+def stall_logs():
+    handler = ListHandler()
+    logger.addHandler(handler)
+    yield handler.messages
+    logger.removeHandler(handler)
+
+
+@pytest.mark.asyncio
+async def test_reports_blocking_model(stall_logs):
+    stalls = sample("event_loop_stalls_total", model_name="BlockingModel")
+    lag = sample("event_loop_lag_seconds_sum")
+    monitor = LoopMonitor(interval=0.01, stall_threshold=0.1)
+    monitor.start()
+    try:
+        await asyncio.sleep(0.05)
+        await BlockingModel("BlockingModel")({"instances": [1]})
+        await asyncio.sleep(0.05)
+    finally:
+        await monitor.stop()
+
+    assert sample("event_loop_stalls_total", model_name="BlockingModel") == stalls + 1
+    assert sample("event_loop_lag_seconds_sum") - lag >= 0.2
+    [message] = stall_logs
+    assert "model BlockingModel" in message
+    assert "time.sleep(0.3)" in message
+
+
+@pytest.mark.asyncio
+async def test_idle_loop_is_not_reported(stall_logs):
+    monitor = LoopMonitor(interval=0.01, stall_threshold=0.1)
+    monitor.start()
+    await asyncio.sleep(0.3)
+    await monitor.stop()
+    assert stall_logs == []
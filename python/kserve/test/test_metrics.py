@@ -0,0 +1,208 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import concurrent.futures
+import os
+import threading
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from prometheus_client.mmap_dict import MmapedDict, mmap_key
+
+from kserve import Model
+from kserve.constants.constants import LLM_STATS_KEY
+from kserve.metrics import (
+    PROMETHEUS_MULTIPROC_DIR_ENV,
+    LLMStats,
+    cleanup_multiprocess_dir,
+    metrics_registry,
+    multiprocess_enabled,
+    register_executor_metrics,
+)
+from kserve.model_repository import ModelRepository
+from kserve.protocol.dataplane import DataPlane
+from kserve.protocol.model_repository_extension import ModelRepositoryExtension
+from kserve.protocol.rest.openai.dataplane import _observe_llm_stats
+from kserve.protocol.rest.request_metrics import RequestMetricsMiddleware
+from kserve.protocol.rest.server import RESTServer
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+class EchoModel(Model):
+    def __init__(self, name):
+        super().__init__(name)
+        self.ready = True
+
+    async def predict(self, request, headers=None):
+        return {"predictions": request["instances"]}
+
+
+@pytest.fixture(scope="module")
+def client():
+    registry = ModelRepository()
+    registry.update(EchoModel("MetricsModel"))
+    dataplane = DataPlane(model_registry=registry)
+    app = FastAPI()
+    RESTServer(app, dataplane, ModelRepositoryExtension(registry)).create_application()
+    app.add_middleware(RequestMetricsMiddleware, dataplane=dataplane)
+    return TestClient(app)
+
+
+def test_request_metrics(client):
+    labels = {"model_name": "MetricsModel", "protocol": "v1"}
+    requests = sample("requests_total", status="200", **labels)
+    sizes = sample("request_size_bytes_sum", **labels)
+    queued = sample("request_queue_seconds_count", model_name="MetricsModel")
+    served = sample("request_service_seconds_count", model_name="MetricsModel")
+
+    body = b'{"instances": [[1, 2]]}'
+    resp = client.post("/v1/models/MetricsModel:predict", content=body)
+    assert resp.status_code == 200
+
+    assert sample("requests_total", status="200", **labels) == requests + 1
+    assert sample("request_size_bytes_sum", **labels) == sizes + len(body)
+    assert sample("response_size_bytes_sum", **labels) >= len(resp.content)
+    assert (
+        sample("request_queue_seconds_count", model_name="MetricsModel") == queued + 1
+    )
+    assert (
+        sample("request_service_seconds_count", model_name="MetricsModel") == served + 1
+    )
+    assert sample("requests_in_flight", model_name="MetricsModel") == 0
+    assert sample("requests_queued", model_name="MetricsModel") == 0
+
+
+def test_unknown_model_is_not_labeled(client):
+    labels = {"model_name": "", "protocol": "v2", "status": "404"}
+    requests = sample("requests_total", **labels)
+    resp = client.post("/v2/models/Unknown/infer", json={"inputs": []})
+    assert resp.status_code == 404
+    assert sample("requests_total", **labels) == requests + 1
+
+
+def test_untracked_routes(client):
+    requests = sample("requests_total", model_name="", protocol="v2", status="200")
+    client.get("/v2/health/live")
+    assert (
+        sample("requests_total", model_name="", protocol="v2", status="200") == requests
+    )
+
+
+def test_executor_metrics():
+    started = threading.Event()
+    release = threading.Event()
+
+    def task():
+        started.set()
+        release.wait()
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        register_executor_metrics(executor, name="test")
+        executor.submit(task)
+        executor.submit(task)
+        started.wait()
+        assert sample("executor_max_workers", executor="test") == 1
+        assert sample("executor_busy_threads", executor="test") == 1
+        assert sample("executor_queued_tasks", executor="test") == 1
+        release.set()
+
+
+@pytest.mark.asyncio
+async def test_streamed_llm_stats():
+    stats = LLMStats(num_prompt_tokens=3)
+    context = {LLM_STATS_KEY: stats}
+    prompt = sample("llm_prompt_tokens_total", model_name="llm")
+    generated = sample("llm_generation_tokens_total", model_name="llm")
+
+    async def stream():
+        for _ in range(2):
+            stats.num_generation_tokens += 1
+            yield "token"
+
+    chunks = [chunk async for chunk in _observe_llm_stats("llm", context, stream())]
+    assert chunks == ["token", "token"]
+    assert sample("llm_prompt_tokens_total", model_name="llm") == prompt + 3
+    assert sample("llm_generation_tokens_total", model_name="llm") == generated + 2
+
+
+def write_metric_file(path, file_name, metric, labels, value):
+    values = MmapedDict(str(path / file_name))
+    key = mmap_key(metric, metric, list(labels), list(labels.values()), "")
+    values.write_value(key, value, 0)
+    values.close()
+
+
+class TestMultiprocess:
+    DEAD_PID = 2**22 + 1
+
+    @pytest.fixture
+    def multiproc_dir(self, tmp_path, monkeypatch):
+        monkeypatch.setenv(PROMETHEUS_MULTIPROC_DIR_ENV, str(tmp_path))
+        return tmp_path
+
+    def test_aggregates_workers(self, multiproc_dir):
+        labels = {"model_name": "m", "protocol": "v1", "status": "200"}
+        for pid in (os.getpid(), self.DEAD_PID):
+            write_metric_file(
+                multiproc_dir, f"counter_{pid}.db", "requests_total", labels, 2.0
+            )
+        write_metric_file(
+            multiproc_dir,
+            f"gauge_livesum_{self.DEAD_PID}.db",
+            "requests_in_flight",
+            {"model_name": "m"},
+            1.0,
+        )
+        registry = metrics_registry()
+        assert registry.get_sample_value("requests_total", labels) == 4.0
+        # The live gauges of dead workers are dropped when scraped
+        assert not (multiproc_dir / f"gauge_livesum_{self.DEAD_PID}.db").exists()
+        assert (multiproc_dir / f"counter_{self.DEAD_PID}.db").exists()
+
+    def test_cleanup_removes_dead_worker_files(self, multiproc_dir):
+        labels = {"model_name": "m"}
+        for pid in (os.getpid(), self.DEAD_PID):
+            write_metric_file(
+                multiproc_dir, f"counter_{pid}.db", "requests_total", labels, 1.0
+            )
+        cleanup_multiprocess_dir()
+        assert sorted(p.name for p in multiproc_dir.iterdir()) == [
+            f"counter_{os.getpid()}.db"
+        ]
+
+    def test_executor_metrics(self, multiproc_dir):
+        release = threading.Event()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+            register_executor_metrics(executor, name="multiprocess")
+            for _ in range(6):
+                executor.submit(release.wait)
+            labels = {"executor": "multiprocess"}
+            registry = metrics_registry()
+            assert registry.get_sample_value("executor_threads", labels) == 4
+            assert registry.get_sample_value("executor_busy_threads", labels) == 4
+            assert registry.get_sample_value("executor_queued_tasks", labels) == 2
+            release.set()
+
+    def test_directory_set_after_import(self, multiproc_dir):
+        # prometheus_client was imported before the directory was set
+        assert not multiprocess_enabled()
+
+    def test_single_process(self, monkeypatch):
+        monkeypatch.delenv(PROMETHEUS_MULTIPROC_DIR_ENV, raising=False)
+        assert metrics_registry() is REGISTRY
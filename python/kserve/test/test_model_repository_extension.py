@@ -19,6 +19,11 @@ from kserve.model_repository import ModelRepository
 from test.test_server import DummyModel, DummyModelRepository
 
 
+def without_usage(index):
+    # The resource usage is tested in test_accounting
+    return [{k: v for k, v in model.items() if k != "usage"} for model in index]
+
+
 @pytest.mark.asyncio
 class TestModelRepositoryExtension:
     MODEL_NAME = "TestModel"
@@ -32,7 +37,7 @@ class TestModelRepositoryExtension:
         return model_repo_ext
 
     async def test_index(self, model_repo_ext):
-        assert model_repo_ext.index() == [
+        assert without_usage(model_repo_ext.index()) == [
             {"name": self.MODEL_NAME, "reason": "", "state": "Ready"}
         ]
 
@@ -41,13 +46,13 @@ class TestModelRepositoryExtension:
         model = DummyModel("TestModel_2")
         # model.load()  # TestModel_2 is not loaded i.e. NotReady
         model_repo_ext._model_registry.update(model)
-        assert model_repo_ext.index() == [
+        assert without_usage(model_repo_ext.index()) == [
             {"name": self.MODEL_NAME, "reason": "", "state": "Ready"},
             {"name": "TestModel_2", "reason": "", "state": "NotReady"},
         ]
 
         # List only ready models
-        assert model_repo_ext.index(filter_ready=True) == [
+        assert without_usage(model_repo_ext.index(filter_ready=True)) == [
             {"name": self.MODEL_NAME, "reason": "", "state": "Ready"}
         ]
 
@@ -0,0 +1,165 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Dict
+
+import httpx
+import numpy as np
+import pytest
+import pytest_asyncio
+from fastapi.testclient import TestClient
+
+from kserve import Model, ModelServer
+from kserve.constants.constants import MSGPACK_CONTENT_TYPE
+from kserve.errors import InvalidInput
+from kserve.inference_client import InferenceRESTClient, RESTConfig
+from kserve.model_server import app as kserve_app
+from kserve.protocol.rest.server import RESTServer
+from kserve.utils import msgpack_codec
+
+msgpack = pytest.importorskip("msgpack")
+
+
+class DummyArrayModel(Model):
+    def __init__(self, name):
+        super().__init__(name)
+        self.ready = False
+
+    def load(self):
+        self.ready = True
+
+    async def predict(self, payload: Dict, headers: Dict[str, str] = None) -> Dict:
+        instances = payload["instances"]
+        assert isinstance(instances, np.ndarray)
+        return {"predictions": instances.sum(axis=1)}
+
+
+@pytest.mark.parametrize(
+    "array",
+    [
+        np.arange(12, dtype=np.float32).reshape(3, 4),
+        np.array([True, False]),
+        np.arange(6, dtype=np.int64).reshape(2, 3)[:, ::2],
+        np.array([1 + 2j], dtype=np.complex64),
+        np.zeros((0, 3), dtype=np.float64),
+    ],
+)
+def test_ndarray_round_trip(array):
+    decoded = msgpack_codec.loads(msgpack_codec.dumps({"instances": array}))
+    assert decoded["instances"].dtype == array.dtype
+    np.testing.assert_array_equal(decoded["instances"], array)
+    assert decoded["instances"].flags.writeable
+
+
+def test_object_array_and_scalars_are_packed_as_lists():
+    payload = {
+        "instances": np.array(["a", "b"], dtype=object),
+        "score": np.float32(0.5),
+        "nested": [{"x": np.int64(1)}],
+    }
+    assert msgpack_codec.loads(msgpack_codec.dumps(payload)) == {
+        "instances": ["a", "b"],
+        "score": 0.5,
+        "nested": [{"x": 1}],
+    }
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        b"\xc1",
+        msgpack.packb(msgpack.ExtType(msgpack_codec.NDARRAY_EXT_TYPE, b"\x92")),
+        msgpack.packb(msgpack.ExtType(msgpack_codec.NDARRAY_EXT_TYPE, b"")),
+    ],
+)
+def test_invalid_payload(payload):
+    with pytest.raises(InvalidInput):
+        msgpack_codec.loads(payload)
+
+
+class TestMsgpackEndpoints:
+    @pytest.fixture(scope="class")
+    def server(self):
+        server = ModelServer()
+        rest_server = RESTServer(
+            kserve_app, server.dataplane, server.model_repository_extension
+        )
+        rest_server.create_application()
+        yield server
+        kserve_app.routes.clear()
+
+    @pytest_asyncio.fixture(scope="class")
+    async def app(self, server):
+        model = DummyArrayModel("TestModel")
+        model.load()
+        server.register_model(model)
+        yield kserve_app
+        await server.model_repository_extension.unload("TestModel")
+
+    @pytest.fixture(scope="class")
+    def http_server_client(self, app):
+        return TestClient(app)
+
+    def test_predict_msgpack_v1(self, http_server_client):
+        body = msgpack_codec.dumps({"instances": np.ones((2, 3), dtype=np.float32)})
+        resp = http_server_client.post(
+            "/v1/models/TestModel:predict",
+            content=body,
+            headers={"content-type": MSGPACK_CONTENT_TYPE},
+        )
+        assert resp.status_code == 200
+        assert resp.json() == {"predictions": [3.0, 3.0]}
+
+    def test_predict_msgpack_response_v1(self, http_server_client):
+        body = msgpack_codec.dumps({"instances": np.ones((2, 3), dtype=np.float32)})
+        resp = http_server_client.post(
+            "/v1/models/TestModel:predict",
+            content=body,
+            headers={
+                "content-type": MSGPACK_CONTENT_TYPE,
+                "accept": MSGPACK_CONTENT_TYPE,
+            },
+        )
+        assert resp.status_code == 200
+        assert resp.headers["content-type"] == MSGPACK_CONTENT_TYPE
+        predictions = msgpack_codec.loads(resp.content)["predictions"]
+        assert predictions.dtype == np.float32
+        np.testing.assert_array_equal(predictions, [3.0, 3.0])
+
+    def test_predict_invalid_msgpack_v1(self, http_server_client):
+        resp = http_server_client.post(
+            "/v1/models/TestModel:predict",
+            content=b"\xc1",
+            headers={"content-type": MSGPACK_CONTENT_TYPE},
+        )
+        assert resp.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_rest_client_msgpack(self, app):
+        config = RESTConfig(
+            transport=httpx.ASGITransport(app=app), content_type=MSGPACK_CONTENT_TYPE
+        )
+        client = InferenceRESTClient(config=config)
+        result = await client.infer(
+            "http://test",
+            {"instances": np.arange(6, dtype=np.float64).reshape(2, 3)},
+            model_name="TestModel",
+        )
+        np.testing.assert_array_equal(result["predictions"], [3.0, 12.0])
+        await client.close()
+
+
+def test_rest_config_unsupported_content_type():
+    with pytest.raises(ValueError):
+        RESTConfig(content_type="application/xml")
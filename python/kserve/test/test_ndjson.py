@@ -0,0 +1,51 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pytest
+
+from kserve.errors import InvalidInput
+from kserve.protocol.rest.ndjson import dumps_lines, iter_ndjson_batches
+
+
+async def chunked(body: bytes, size: int):
+    for i in range(0, len(body), size):
+        yield body[i : i + size]
+
+
+async def collect(chunks, batch_size):
+    return [batch async for batch in iter_ndjson_batches(chunks, batch_size)]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("chunk_size", [1, 3, 1024])
+async def test_iter_ndjson_batches(chunk_size):
+    body = b'[1, 2]\n\n{"a": "x"}\n3\n"last"'
+    batches = await collect(chunked(body, chunk_size), batch_size=2)
+    assert batches == [[[1, 2], {"a": "x"}], [3, "last"]]
+
+
+@pytest.mark.asyncio
+async def test_iter_ndjson_batches_empty():
+    assert await collect(chunked(b"\n \n", 2), batch_size=2) == []
+
+
+@pytest.mark.asyncio
+async def test_iter_ndjson_batches_invalid_line():
+    with pytest.raises(InvalidInput, match="line 2"):
+        await collect(chunked(b"1\n{\n", 4), batch_size=10)
+
+
+def test_dumps_lines():
+    assert dumps_lines(np.array([[1, 2], [3, 4]])) == b"[1,2]\n[3,4]\n"
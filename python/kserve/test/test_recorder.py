@@ -0,0 +1,139 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+
+import numpy as np
+import pytest
+
+from kserve.benchmark.dummy import DummyModel
+from kserve.benchmark.replay import read_recording, replay
+from kserve.errors import InvalidInput
+from kserve.model_repository import ModelRepository
+from kserve.protocol.dataplane import DataPlane
+from kserve.protocol.infer_type import InferInput, InferRequest
+from kserve.recorder import REDACTED, RequestRecorder
+
+
+class ModifyingModel(DummyModel):
+    async def predict(self, payload, headers=None):
+        if payload["instances"] == "invalid":
+            raise InvalidInput("invalid instances")
+        payload["instances"] = []
+        return await super().predict(payload, headers)
+
+
+@pytest.fixture
+def recording(tmp_path):
+    return str(tmp_path / "requests.jsonl")
+
+
+def dataplane(recorder: RequestRecorder) -> DataPlane:
+    registry = ModelRepository()
+    registry.update(ModifyingModel("model"))
+    return DataPlane(model_registry=registry, recorder=recorder)
+
+
+@pytest.mark.asyncio
+async def test_records_requests(recording):
+    recorder = RequestRecorder(recording, redact_headers=["Authorization"])
+    plane = dataplane(recorder)
+    headers = {"authorization": "Bearer secret", "x-request-id": "1", "host": "a"}
+    await plane.infer("model", {"instances": [[1, 2]]}, headers)
+    with pytest.raises(InvalidInput):
+        await plane.infer("model", {"instances": "invalid"})
+    recorder.close()
+
+    first, second = read_recording([recording])
+    assert first["model"] == "model"
+    assert first["protocol"] == "v1"
+    assert first["verb"] == "predict"
+    assert first["headers"] == {"authorization": REDACTED, "x-request-id": "1"}
+    # Recorded before the model modified it
+    assert first["body"] == {"instances": [[1, 2]]}
+    assert first["latency_ms"] >= 0
+    assert first["error"] is None
+    assert second["error"] == "InvalidInput"
+
+
+@pytest.mark.asyncio
+async def test_records_grpc_raw_inputs(recording):
+    recorder = RequestRecorder(recording)
+    infer_input = InferInput("input-0", [2], "FP32")
+    infer_input.set_data_from_numpy(np.array([1, 2], dtype=np.float32))
+    request = InferRequest.from_grpc(
+        InferRequest(model_name="model", infer_inputs=[infer_input]).to_grpc()
+    )
+    with recorder.record("model", request):
+        pass
+    recorder.close()
+
+    [record] = read_recording([recording])
+    assert record["protocol"] == "grpc"
+    assert record["body"]["inputs"][0]["data"] == [1.0, 2.0]
+    assert InferRequest.from_rest("model", record["body"]).inputs[0].shape == [2]
+
+
+@pytest.mark.asyncio
+async def test_sampling_and_bodies(recording):
+    recorder = RequestRecorder(recording, sample_rate=0, record_bodies=False)
+    await dataplane(recorder).infer("model", {"instances": [[1, 2]]})
+    assert not recorder.sampled()
+    recorder.sample_rate = 1
+    await dataplane(recorder).infer("model", {"instances": [[1, 2]]})
+    recorder.close()
+
+    # Requests without body are not replayed
+    assert read_recording([recording]) == []
+
+
+class FakeClient:
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, record):
+        self.sent.append((time.perf_counter(), record["body"]))
+        if record["body"] == "fail":
+            raise RuntimeError("failed")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("speed", [2.0, 0])
+async def test_replay_schedule(speed):
+    records = [
+        {
+            "time": 100.0 + i * 0.2,
+            "model": "model",
+            "protocol": "v1",
+            "verb": "predict",
+            "headers": {},
+            "body": "fail" if i == 3 else i,
+            "latency_ms": 10,
+            "error": None,
+        }
+        for i in range(4)
+    ]
+    client = FakeClient()
+    report = await replay(records, client, speed=speed)
+
+    assert [body for _, body in client.sent] == [0, 1, 2, "fail"]
+    elapsed = client.sent[-1][0] - client.sent[0][0]
+    if speed:
+        assert elapsed == pytest.approx(0.3, abs=0.05)
+    else:
+        assert elapsed < 0.05
+    assert report["requests"] == 4
+    assert report["errors"] == 1
+    [result] = report["results"]
+    assert result["recorded"]["server_latency_ms"]["p50"] == 10
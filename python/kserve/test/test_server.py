@@ -25,8 +25,10 @@ import avro.schema
 import httpx
 import pytest
 import pytest_asyncio
+import uvicorn
 from cloudevents.conversion import to_binary, to_structured
 from cloudevents.http import CloudEvent
+from fastapi import FastAPI
 from fastapi.testclient import TestClient
 from ray import serve
 
@@ -40,6 +42,8 @@ from kserve.protocol.infer_type import (
     InferRequest,
     InferResponse,
 )
+from kserve.protocol.dataplane import DataPlane
+from kserve.protocol.model_repository_extension import ModelRepositoryExtension
 from kserve.protocol.rest.server import RESTServer
 from kserve.protocol.rest.v2_datamodels import is_pydantic_2
 from kserve.utils.utils import get_predict_input, get_predict_response
@@ -358,11 +362,71 @@ class TestV1Endpoints:
         assert resp.content == b'{"predictions":[[1,2]]}'
         assert resp.headers["content-type"] == "application/json"
 
+    def test_batch_predict_v1(self, http_server_client):
+        def body():
+            for i in range(5):
+                yield f"[{i}, {i + 1}]\n".encode()
+
+        resp = http_server_client.post(
+            "/v1/models/TestModel:batch_predict",
+            params={"batch_size": 2},
+            content=body(),
+            headers={"content-type": "application/x-ndjson"},
+        )
+        assert resp.status_code == 200
+        assert resp.headers["content-type"] == "application/x-ndjson"
+        assert resp.content.splitlines() == [
+            f"[{i},{i + 1}]".encode() for i in range(5)
+        ]
+
+    def test_batch_predict_invalid_line_v1(self, http_server_client):
+        resp = http_server_client.post(
+            "/v1/models/TestModel:batch_predict", content=b"[1, 2]\n{invalid\n"
+        )
+        assert resp.status_code == 400
+
     def test_unknown_path_v1(self, http_server_client):
         resp = http_server_client.get("/unknown_path")
         assert resp.status_code == 404
         assert resp.json() == {"detail": "Not Found"}
 
+    @pytest.mark.asyncio
+    async def test_batch_predict_multi_chunk_body_v1(self):
+        registry = ModelRepository()
+        model = DummyModel("TestModel")
+        model.load()
+        registry.update(model)
+        app = FastAPI()
+        RESTServer(
+            app, DataPlane(model_registry=registry), ModelRepositoryExtension(registry)
+        ).create_application()
+        server = uvicorn.Server(
+            uvicorn.Config(app, host="127.0.0.1", port=0, log_config=None)
+        )
+        serving = asyncio.create_task(server.serve())
+        while not server.started:
+            await asyncio.sleep(0.01)
+        port = server.servers[0].sockets[0].getsockname()[1]
+
+        async def body():
+            # Sent as many body messages, read while the predictions are streamed
+            for start in range(0, 20000, 500):
+                yield b"".join(f"[{i}]\n".encode() for i in range(start, start + 500))
+                await asyncio.sleep(0)
+
+        try:
+            async with httpx.AsyncClient(timeout=30) as client:
+                resp = await client.post(
+                    f"http://127.0.0.1:{port}/v1/models/TestModel:batch_predict",
+                    content=body(),
+                    headers={"content-type": "application/x-ndjson"},
+                )
+        finally:
+            server.should_exit = True
+            await serving
+        assert resp.status_code == 200
+        assert resp.content.splitlines() == [f"[{i}]".encode() for i in range(20000)]
+
     def test_metrics_v1(self, http_server_client):
         resp = http_server_client.get("/metrics")
         assert resp.status_code == 200
@@ -406,6 +470,25 @@ class TestV2Endpoints:
         assert result["outputs"][0]["data"] == [1, 2]
         assert resp.headers["content-type"] == "application/json"
 
+    def test_infer_requested_outputs_v2(self, http_server_client):
+        input_data = {
+            "inputs": [
+                {"name": "a", "shape": [2], "datatype": "FP32", "data": [0.2, 0.8]},
+                {"name": "b", "shape": [2], "datatype": "INT32", "data": [1, 2]},
+            ],
+            "outputs": [{"name": "a", "parameters": {"classification": 1}}],
+            "parameters": {"content_type": "pd"},
+        }
+        resp = http_server_client.post(
+            "/v2/models/TestModel/infer", content=json.dumps(input_data)
+        )
+        assert resp.status_code == 200
+        result = json.loads(resp.content)
+        assert len(result["outputs"]) == 1
+        assert result["outputs"][0]["name"] == "a"
+        assert result["outputs"][0]["datatype"] == "BYTES"
+        assert result["outputs"][0]["data"] == ["0.8:1"]
+
     def test_explain_v2(self, http_server_client):
         resp = http_server_client.post(
             "/v1/models/TestModel:explain", content=b'{"instances":[[1,2]]}'
@@ -828,6 +911,12 @@ class TestTFHttpServerLoadAndUnLoad:
         assert resp.status_code == 200
         assert resp.content == b'{"name":"model","load":true}'
 
+    def test_index(self, http_server_client):
+        resp = http_server_client.post("/v2/repository/index", json={"ready": True})
+        assert resp.status_code == 200
+        [model] = resp.json()
+        assert (model["name"], model["state"]) == ("model", "Ready")
+
     def test_unload(self, http_server_client):
         resp = http_server_client.post(
             "/v2/repository/models/model/unload", content=b""
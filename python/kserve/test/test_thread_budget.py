@@ -0,0 +1,79 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from kserve import thread_budget
+from kserve.metrics import CPU_LIMIT, THREAD_BUDGET
+from kserve.thread_budget import apply_thread_budget, plan_thread_budget
+from kserve.utils import utils
+
+
+@pytest.fixture
+def cgroup(tmp_path, monkeypatch):
+    monkeypatch.setattr(utils.sys, "platform", "linux")
+    paths = {
+        "CGROUP_V2_CPU_MAX": tmp_path / "cpu.max",
+        "CGROUP_V1_CPU_QUOTA": tmp_path / "cpu.cfs_quota_us",
+        "CGROUP_V1_CPU_PERIOD": tmp_path / "cpu.cfs_period_us",
+    }
+    for name, path in paths.items():
+        monkeypatch.setattr(utils, name, str(path))
+    return paths
+
+
+@pytest.mark.parametrize(
+    "cpu_max,limit", [("250000 100000\n", 2.5), ("max 100000\n", None)]
+)
+def test_cgroup_v2_limit(cgroup, cpu_max, limit):
+    cgroup["CGROUP_V2_CPU_MAX"].write_text(cpu_max)
+    assert utils.cgroup_cpu_limit() == limit
+
+
+def test_cgroup_v1_limit(cgroup):
+    cgroup["CGROUP_V1_CPU_QUOTA"].write_text("50000\n")
+    cgroup["CGROUP_V1_CPU_PERIOD"].write_text("100000\n")
+    assert utils.cgroup_cpu_limit() == 0.5
+    # A fractional limit is at least one CPU
+    assert utils.cpu_count() == 1
+
+    cgroup["CGROUP_V1_CPU_QUOTA"].write_text("-1\n")
+    assert utils.cgroup_cpu_limit() is None
+
+
+def test_plan_divides_cpus_among_workers(monkeypatch):
+    monkeypatch.delenv("OMP_NUM_THREADS", raising=False)
+    budget = plan_thread_budget(workers=3, cpus=8)
+    assert budget.native_threads == 2
+    assert budget.asyncio_workers == 6
+    assert budget.grpc_threads == 4
+
+    budget = plan_thread_budget(workers=4, max_asyncio_workers=2, cpus=2)
+    assert budget.native_threads == 1
+    assert budget.asyncio_workers == 2
+
+
+def test_plan_keeps_explicit_native_threads(monkeypatch):
+    monkeypatch.setenv("OMP_NUM_THREADS", "3")
+    assert plan_thread_budget(cpus=8).native_threads == 3
+
+
+def test_apply_thread_budget(monkeypatch):
+    monkeypatch.delenv("OMP_NUM_THREADS", raising=False)
+    limits = []
+    monkeypatch.setattr(thread_budget, "_limit_native_threads", limits.append)
+    apply_thread_budget(plan_thread_budget(workers=2, max_threads=1, cpus=4))
+    assert limits == [2]
+    assert CPU_LIMIT._value.get() == 4
+    assert THREAD_BUDGET.labels("grpc")._value.get() == 1
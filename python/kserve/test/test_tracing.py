@@ -0,0 +1,129 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from kserve import Model, tracing
+from kserve.inference_client import InferenceRESTClient, RESTConfig
+from kserve.model_repository import ModelRepository
+from kserve.protocol.dataplane import DataPlane
+from kserve.protocol.model_repository_extension import ModelRepositoryExtension
+from kserve.protocol.rest.server import RESTServer, TracingMiddleware
+
+sdk_trace = pytest.importorskip("opentelemetry.sdk.trace")
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor  # noqa: E402
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (  # noqa: E402
+    InMemorySpanExporter,
+)
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+TRACEPARENT = f"00-{TRACE_ID}-00f067aa0ba902b7-01"
+
+
+class EchoModel(Model):
+    def __init__(self, name):
+        super().__init__(name)
+        self.ready = True
+
+    async def predict(self, request, headers=None):
+        return {"predictions": request["instances"]}
+
+
+@pytest.fixture
+def exporter(monkeypatch):
+    exporter = InMemorySpanExporter()
+    provider = sdk_trace.TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    monkeypatch.setattr(tracing, "_tracer", provider.get_tracer("test"))
+    return exporter
+
+
+def create_app() -> FastAPI:
+    registry = ModelRepository()
+    registry.update(EchoModel("TestModel"))
+    app = FastAPI()
+    RESTServer(
+        app, DataPlane(model_registry=registry), ModelRepositoryExtension(registry)
+    ).create_application()
+    app.add_middleware(TracingMiddleware)
+    return app
+
+
+def test_request_spans(exporter):
+    client = TestClient(create_app())
+    resp = client.post(
+        "/v1/models/TestModel:predict",
+        json={"instances": [1]},
+        headers={"traceparent": TRACEPARENT},
+    )
+    assert resp.status_code == 200
+
+    spans = {span.name: span for span in exporter.get_finished_spans()}
+    server = spans["POST /v1/models/TestModel:predict"]
+    assert format(server.context.trace_id, "032x") == TRACE_ID
+    assert server.attributes["http.status_code"] == 200
+    for name in ("decode", "preprocess", "predict", "postprocess", "encode"):
+        assert spans[name].parent.span_id == server.context.span_id
+    assert spans["predict"].attributes["kserve.model_name"] == "TestModel"
+
+
+@pytest.mark.asyncio
+async def test_propagates_to_predictor(exporter):
+    # Transformer to predictor hop, served in process
+    config = RESTConfig(transport=httpx.ASGITransport(app=create_app()), protocol="v1")
+    client = InferenceRESTClient(config)
+    with tracing.span("transformer"):
+        await client.infer("http://predictor", {"instances": [1]}, "TestModel")
+
+    spans = {span.name: span for span in exporter.get_finished_spans()}
+    client_span = spans["infer"]
+    server_span = spans["POST /v1/models/TestModel:predict"]
+    assert client_span.parent.span_id == spans["transformer"].context.span_id
+    assert server_span.parent.span_id == client_span.context.span_id
+    assert server_span.context.trace_id == client_span.context.trace_id
+
+
+def test_file_exporter(tmp_path):
+    path = tmp_path / "spans.jsonl"
+    tracing.configure_tracing(exporter="file", file_path=str(path))
+    span_file = tracing._span_file
+    try:
+        with tracing.span("outer"):
+            with tracing.span("inner", {"kserve.model_name": None}):
+                pass
+    finally:
+        tracing.shutdown_tracing()
+    assert span_file.closed
+    spans = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [span["name"] for span in spans] == ["inner", "outer"]
+    assert spans[0]["resource"]["attributes"]["service.name"] == "kserve"
+
+
+def test_disabled():
+    assert not tracing.is_enabled()
+    headers = {"x-request-id": "abc"}
+    assert tracing.inject_headers(headers) is headers
+    assert tracing.inject_metadata(None) is None
+    with tracing.server_span("request", headers) as span:
+        assert span is None
+
+
+def test_invalid_exporter():
+    with pytest.raises(ValueError):
+        tracing.configure_tracing(exporter="zipkin")
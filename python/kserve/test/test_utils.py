@@ -0,0 +1,81 @@
+# Copyright 2024 The KServe Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from kserve.protocol.infer_type import InferInput, InferRequest, to_sparse_inputs
+from kserve.utils.utils import get_predict_input, get_predict_response
+
+
+def test_get_predict_input_records():
+    instances = [{"a": 1, "b": "x"}, {"a": 2, "b": "y"}]
+    df = get_predict_input({"instances": instances})
+    assert df.to_dict(orient="list") == {"a": [1, 2], "b": ["x", "y"]}
+    assert df["a"].dtype == np.int64
+
+
+def test_get_predict_input_column_lists():
+    instances = [{"a": [1, 2], "b": [0.5, 1.5]}, {"a": [3], "b": [2.5]}]
+    df = get_predict_input({"instances": instances}, columns=["b", "a"])
+    assert list(df.columns) == ["b", "a"]
+    assert df["a"].tolist() == [1, 2, 3]
+    assert df["b"].tolist() == [0.5, 1.5, 2.5]
+
+
+def test_get_predict_input_lists_of_records():
+    instances = [[{"a": 1}, {"b": 2}], [{"a": 3}, {"b": 4}]]
+    df = get_predict_input({"inputs": instances}, columns=["a", "b"])
+    assert df.shape == (4, 2)
+    assert df["a"].dropna().tolist() == [1, 3]
+
+
+def test_get_predict_input_mixed_layouts_fall_back():
+    instances = [{"a": [1, 2]}, {"b": [3]}]
+    df = get_predict_input({"instances": instances})
+    assert df.shape == (3, 2)
+
+
+def test_get_predict_input_v2_dataframe():
+    infer_request = InferRequest(
+        model_name="model",
+        infer_inputs=[
+            InferInput(name="a", shape=[2], datatype="INT32", data=[1, 2]),
+            InferInput(name="b", shape=[2], datatype="BYTES", data=["x", "y"]),
+        ],
+        parameters={"content_type": "pd"},
+    )
+    df = get_predict_input(infer_request)
+    assert df.to_dict(orient="list") == {"a": [1, 2], "b": ["x", "y"]}
+
+
+def test_get_predict_response_dataframe_preserves_dtypes():
+    result = pd.DataFrame({"label": [1, 2], "score": [0.5, 0.25]})
+    response = get_predict_response({"instances": []}, result, "model")
+    assert response == {
+        "predictions": [{"label": 1, "score": 0.5}, {"label": 2, "score": 0.25}]
+    }
+    assert isinstance(response["predictions"][0]["label"], int)
+
+
+def test_get_predict_input_sparse():
+    sparse = pytest.importorskip("scipy.sparse")
+    matrix = sparse.random(3, 100, density=0.05, format="csr", random_state=1)
+    infer_request = InferRequest(
+        model_name="model", infer_inputs=to_sparse_inputs("input-0", matrix)
+    )
+    result = get_predict_input(infer_request)
+    assert sparse.issparse(result)
+    assert (result != matrix).nnz == 0
@@ -14,15 +14,15 @@
 
 import argparse
 
-from kserve import logging
+from kserve import accounting, logging
 from lgbserver.lightgbm_model_repository import LightGBMModelRepository
 from lgbserver.model import LightGBMModel
 
 import kserve
 from kserve.errors import ModelMissingError
 from kserve.logging import logger
+from kserve.thread_budget import plan_thread_budget
 
-DEFAULT_NTHREAD = 1
 
 parser = argparse.ArgumentParser(
     parents=[kserve.model_server.parser]
@@ -31,16 +31,23 @@ parser.add_argument(
     "--model_dir", required=True, help="A local path to the model directory"
 )
 parser.add_argument(
-    "--nthread", default=DEFAULT_NTHREAD, help="Number of threads to use by LightGBM."
+    "--nthread",
+    default=None,
+    type=int,
+    help="Number of threads to use by LightGBM. Defaults to the CPUs available to the "
+    "model server.",
 )
 args, _ = parser.parse_known_args()
 
 if __name__ == "__main__":
     if args.configure_logging:
         logging.configure_logging(args.log_config_file)
+    if args.nthread is None:
+        args.nthread = plan_thread_budget().native_threads
     model = LightGBMModel(args.model_name, args.model_dir, args.nthread)
     try:
-        model.load()
+        with accounting.measure_load(model.name):
+            model.load()
         # LightGBM doesn't support multi-process, so the number of http server workers should be 1.
         kserve.ModelServer(workers=1).start([model])
     except ModelMissingError:
@@ -17,7 +17,7 @@ import argparse
 from paddleserver import PaddleModel
 
 import kserve
-from kserve import logging
+from kserve import accounting, logging
 
 parser = argparse.ArgumentParser(parents=[kserve.model_server.parser])
 parser.add_argument(
@@ -29,5 +29,6 @@ if __name__ == "__main__":
     if args.configure_logging:
         logging.configure_logging(args.log_config_file)
     model = PaddleModel(args.model_name, args.model_dir)
-    model.load()
+    with accounting.measure_load(model.name):
+        model.load()
     kserve.ModelServer().start([model])
@@ -14,7 +14,7 @@
 
 import argparse
 
-from kserve import logging
+from kserve import accounting, logging
 from pmmlserver import PmmlModel
 
 import kserve
@@ -37,7 +37,8 @@ if __name__ == "__main__":
     if args.configure_logging:
         logging.configure_logging(args.log_config_file)
     model = PmmlModel(args.model_name, args.model_dir)
-    model.load()
+    with accounting.measure_load(model.name):
+        model.load()
     server = kserve.ModelServer()
     # pmmlserver based on [Py4J](https://github.com/bartdag/py4j) and that doesn't support multiprocess mode.
     validate_max_workers(server.workers, 1)
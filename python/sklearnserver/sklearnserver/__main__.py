@@ -14,7 +14,7 @@
 
 import argparse
 
-from kserve import logging
+from kserve import accounting, logging
 from sklearnserver import SKLearnModel, SKLearnModelRepository
 
 import kserve
@@ -32,7 +32,8 @@ if __name__ == "__main__":
         logging.configure_logging(args.log_config_file)
     model = SKLearnModel(args.model_name, args.model_dir)
     try:
-        model.load()
+        with accounting.measure_load(model.name):
+            model.load()
         kserve.ModelServer().start([model])
 
     except ModelMissingError:
@@ -12,11 +12,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from kserve.protocol.infer_type import InferInput, InferRequest
+from kserve.protocol.infer_type import InferInput, InferRequest, to_sparse_inputs
 from sklearn import svm
+from sklearn.linear_model import LogisticRegression
 from sklearn import datasets
 from sklearnserver import SKLearnModel
 import joblib
+import numpy
 import pickle
 import os
 from kserve.errors import ModelMissingError
@@ -144,3 +146,22 @@ def test_dir_with_two_models():
     with pytest.raises(RuntimeError) as e:
         model.load()
     assert "More than one model file is detected" in str(e.value)
+
+
+def test_sparse_model(tmp_path):
+    sparse = pytest.importorskip("scipy.sparse")
+    X = sparse.random(100, 5000, density=0.01, format="csr", random_state=1)
+    y = (X.sum(axis=1).A1 > numpy.median(X.sum(axis=1).A1)).astype(int)
+    sklearn_model = LogisticRegression().fit(X, y)
+    joblib.dump(value=sklearn_model, filename=os.path.join(tmp_path, "model.joblib"))
+    model = SKLearnModel("model", str(tmp_path))
+    model.load()
+
+    infer_request = InferRequest(
+        model_name="model", infer_inputs=to_sparse_inputs("input-0", X[:3])
+    )
+    infer_response = model.predict(infer_request)
+    assert (
+        infer_response.to_rest()["outputs"][0]["data"]
+        == sklearn_model.predict(X[:3]).tolist()
+    )
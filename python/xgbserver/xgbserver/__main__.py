@@ -17,12 +17,12 @@ import argparse
 from xgbserver import XGBoostModel, XGBoostModelRepository
 
 import kserve
-from kserve import logging
+from kserve import accounting, logging
 from kserve.errors import ModelMissingError
 from kserve.logging import logger
+from kserve.thread_budget import plan_thread_budget
 
 DEFAULT_LOCAL_MODEL_DIR = "/tmp/model"
-DEFAULT_NTHREAD = 1
 
 parser = argparse.ArgumentParser(
     parents=[kserve.model_server.parser]
@@ -31,16 +31,23 @@ parser.add_argument(
     "--model_dir", required=True, help="A local path to the model directory"
 )
 parser.add_argument(
-    "--nthread", default=DEFAULT_NTHREAD, help="Number of threads to use by XGBoost."
+    "--nthread",
+    default=None,
+    type=int,
+    help="Number of threads to use by XGBoost. Defaults to the CPUs available to the "
+    "model server.",
 )
 args, _ = parser.parse_known_args()
 
 if __name__ == "__main__":
     if args.configure_logging:
         logging.configure_logging(args.log_config_file)
+    if args.nthread is None:
+        args.nthread = plan_thread_budget().native_threads
     model = XGBoostModel(args.model_name, args.model_dir, args.nthread)
     try:
-        model.load()
+        with accounting.measure_load(model.name):
+            model.load()
         kserve.ModelServer().start([model])
     except ModelMissingError:
         logger.error(
@@ -12,7 +12,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from kserve.protocol.infer_type import InferInput, InferRequest
+from kserve.protocol.infer_type import InferInput, InferRequest, to_sparse_inputs
+import numpy
+import pytest
 import xgboost as xgb
 import os
 from sklearn.datasets import load_iris
@@ -118,3 +120,21 @@ def test_ubj_model():
     infer_request = InferRequest(model_name="model", infer_inputs=[infer_input])
     infer_response = model.predict(infer_request)
     assert infer_response.to_rest()["outputs"][0]["data"] == [0]
+
+
+def test_sparse_model(tmp_path):
+    sparse = pytest.importorskip("scipy.sparse")
+    X = sparse.random(100, 5000, density=0.01, format="csr", random_state=1)
+    y = (X.sum(axis=1).A1 > numpy.median(X.sum(axis=1).A1)).astype(int)
+    param = {"max_depth": 3, "objective": "binary:logistic"}
+    xgb_model = xgb.train(params=param, dtrain=xgb.DMatrix(X, label=y))
+    xgb_model.save_model(os.path.join(tmp_path, BST_FILE))
+    model = XGBoostModel("model", str(tmp_path), NTHREAD)
+    model.load()
+
+    infer_request = InferRequest(
+        model_name="model", infer_inputs=to_sparse_inputs("input-0", X[:3])
+    )
+    infer_response = model.predict(infer_request)
+    expected = xgb_model.predict(xgb.DMatrix(X[:3]))
+    assert numpy.allclose(infer_response.outputs[0].as_numpy(), expected)